@@ -1,36 +1,98 @@
 """Attraction controller for querying attractions by vibes."""
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import Optional, List
 from dtos.attraction_dto import AttractionsListResponse
+from core.dependencies import RequestIdentityMap
 from services.attraction_service import AttractionService
 
 router = APIRouter(prefix="/api/attractions", tags=["attractions"])
 
 
-def get_attraction_service() -> AttractionService:
+def get_attraction_service(identity_map: RequestIdentityMap) -> AttractionService:
     """
     Dependency to get AttractionService instance.
     """
-    return AttractionService()
+    return AttractionService(identity_map=identity_map)
+
+
+@router.get("/nearby", response_model=AttractionsListResponse)
+async def get_nearby_attractions(
+    lat: Optional[float] = Query(None, description="Latitude of the search point"),
+    lon: Optional[float] = Query(None, description="Longitude of the search point"),
+    trip_id: Optional[int] = Query(None, description="Search around the trip's start location"),
+    city_id: Optional[int] = Query(None, description="Search around a city (e.g. a trip day's base city)"),
+    radius_km: Optional[float] = Query(None, description="Maximum distance in kilometres"),
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of results"),
+    attraction_service: AttractionService = Depends(get_attraction_service),
+) -> AttractionsListResponse:
+    """
+    Get the attractions nearest to a point, ordered by distance.
+    
+    The point comes from lat/lon if both are provided, otherwise from
+    the trip's start coordinates (trip_id) or a city's coordinates (city_id).
+    
+    Args:
+        lat: Optional latitude of the search point
+        lon: Optional longitude of the search point
+        trip_id: Optional trip ID whose start location is used
+        city_id: Optional city ID whose location is used
+        radius_km: Optional maximum distance in kilometres
+        limit: Maximum number of results
+        attraction_service: Attraction service (from dependency)
+        
+    Returns:
+        AttractionsListResponse with attractions and their distance_km
+        
+    Raises:
+        HTTPException 400: If no point can be resolved or inputs are invalid
+    """
+    try:
+        if lat is not None and lon is not None:
+            latitude, longitude = lat, lon
+        elif trip_id:
+            # TODO: Re-add authentication
+            latitude, longitude = await attraction_service.get_trip_start_point(
+                user_id=1,
+                trip_id=trip_id,
+            )
+        elif city_id:
+            latitude, longitude = await attraction_service.get_city_point(city_id)
+        else:
+            raise ValueError("Provide lat and lon, trip_id, or city_id")
+        
+        return await attraction_service.get_nearby_attractions(
+            latitude=latitude,
+            longitude=longitude,
+            limit=limit,
+            radius_km=radius_km,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("", response_model=AttractionsListResponse)
 async def get_attractions(
     trip_id: Optional[int] = Query(None, description="Filter attractions by trip vibes"),
     vibe_ids: Optional[str] = Query(None, description="Comma-separated list of vibe IDs"),
+    city_id: Optional[int] = Query(None, description="Browse all attractions in a city"),
     limit: Optional[int] = Query(None, description="Limit number of results"),
     attraction_service: AttractionService = Depends(get_attraction_service),
 ) -> AttractionsListResponse:
     """
     Get attractions filtered by vibes.
     
-    Either trip_id or vibe_ids must be provided.
+    One of trip_id, vibe_ids or city_id must be provided.
     - If trip_id is provided, uses vibes from that trip
     - If vibe_ids is provided, uses those specific vibes
+    - If city_id is provided, lists every attraction in that city
     
     Args:
         trip_id: Optional trip ID to get vibes from
         vibe_ids: Optional comma-separated list of vibe IDs
+        city_id: Optional city ID to browse
         limit: Optional limit on number of results
         attraction_service: Attraction service (from dependency)
         
@@ -38,7 +100,7 @@ async def get_attractions(
         AttractionsListResponse with matching attractions
         
     Raises:
-        400: If neither trip_id nor vibe_ids is provided
+        400: If none of trip_id, vibe_ids or city_id is provided
     """
     if trip_id:
         # TODO: Re-add authentication
@@ -59,6 +121,11 @@ async def get_attractions(
             vibe_ids=vibe_id_list,
             limit=limit,
         )
+    elif city_id:
+        return await attraction_service.get_attractions_by_city(
+            city_id=city_id,
+            limit=limit,
+        )
     else:
-        raise ValueError("Either trip_id or vibe_ids must be provided")
+        raise ValueError("One of trip_id, vibe_ids or city_id must be provided")
 
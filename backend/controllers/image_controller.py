@@ -0,0 +1,158 @@
+"""Image controller for serving trip day photos."""
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from core.models.image import ImageSize
+from dtos.storage_dto import ImageListResponse
+from infrastructure.storage import storage_provider
+from services.core.storage_service import StorageService
+from services.core.storage_exceptions import (
+    StorageError,
+    ImageNotFoundError,
+    InvalidRangeError,
+    StorageConfigurationError,
+)
+
+router = APIRouter(prefix="/api/trips/{trip_id}/days/{trip_day_id}/images", tags=["images"])
+
+# Browsers keep the image but revalidate it with If-None-Match on every view
+IMAGE_CACHE_CONTROL = "private, no-cache"
+
+
+def get_storage_service() -> StorageService:
+    """
+    Dependency to get StorageService instance.
+    
+    Uses the shared S3Storage so requests reuse one S3 client.
+    """
+    try:
+        return StorageService(storage_backend=storage_provider.get_storage())
+    except StorageConfigurationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+
+@router.get("", response_model=ImageListResponse)
+async def list_images(
+    trip_id: int,
+    trip_day_id: int,
+    size: ImageSize = Query(ImageSize.ORIGINAL, description="Size variant the URLs point to"),
+    storage_service: StorageService = Depends(get_storage_service),
+) -> ImageListResponse:
+    """
+    List the images of a trip day at a size variant.
+    
+    Photo grids should ask for thumbnails; images without the requested
+    variant are listed with their original.
+    
+    Args:
+        trip_id: ID of the trip
+        trip_day_id: ID of the trip day
+        size: Size variant (original, medium or thumbnail)
+        storage_service: Storage service (from dependency)
+        
+    Returns:
+        ImageListResponse with presigned URLs for the requested size
+        
+    Raises:
+        HTTPException 500: If listing fails
+    """
+    try:
+        # TODO: Re-add authentication
+        return await storage_service.list_images(
+            user_id=1,
+            trip_id=trip_id,
+            trip_day_id=trip_day_id,
+            size=size,
+        )
+    except StorageError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list images: {str(e)}"
+        )
+
+
+@router.get("/{image_id}/content")
+async def get_image_content(
+    trip_id: int,
+    trip_day_id: int,
+    image_id: int,
+    size: ImageSize = Query(ImageSize.ORIGINAL, description="Size variant to stream"),
+    range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    storage_service: StorageService = Depends(get_storage_service),
+) -> Response:
+    """
+    Stream an image file.
+    
+    The file is streamed from storage chunk by chunk. A single byte Range
+    returns 206 with only those bytes, and an If-None-Match matching the
+    image's ETag returns 304 without a body.
+    
+    Args:
+        trip_id: ID of the trip
+        trip_day_id: ID of the trip day
+        image_id: ID of the image
+        size: Size variant (the original if the variant was not generated)
+        range: HTTP Range header
+        if_none_match: HTTP If-None-Match header
+        storage_service: Storage service (from dependency)
+        
+    Returns:
+        StreamingResponse with the image content (200 or 206), or an empty 304
+        
+    Raises:
+        HTTPException 404: If image not found
+        HTTPException 416: If the range lies outside the image
+        HTTPException 500: If retrieval fails
+    """
+    try:
+        # TODO: Re-add authentication
+        stream = await storage_service.open_image_stream(
+            user_id=1,
+            trip_id=trip_id,
+            trip_day_id=trip_day_id,
+            image_id=image_id,
+            size=size,
+            byte_range=range,
+            if_none_match=if_none_match,
+        )
+    except ImageNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except InvalidRangeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail=str(e)
+        )
+    except StorageError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve image: {str(e)}"
+        )
+    
+    headers = {"Accept-Ranges": "bytes", "Cache-Control": IMAGE_CACHE_CONTROL}
+    if stream.etag:
+        headers["ETag"] = stream.etag
+    
+    if stream.not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    headers["Content-Length"] = str(stream.content_length)
+    if stream.last_modified:
+        headers["Last-Modified"] = format_datetime(stream.last_modified.astimezone(timezone.utc), usegmt=True)
+    if stream.content_range:
+        headers["Content-Range"] = stream.content_range
+    
+    return StreamingResponse(
+        stream.body,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if stream.content_range else status.HTTP_200_OK,
+        media_type=stream.content_type,
+        headers=headers,
+    )
@@ -1,11 +1,13 @@
 """Trip controller for listing trips and active trip seeds."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
 from dtos.trip_dto import (
     TripsListResponse,
     CreateTripRequest,
     TripResponse,
     TripDetailsResponse,
 )
+from core.dependencies import RequestIdentityMap
 from services.trip_service import TripService
 from services.trip_seed_service import TripSeedService
 from services.core.agent.conversation_service import ConversationService
@@ -14,7 +16,7 @@ from services.core.agent.trip_seed_agent_service import TripSeedAgentService
 router = APIRouter(prefix="/api/trips", tags=["trips"])
 
 
-def get_trip_service() -> TripService:
+def get_trip_service(identity_map: RequestIdentityMap) -> TripService:
     """
     Dependency to get TripService instance.
     
@@ -28,28 +30,51 @@ def get_trip_service() -> TripService:
         conversation_service=conversation_service,
         agent_service=agent_service,
     )
-    return TripService(trip_seed_service=trip_seed_service)
+    return TripService(
+        trip_seed_service=trip_seed_service,
+        identity_map=identity_map,
+    )
 
 
 @router.get("", response_model=TripsListResponse)
 async def get_trips(
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size for trips and for active trip seeds (all if omitted)"),
+    trips_cursor: Optional[str] = Query(None, description="next_trips_cursor from the previous page"),
+    seeds_cursor: Optional[str] = Query(None, description="next_seeds_cursor from the previous page"),
     trip_service: TripService = Depends(get_trip_service),
 ) -> TripsListResponse:
     """
-    Get all trips and active trip seeds for the current user.
+    Get trips and active trip seeds for the current user.
     
     Returns:
     - trips: List of completed/saved trips
     - active_trip_seeds: List of in-progress trip planning conversations
     
     Args:
+        limit: Optional page size
+        trips_cursor: Cursor for the next page of trips
+        seeds_cursor: Cursor for the next page of active trip seeds
         trip_service: Trip service (from dependency)
         
     Returns:
-        TripsListResponse with trips and active trip seeds
+        TripsListResponse with trips, active trip seeds and next-page cursors
+        
+    Raises:
+        HTTPException 400: If a cursor is malformed
     """
-    # TODO: Re-add authentication
-    return await trip_service.get_user_trips_and_active_seeds(user_id=1)
+    try:
+        # TODO: Re-add authentication
+        return await trip_service.get_user_trips_and_active_seeds(
+            user_id=1,
+            limit=limit,
+            trips_cursor=trips_cursor,
+            seeds_cursor=seeds_cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.post("", response_model=TripResponse, status_code=status.HTTP_201_CREATED)
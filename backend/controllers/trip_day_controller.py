@@ -4,18 +4,20 @@ from typing import List
 from dtos.trip_day_dto import (
     TripDayResponse,
     CreateTripDayRequest,
+    CreateTripDaysRequest,
     UpdateTripDayRequest,
 )
+from core.dependencies import RequestIdentityMap
 from services.trip_day_service import TripDayService
 
 router = APIRouter(prefix="/api/trips/{trip_id}/days", tags=["trip-days"])
 
 
-def get_trip_day_service() -> TripDayService:
+def get_trip_day_service(identity_map: RequestIdentityMap) -> TripDayService:
     """
     Dependency to get TripDayService instance.
     """
-    return TripDayService()
+    return TripDayService(identity_map=identity_map)
 
 
 @router.get("", response_model=List[TripDayResponse])
@@ -83,6 +85,40 @@ async def create_trip_day(
         )
 
 
+@router.post("/batch", response_model=List[TripDayResponse], status_code=status.HTTP_201_CREATED)
+async def create_trip_days(
+    trip_id: int,
+    request: CreateTripDaysRequest,
+    trip_day_service: TripDayService = Depends(get_trip_day_service),
+) -> List[TripDayResponse]:
+    """
+    Create several days for a trip in one request.
+    
+    Args:
+        trip_id: ID of the trip
+        request: CreateTripDaysRequest with the days to create
+        trip_day_service: Trip day service (from dependency)
+        
+    Returns:
+        List of TripDayResponse objects for the new days
+        
+    Raises:
+        HTTPException 400: If trip not found, doesn't belong to user, a day_index is taken, or a city is not found
+    """
+    try:
+        # TODO: Re-add authentication
+        return await trip_day_service.create_trip_days(
+            user_id=1,
+            trip_id=trip_id,
+            request=request,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.put("/{day_id}", response_model=TripDayResponse)
 async def update_trip_day(
     trip_id: int,
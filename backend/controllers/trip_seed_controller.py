@@ -1,14 +1,22 @@
 """Trip Seed Agent controller for handling trip planning conversations."""
+import json
+from typing import AsyncIterator
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
 from dtos.trip_seed_dto import (
     TripSeedMessageRequest,
     TripSeedAgentResponse as TripSeedAgentResponseDTO,
     TripSeedStateResponse,
 )
 from dtos.agent_dto import ConversationResponse
-from services.trip_seed_service import TripSeedService
+from services.trip_seed_service import TripSeedService, ProcessMessageResponse
 from services.core.agent.conversation_service import ConversationService
 from services.core.agent.trip_seed_agent_service import TripSeedAgentService
+from services.core.agent.llm_exceptions import (
+    LLMQueueFullError,
+    LLMTimeoutError,
+    LLMUnavailableError,
+)
 
 router = APIRouter(prefix="/api/trip-seed", tags=["trip-seed"])
 
@@ -59,6 +67,8 @@ async def send_message(
         
     Raises:
         HTTPException 400: If conversation not found or validation fails
+        HTTPException 429: If too many model calls are waiting
+        HTTPException 503: If the model is unavailable or timed out
     """
     try:
         # TODO: Re-add authentication
@@ -81,6 +91,17 @@ async def send_message(
             is_complete=trip_seed_state.is_complete,  # Use the calculated state, not agent's guess
         )
         
+    except LLMQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except (LLMUnavailableError, LLMTimeoutError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -93,6 +114,78 @@ async def send_message(
         )
 
 
+def _sse_event(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/message/stream")
+async def send_message_stream(
+    request: TripSeedMessageRequest,
+    trip_seed_service: TripSeedService = Depends(get_trip_seed_service),
+) -> StreamingResponse:
+    """
+    Send a message to the trip seed agent and stream the reply as server-sent events.
+    
+    Events:
+    - delta: {"text": ...} - next piece of the agent's response_text
+    - done: TripSeedAgentResponseDTO - sent once TripSeed state has been updated
+    - error: {"detail": ...} - the agent failed after the stream started
+    
+    Args:
+        request: Message request with user message and optional conversation_id
+        trip_seed_service: Trip seed service (from dependency)
+        
+    Returns:
+        StreamingResponse with text/event-stream content
+        
+    Raises:
+        HTTPException 400: If conversation not found
+    """
+    try:
+        # TODO: Re-add authentication
+        # Resolve the conversation up front so errors still return a 400
+        stream = await trip_seed_service.process_message_stream(
+            user_id=1,
+            message=request.message,
+            conversation_id=request.conversation_id,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for item in stream:
+                if isinstance(item, ProcessMessageResponse):
+                    trip_seed_state = await trip_seed_service.get_trip_seed_state_response(
+                        item.trip_seed
+                    )
+                    response = TripSeedAgentResponseDTO(
+                        response_text=item.agent_response.response_text,
+                        conversation_id=item.conversation_id,
+                        trip_seed_state=trip_seed_state,
+                        is_complete=trip_seed_state.is_complete,
+                    )
+                    yield _sse_event("done", response.model_dump())
+                else:
+                    yield _sse_event("delta", {"text": item})
+        except LLMQueueFullError as e:
+            yield _sse_event("error", {"detail": str(e), "status": status.HTTP_429_TOO_MANY_REQUESTS})
+        except (LLMUnavailableError, LLMTimeoutError) as e:
+            yield _sse_event("error", {"detail": str(e), "status": status.HTTP_503_SERVICE_UNAVAILABLE})
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Failed to process message: {str(e)}"})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/conversations/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
     conversation_id: int,
@@ -6,17 +6,23 @@ from dtos.trip_stop_dto import (
     CreateTripStopRequest,
     UpdateTripStopRequest,
     ReorderStopsRequest,
+    BatchStopOperationsRequest,
 )
+from dtos.trip_day_dto import TripDayResponse
+from core.dependencies import RequestIdentityMap
 from services.trip_stop_service import TripStopService
 
 router = APIRouter(prefix="/api/trips/{trip_id}/days/{day_id}/stops", tags=["trip-stops"])
 
+# Operations that span several days of a trip
+trip_router = APIRouter(prefix="/api/trips/{trip_id}/stops", tags=["trip-stops"])
 
-def get_trip_stop_service() -> TripStopService:
+
+def get_trip_stop_service(identity_map: RequestIdentityMap) -> TripStopService:
     """
     Dependency to get TripStopService instance.
     """
-    return TripStopService()
+    return TripStopService(identity_map=identity_map)
 
 
 @router.get("", response_model=List[TripStopResponse])
@@ -200,3 +206,36 @@ async def reorder_stops(
             detail=str(e)
         )
 
+
+@trip_router.post("/batch", response_model=List[TripDayResponse])
+async def apply_stop_operations(
+    trip_id: int,
+    request: BatchStopOperationsRequest,
+    trip_stop_service: TripStopService = Depends(get_trip_stop_service),
+) -> List[TripDayResponse]:
+    """
+    Apply create/update/delete/move stop operations across a trip's days in one transaction.
+    
+    Args:
+        trip_id: ID of the trip
+        request: BatchStopOperationsRequest with the operations to apply in order
+        trip_stop_service: Trip stop service (from dependency)
+        
+    Returns:
+        List of TripDayResponse objects for every day the batch touched
+        
+    Raises:
+        HTTPException 400: If trip/day/stop not found, doesn't belong to user, or validation fails
+    """
+    try:
+        # TODO: Re-add authentication
+        return await trip_stop_service.apply_stop_operations(
+            user_id=1,
+            trip_id=trip_id,
+            request=request,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
@@ -43,6 +43,16 @@ class Settings(BaseSettings):
     watsonx_project_id: str | None = Field(default=None, alias="WATSONX_PROJECT_ID")
     watsonx_url: str | None = Field(default=None, alias="WATSONX_URL")
     watsonx_model_id: str | None = Field(default="ibm/granite-3-8b-instruct", alias="WATSONX_MODEL_ID")
+    watsonx_max_connections: int = Field(default=20, alias="WATSONX_MAX_CONNECTIONS")
+    
+    # Chat model backend: "watsonx", or "fake" for a local stand-in (load testing, offline development)
+    llm_backend: str = Field(default="watsonx", alias="LLM_BACKEND")
+    llm_fake_latency_median_ms: float = Field(default=600.0, alias="LLM_FAKE_LATENCY_MEDIAN_MS")
+    llm_fake_latency_sigma: float = Field(default=0.4, alias="LLM_FAKE_LATENCY_SIGMA")
+    llm_fake_chunk_chars: int = Field(default=12, alias="LLM_FAKE_CHUNK_CHARS")
+    llm_fake_chunk_delay_ms: float = Field(default=15.0, alias="LLM_FAKE_CHUNK_DELAY_MS")
+    llm_fake_error_rate: float = Field(default=0.0, alias="LLM_FAKE_ERROR_RATE")
+    llm_fake_seed: int | None = Field(default=None, alias="LLM_FAKE_SEED")
     
     # S3/Object Storage (S3-compatible: MinIO for local, IBM Cloud Object Storage for production)
     s3_endpoint: str | None = Field(default=None, alias="S3_ENDPOINT")
@@ -51,6 +61,59 @@ class Settings(BaseSettings):
     s3_bucket_name: str | None = Field(default=None, alias="S3_BUCKET_NAME")
     s3_use_ssl: bool = Field(default=True, alias="S3_USE_SSL")
     s3_region: str = Field(default="us-east-1", alias="S3_REGION")
+    s3_max_connections: int = Field(default=20, alias="S3_MAX_CONNECTIONS")
+    s3_multipart_part_size: int = Field(default=8 * 1024 * 1024, alias="S3_MULTIPART_PART_SIZE")
+    s3_multipart_max_in_flight: int = Field(default=4, alias="S3_MULTIPART_MAX_IN_FLIGHT")
+    
+    # Presigned image URLs (signed locally, re-signed shortly before they expire)
+    presigned_url_expiration_seconds: int = Field(default=3600, alias="PRESIGNED_URL_EXPIRATION_SECONDS")
+    presigned_url_refresh_margin_seconds: int = Field(default=300, alias="PRESIGNED_URL_REFRESH_MARGIN_SECONDS")
+    presigned_url_cache_max_entries: int = Field(default=10000, alias="PRESIGNED_URL_CACHE_MAX_ENTRIES")
+    
+    # Image derivatives (thumbnail and medium JPEGs rendered in a process pool on upload)
+    image_derivatives_enabled: bool = Field(default=True, alias="IMAGE_DERIVATIVES_ENABLED")
+    image_derivative_workers: int = Field(default=2, alias="IMAGE_DERIVATIVE_WORKERS")
+    image_derivative_max_source_bytes: int = Field(default=25 * 1024 * 1024, alias="IMAGE_DERIVATIVE_MAX_SOURCE_BYTES")
+    image_thumbnail_max_edge: int = Field(default=320, alias="IMAGE_THUMBNAIL_MAX_EDGE")
+    image_medium_max_edge: int = Field(default=1280, alias="IMAGE_MEDIUM_MAX_EDGE")
+    image_derivative_jpeg_quality: int = Field(default=82, alias="IMAGE_DERIVATIVE_JPEG_QUALITY")
+    
+    # Attraction catalog (in-memory vibe matching)
+    attraction_catalog_ttl_seconds: int = Field(default=300, alias="ATTRACTION_CATALOG_TTL_SECONDS")
+    
+    # Outbound LLM call dispatch (concurrency cap and bounded wait queue); the cap
+    # counts model calls, and a hedged duplicate only runs if it can take a free slot
+    llm_max_concurrency: int = Field(default=8, alias="LLM_MAX_CONCURRENCY")
+    llm_max_queue_size: int = Field(default=64, alias="LLM_MAX_QUEUE_SIZE")
+    
+    # Outbound LLM call resilience (timeouts, retries, hedging and circuit breaker)
+    llm_call_timeout_seconds: float = Field(default=30.0, alias="LLM_CALL_TIMEOUT_SECONDS")
+    llm_max_retries: int = Field(default=2, alias="LLM_MAX_RETRIES")
+    llm_retry_base_delay_seconds: float = Field(default=0.25, alias="LLM_RETRY_BASE_DELAY_SECONDS")
+    llm_retry_max_delay_seconds: float = Field(default=2.0, alias="LLM_RETRY_MAX_DELAY_SECONDS")
+    llm_hedging_enabled: bool = Field(default=False, alias="LLM_HEDGING_ENABLED")
+    llm_hedge_min_delay_seconds: float = Field(default=1.0, alias="LLM_HEDGE_MIN_DELAY_SECONDS")
+    llm_breaker_failure_rate: float = Field(default=0.5, alias="LLM_BREAKER_FAILURE_RATE")
+    llm_breaker_min_calls: int = Field(default=10, alias="LLM_BREAKER_MIN_CALLS")
+    llm_breaker_window_seconds: float = Field(default=60.0, alias="LLM_BREAKER_WINDOW_SECONDS")
+    llm_breaker_open_seconds: float = Field(default=30.0, alias="LLM_BREAKER_OPEN_SECONDS")
+    
+    # Agent conversation context (history window, truncated transcript tail and token budget)
+    agent_history_max_turns: int = Field(default=6, alias="AGENT_HISTORY_MAX_TURNS")
+    agent_context_token_budget: int = Field(default=3000, alias="AGENT_CONTEXT_TOKEN_BUDGET")
+    agent_summary_token_budget: int = Field(default=400, alias="AGENT_SUMMARY_TOKEN_BUDGET")
+    
+    # Agent response cache (deterministic calls only unless sampling is allowed)
+    agent_response_cache_enabled: bool = Field(default=True, alias="AGENT_RESPONSE_CACHE_ENABLED")
+    agent_response_cache_ttl_seconds: int = Field(default=600, alias="AGENT_RESPONSE_CACHE_TTL_SECONDS")
+    agent_response_cache_max_entries: int = Field(default=1024, alias="AGENT_RESPONSE_CACHE_MAX_ENTRIES")
+    agent_response_cache_allow_sampling: bool = Field(default=False, alias="AGENT_RESPONSE_CACHE_ALLOW_SAMPLING")
+    
+    # Answer simple trip seed turns with rules instead of the model
+    trip_seed_fast_path_enabled: bool = Field(default=True, alias="TRIP_SEED_FAST_PATH_ENABLED")
+    
+    # Itinerary cache (assembled TripDetailsResponse per trip)
+    itinerary_cache_max_entries: int = Field(default=1024, alias="ITINERARY_CACHE_MAX_ENTRIES")
     
     class Config:
         env_file = ".env"
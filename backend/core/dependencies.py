@@ -1,7 +1,8 @@
-"""FastAPI dependencies for authentication and authorization."""
+"""FastAPI dependencies for authentication, authorization and request-scoped data loading."""
 from typing import Annotated, Optional
 from fastapi import Depends, HTTPException, status
 from core.auth import JWT, JWTPayload
+from core.identity_map import IdentityMap
 from core.models.user import User
 
 
@@ -105,3 +106,20 @@ async def get_current_user(jwt: JWTPayload) -> User:
 # Type alias for easy use in controllers
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
+
+def get_identity_map() -> IdentityMap:
+    """
+    Get the identity map for the current request.
+    
+    FastAPI caches dependencies per request, so every service built for the
+    same request shares one IdentityMap and its batched, cached lookups.
+    
+    Usage:
+        def get_trip_day_service(identity_map: RequestIdentityMap) -> TripDayService:
+            return TripDayService(identity_map=identity_map)
+    """
+    return IdentityMap()
+
+
+# Type alias for service factories
+RequestIdentityMap = Annotated[IdentityMap, Depends(get_identity_map)]
@@ -0,0 +1,133 @@
+"""
+Request-scoped identity map for commonly looked-up models.
+
+Each request gets one IdentityMap (see `get_identity_map` in
+core/dependencies.py). Looking up the same Trip, TripDay, City or Attraction
+twice within the request returns the same instance without another query,
+and lookups started by concurrent coroutines before the loader gets to run
+are batched into a single `id__in` query, DataLoader style.
+
+The map only lives for one request, so it never serves data across requests.
+Services that delete a row should `forget` it so later lookups in the same
+request don't return the deleted instance.
+"""
+import asyncio
+from typing import Dict, Generic, Optional, Type, TypeVar
+from tortoise.models import Model
+from core.models.trips.trip import Trip
+from core.models.trips.trip_day import TripDay
+from core.models.places.city import City
+from core.models.places.attraction import Attraction
+
+MODEL = TypeVar("MODEL", bound=Model)
+
+
+class ModelLoader(Generic[MODEL]):
+    """Batching, caching primary key loader for one model."""
+    
+    def __init__(self, model: Type[MODEL]):
+        """
+        Initialize an empty loader.
+        
+        Args:
+            model: Tortoise model class to load
+        """
+        self.model = model
+        self._results: Dict[int, asyncio.Future] = {}
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self.query_count = 0
+    
+    async def load(self, pk: int) -> Optional[MODEL]:
+        """
+        Load an instance by primary key.
+        
+        Args:
+            pk: Primary key of the instance
+        
+        Returns:
+            The instance, or None if it doesn't exist
+        """
+        future = self._results.get(pk)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._results[pk] = future
+            self._pending[pk] = future
+            if self._dispatch_task is None:
+                # Runs after every coroutine already scheduled has queued its keys
+                self._dispatch_task = loop.create_task(self._dispatch())
+        # Shield so one cancelled caller doesn't cancel the lookup for the others
+        return await asyncio.shield(future)
+    
+    async def _dispatch(self) -> None:
+        """Load every pending key with one query."""
+        batch, self._pending = self._pending, {}
+        self._dispatch_task = None
+        
+        try:
+            self.query_count += 1
+            instances = await self.model.filter(pk__in=list(batch))
+        except Exception as e:
+            for pk, future in batch.items():
+                self._results.pop(pk, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        found = {instance.pk: instance for instance in instances}
+        for pk, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(pk))
+    
+    def prime(self, instance: MODEL) -> None:
+        """Store an instance loaded or created elsewhere."""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(instance)
+        self._results[instance.pk] = future
+    
+    def forget(self, pk: int) -> None:
+        """Drop a cached instance (e.g. after deleting it)."""
+        self._results.pop(pk, None)
+
+
+class IdentityMap:
+    """Per-request loaders for trips, trip days, cities and attractions."""
+    
+    def __init__(self):
+        """Initialize empty loaders."""
+        self.trips: ModelLoader[Trip] = ModelLoader(Trip)
+        self.trip_days: ModelLoader[TripDay] = ModelLoader(TripDay)
+        self.cities: ModelLoader[City] = ModelLoader(City)
+        self.attractions: ModelLoader[Attraction] = ModelLoader(Attraction)
+    
+    async def get_trip(self, trip_id: int, user_id: int) -> Optional[Trip]:
+        """Get a trip if it exists and belongs to the user."""
+        trip = await self.trips.load(trip_id)
+        if trip and trip.user_id == user_id:
+            return trip
+        return None
+    
+    async def get_trip_day(self, day_id: int, trip_id: int) -> Optional[TripDay]:
+        """Get a trip day if it exists and belongs to the trip."""
+        day = await self.trip_days.load(day_id)
+        if day and day.trip_id == trip_id:
+            return day
+        return None
+    
+    async def get_city(self, city_id: int) -> Optional[City]:
+        """Get a city by ID."""
+        return await self.cities.load(city_id)
+    
+    async def get_attraction(self, attraction_id: int) -> Optional[Attraction]:
+        """Get an attraction by ID."""
+        return await self.attractions.load(attraction_id)
+    
+    def stats(self) -> dict:
+        """Get the number of queries issued per model."""
+        return {
+            "trips": self.trips.query_count,
+            "trip_days": self.trip_days.query_count,
+            "cities": self.cities.query_count,
+            "attractions": self.attractions.query_count,
+        }
@@ -1,7 +1,7 @@
 """Models package."""
 from core.models.base import BaseModel
 from core.models.user import User
-from core.models.image import Image
+from core.models.image import Image, ImageSize
 from core.models.conversation import Conversation, Message
 
 # Places domain
@@ -35,6 +35,7 @@ __all__ = [
     "User",
     # Storage
     "Image",
+    "ImageSize",
     # Conversations
     "Conversation",
     "Message",
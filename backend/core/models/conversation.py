@@ -9,6 +9,9 @@ class Conversation(BaseModel):
     user_id = fields.IntField(index=True)
     trip_id = fields.IntField(null=True, index=True)  # Optional trip context
     agent_name = fields.CharField(max_length=100, null=True)  # Optional: which agent was used
+    summary = fields.TextField(null=True)  # Truncated transcript tail of turns that left the history window
+    summary_message_count = fields.IntField(default=0)  # Messages (by sequence_index) folded into the tail
+    message_count = fields.IntField(default=0)  # Messages added so far; allocates the next sequence_index
     
     class Meta:
         table = "conversations"
@@ -1,8 +1,17 @@
 """Image model for storing image metadata."""
+from enum import Enum
+from typing import Optional
 from tortoise import fields
 from core.models.base import BaseModel
 
 
+class ImageSize(str, Enum):
+    """Size variants an image is served in."""
+    ORIGINAL = "original"
+    MEDIUM = "medium"
+    THUMBNAIL = "thumbnail"
+
+
 class Image(BaseModel):
     """Image model with metadata for user trip photos."""
     
@@ -14,6 +23,10 @@ class Image(BaseModel):
     url = fields.CharField(max_length=1024)  # Presigned URL
     file_size = fields.IntField()  # Size in bytes
     content_type = fields.CharField(max_length=100)  # MIME type
+    width = fields.IntField(null=True)  # Original dimensions, once decoded
+    height = fields.IntField(null=True)
+    medium_s3_key = fields.CharField(max_length=512, null=True)  # Derivatives (JPEG)
+    thumbnail_s3_key = fields.CharField(max_length=512, null=True)
     
     class Meta:
         table = "images"
@@ -21,6 +34,14 @@ class Image(BaseModel):
             ("user_id", "trip_id", "trip_day_id"),  # Composite index for queries
         ]
     
+    def variant_s3_key(self, size: ImageSize) -> Optional[str]:
+        """Get the S3 key of a size variant (None if it was not generated)."""
+        if size == ImageSize.MEDIUM:
+            return self.medium_s3_key
+        if size == ImageSize.THUMBNAIL:
+            return self.thumbnail_s3_key
+        return self.s3_key
+    
     def __str__(self):
         return f"Image(id={self.id}, user_id={self.user_id}, trip_id={self.trip_id}, s3_key={self.s3_key})"
 
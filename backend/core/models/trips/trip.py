@@ -28,6 +28,9 @@ class Trip(BaseModel):
     
     class Meta:
         table = "trips"
+        indexes = [
+            ("user_id", "created_at", "id"),  # Keyset pagination of a user's trips
+        ]
     
     def __str__(self):
         return f"Trip(id={self.id}, name={self.name}, user_id={self.user_id}, status={self.status})"
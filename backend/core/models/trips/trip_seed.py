@@ -28,10 +28,15 @@ class TripSeed(BaseModel):
     trip_mode = fields.CharEnumField(TripMode)
     budget_band = fields.CharEnumField(BudgetBand)
     companions = fields.CharEnumField(Companions, null=True)
+    # Required fields the user has actually given; the others hold placeholders
+    provided_fields = fields.JSONField(default=list)
     status = fields.CharEnumField(TripSeedStatus, default=TripSeedStatus.DRAFT)
     
     class Meta:
         table = "trip_seeds"
+        indexes = [
+            ("updated_at", "id"),  # Keyset pagination of active trip seeds
+        ]
     
     def __str__(self):
         return f"TripSeed(id={self.id}, conversation_id={self.conversation_id}, status={self.status})"
@@ -33,6 +33,7 @@ class AttractionResponse(BaseModel):
     seasonality: Optional[str] = None
     image_url: Optional[str] = None
     vibes: List[AttractionVibeInfo]
+    distance_km: Optional[float] = None  # Set by nearby queries
     created_at: str
     updated_at: str
     
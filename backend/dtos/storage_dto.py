@@ -1,4 +1,5 @@
 """Data Transfer Objects for storage operations."""
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -11,8 +12,12 @@ class ImageMetadataResponse(BaseModel):
     filename: str
     s3_key: str
     url: str
-    file_size: int
-    content_type: str
+    file_size: int  # Size of the original
+    content_type: str  # Of the file `url` points to
+    size: str = "original"  # Size variant `url` and `s3_key` point to
+    width: Optional[int] = None  # Original dimensions
+    height: Optional[int] = None
+    sizes: list[str] = []  # Size variants available
     created_at: str
     updated_at: str
     
@@ -31,6 +36,9 @@ class ImageUploadResponse(BaseModel):
     url: str
     file_size: int
     content_type: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    sizes: list[str] = []  # Size variants available
     created_at: str
     
     class Config:
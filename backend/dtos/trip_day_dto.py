@@ -29,6 +29,11 @@ class CreateTripDayRequest(BaseModel):
     notes: Optional[str] = None
 
 
+class CreateTripDaysRequest(BaseModel):
+    """Request DTO for creating several trip days at once."""
+    days: List[CreateTripDayRequest]
+
+
 class UpdateTripDayRequest(BaseModel):
     """Request DTO for updating a trip day."""
     base_city_id: Optional[int] = None
@@ -49,8 +49,10 @@ class TripsListResponse(BaseModel):
     """Response DTO for listing trips and active trip seeds."""
     trips: List[TripResponse]  # Completed/saved trips
     active_trip_seeds: List[ActiveTripSeedResponse]  # In-progress conversations
-    total_trips: int
-    total_active: int
+    total_trips: int  # Trips in this page
+    total_active: int  # Active trip seeds in this page
+    next_trips_cursor: Optional[str] = None  # Pass as trips_cursor for the next page (None on the last page)
+    next_seeds_cursor: Optional[str] = None  # Pass as seeds_cursor for the next page (None on the last page)
 
 
 class CreateTripRequest(BaseModel):
@@ -78,4 +80,18 @@ class TripDetailsResponse(BaseModel):
     updated_at: str
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Resolve forward references at module level
+# This allows TripDetailsResponse to reference TripDayResponse
+def _resolve_forward_refs():
+    """Resolve forward references after TripDayResponse is available."""
+    try:
+        from dtos.trip_day_dto import TripDayResponse
+        TripDetailsResponse.model_rebuild()
+    except (ImportError, AttributeError):
+        # Will be resolved when trip_day_dto is imported, or if using Pydantic v1
+        pass
+
+_resolve_forward_refs()
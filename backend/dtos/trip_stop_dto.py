@@ -46,3 +46,19 @@ class ReorderStopsRequest(BaseModel):
     """Request DTO for reordering stops within a day."""
     stop_orders: List[StopOrderItem]
 
+
+
+class StopOperation(BaseModel):
+    """A single operation in a batch itinerary edit."""
+    op: str  # create, update, delete, move
+    stop_id: Optional[int] = None  # Stop to update, delete or move
+    day_id: Optional[int] = None  # Day to create in, or to move to
+    attraction_id: Optional[int] = None
+    label: Optional[str] = None
+    slot: Optional[str] = None  # morning, afternoon, evening, flex
+    order_index: Optional[int] = None
+
+
+class BatchStopOperationsRequest(BaseModel):
+    """Request DTO for applying several stop operations across the days of a trip."""
+    operations: List[StopOperation]
@@ -0,0 +1,138 @@
+"""
+Local stand-in for the WatsonX chat model, for load testing and offline development.
+
+Selected with LLM_BACKEND=fake. FakeChatModel has the same async surface the
+agents use (`ainvoke` and `astream` with per-call params), so the whole chat
+path (dispatcher, resilience layer, history, parsing) runs unchanged. Reply
+text comes from a responder supplied by each agent, so replies stay valid for
+the agent's schema.
+
+The latency until the first token follows a log-normal distribution (a long
+tail like a real model service), replies are streamed in fixed-size chunks
+with a delay between them, and a configurable share of calls fails with an
+HTTP 503 error, which the resilience layer treats as transient.
+"""
+import asyncio
+import math
+import random
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, List, Optional
+import httpx
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from core.config import settings
+
+# Builds the raw reply text for a list of messages
+Responder = Callable[[List[BaseMessage]], str]
+
+
+@dataclass
+class FakeLLMProfile:
+    """Latency, chunking and error behaviour of the fake backend."""
+    latency_median_ms: float = 600.0  # Median time to the first token
+    latency_sigma: float = 0.4  # Log-normal shape (larger means a longer tail)
+    chunk_chars: int = 12  # Characters per streamed chunk
+    chunk_delay_ms: float = 15.0  # Delay between streamed chunks
+    error_rate: float = 0.0  # Share of calls failing with HTTP 503
+    seed: Optional[int] = None  # Seed for reproducible runs
+
+
+class FakeLLMBackend:
+    """Creates fake chat models sharing one profile, random generator and counters."""
+    
+    def __init__(self, profile: FakeLLMProfile):
+        """
+        Initialize the backend.
+        
+        Args:
+            profile: Latency, chunking and error behaviour
+        """
+        self.profile = profile
+        self.random = random.Random(profile.seed)
+        self.calls = 0
+        self.errors = 0
+    
+    def chat_model(self, responder: Responder) -> "FakeChatModel":
+        """Create a chat model answering with `responder`."""
+        return FakeChatModel(self, responder)
+    
+    def sample_latency(self) -> float:
+        """Sample the time to the first token, in seconds."""
+        median = max(self.profile.latency_median_ms, 0.001) / 1000
+        return self.random.lognormvariate(math.log(median), self.profile.latency_sigma)
+    
+    def should_fail(self) -> bool:
+        """Decide whether the next call fails."""
+        return self.random.random() < self.profile.error_rate
+    
+    def stats(self) -> dict:
+        """Get call and injected error counts."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency_median_ms": self.profile.latency_median_ms,
+            "error_rate": self.profile.error_rate,
+        }
+
+
+class FakeChatModel:
+    """Chat model with the ChatWatsonx call surface, answering locally."""
+    
+    def __init__(self, backend: FakeLLMBackend, responder: Responder):
+        """
+        Initialize the model.
+        
+        Args:
+            backend: Backend providing the profile, randomness and counters
+            responder: Builds the reply text for the messages of a call
+        """
+        self.backend = backend
+        self.responder = responder
+    
+    async def ainvoke(self, messages: List[BaseMessage], params: Optional[dict] = None) -> AIMessage:
+        """Wait as long as streaming the whole reply would take, then return it."""
+        text = await self._start(messages)
+        chunks = self._split(text)
+        await asyncio.sleep(max(len(chunks) - 1, 0) * self.backend.profile.chunk_delay_ms / 1000)
+        return AIMessage(content=text)
+    
+    async def astream(
+        self,
+        messages: List[BaseMessage],
+        params: Optional[dict] = None,
+    ) -> AsyncIterator[AIMessageChunk]:
+        """Stream the reply in fixed-size chunks."""
+        text = await self._start(messages)
+        for index, chunk in enumerate(self._split(text)):
+            if index:
+                await asyncio.sleep(self.backend.profile.chunk_delay_ms / 1000)
+            yield AIMessageChunk(content=chunk)
+    
+    async def _start(self, messages: List[BaseMessage]) -> str:
+        """Wait for the first token (or fail), then build the reply."""
+        backend = self.backend
+        backend.calls += 1
+        await asyncio.sleep(backend.sample_latency())
+        
+        if backend.should_fail():
+            backend.errors += 1
+            request = httpx.Request("POST", "http://fake-llm.local/ml/v1/text/chat")
+            response = httpx.Response(503, request=request)
+            raise httpx.HTTPStatusError("Injected fake LLM failure", request=request, response=response)
+        
+        return self.responder(messages)
+    
+    def _split(self, text: str) -> List[str]:
+        size = max(self.backend.profile.chunk_chars, 1)
+        return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+def fake_llm_profile_from_settings() -> FakeLLMProfile:
+    """Build the fake backend profile from LLM_FAKE_* settings."""
+    return FakeLLMProfile(
+        latency_median_ms=settings.llm_fake_latency_median_ms,
+        latency_sigma=settings.llm_fake_latency_sigma,
+        chunk_chars=settings.llm_fake_chunk_chars,
+        chunk_delay_ms=settings.llm_fake_chunk_delay_ms,
+        error_rate=settings.llm_fake_error_rate,
+        seed=settings.llm_fake_seed,
+    )
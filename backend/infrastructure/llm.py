@@ -0,0 +1,179 @@
+"""Chat model provider for sharing IBM WatsonX clients across requests."""
+import threading
+from typing import Dict, Optional, Tuple
+import httpx
+from ibm_watsonx_ai import APIClient, Credentials
+from ibm_watsonx_ai.utils.utils import HttpClientConfig
+from langchain_ibm import ChatWatsonx
+from core.config import settings
+from infrastructure.fake_llm import FakeChatModel, FakeLLMBackend, Responder, fake_llm_profile_from_settings
+
+# Supported values of LLM_BACKEND
+LLM_BACKENDS = ("watsonx", "fake")
+
+
+class ChatModelProvider:
+    """
+    Process-wide registry of WatsonX chat model clients.
+    
+    Building a ChatWatsonx authenticates against IBM Cloud IAM and opens new
+    HTTP connection pools, so constructing one per request pays a token
+    exchange and fresh TLS handshakes on every chat turn. The provider keeps
+    one APIClient per set of credentials (it caches and refreshes the IAM
+    token itself and keeps its connections alive) and one ChatWatsonx per
+    model on top of it. Generation params are passed per call, so agents with
+    different params share the same client.
+    
+    With the "fake" backend, agents get local FakeChatModel instances instead
+    (see infrastructure/fake_llm.py) and no WatsonX client is ever created.
+    """
+    
+    def __init__(self, max_connections: int = 20, backend: str = "watsonx"):
+        """
+        Initialize an empty provider.
+        
+        Args:
+            max_connections: Size of each client's HTTP connection pool
+            backend: Chat model backend, one of LLM_BACKENDS
+            
+        Raises:
+            ValueError: If the backend is not supported
+        """
+        if backend not in LLM_BACKENDS:
+            raise ValueError(f"Unsupported LLM_BACKEND {backend!r}, expected one of {', '.join(LLM_BACKENDS)}")
+        self.max_connections = max_connections
+        self.backend = backend
+        self._fake_backend: Optional[FakeLLMBackend] = None
+        self._api_clients: Dict[Tuple[str, str, str], APIClient] = {}
+        self._chat_models: Dict[Tuple[str, str, str, str], ChatWatsonx] = {}
+        # Clients are created from worker threads during warm-up and from the event loop
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_chat_model(
+        self,
+        model_id: str,
+        url: str,
+        api_key: str,
+        project_id: str,
+    ) -> ChatWatsonx:
+        """
+        Get the shared chat model for a model and set of credentials.
+        
+        The first call for a given key authenticates and creates the client;
+        later calls return the same instance.
+        
+        Args:
+            model_id: The WatsonX model ID
+            url: IBM WatsonX service URL
+            api_key: IBM WatsonX API key
+            project_id: IBM WatsonX project ID
+            
+        Returns:
+            Shared ChatWatsonx instance
+        """
+        credentials_key = (url, api_key, project_id)
+        key = (*credentials_key, model_id)
+        
+        with self._lock:
+            chat_model = self._chat_models.get(key)
+            if chat_model is not None:
+                self.hits += 1
+                return chat_model
+            
+            self.misses += 1
+            api_client = self._api_clients.get(credentials_key)
+            if api_client is None:
+                http_config = HttpClientConfig(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                )
+                api_client = APIClient(
+                    credentials=Credentials(url=url, api_key=api_key),
+                    project_id=project_id,
+                    httpx_client=http_config,
+                    async_httpx_client=http_config,
+                )
+                self._api_clients[credentials_key] = api_client
+            
+            chat_model = ChatWatsonx(
+                model_id=model_id,
+                project_id=project_id,
+                watsonx_client=api_client,
+            )
+            self._chat_models[key] = chat_model
+            return chat_model
+    
+    def get_fake_chat_model(self, responder: Responder) -> FakeChatModel:
+        """
+        Get a local fake chat model (LLM_BACKEND=fake).
+        
+        All fake models share one backend, so latency sampling, error
+        injection and counters are process-wide.
+        
+        Args:
+            responder: Builds the reply text for the messages of a call
+            
+        Returns:
+            FakeChatModel answering with `responder`
+        """
+        with self._lock:
+            if self._fake_backend is None:
+                self._fake_backend = FakeLLMBackend(fake_llm_profile_from_settings())
+            return self._fake_backend.chat_model(responder)
+    
+    def get_default_chat_model(self) -> ChatWatsonx:
+        """
+        Get the chat model configured in settings.
+        
+        Raises:
+            ValueError: If WatsonX credentials are not configured
+        """
+        if not (settings.watsonx_apikey and settings.watsonx_project_id and settings.watsonx_url):
+            raise ValueError("WatsonX credentials are not configured")
+        return self.get_chat_model(
+            model_id=settings.watsonx_model_id or "ibm/granite-3-8b-instruct",
+            url=settings.watsonx_url,
+            api_key=settings.watsonx_apikey,
+            project_id=settings.watsonx_project_id,
+        )
+    
+    async def close(self) -> None:
+        """Close every client's connection pools.
+        
+        Call this on application shutdown.
+        """
+        with self._lock:
+            api_clients = list(self._api_clients.values())
+            self._api_clients.clear()
+            self._chat_models.clear()
+        
+        for api_client in api_clients:
+            try:
+                api_client.httpx_client.close()
+                await api_client.async_httpx_client.aclose()
+            except Exception:
+                pass
+    
+    def stats(self) -> dict:
+        """Get client counts and reuse statistics."""
+        stats = {
+            "backend": self.backend,
+            "clients": len(self._api_clients),
+            "chat_models": len(self._chat_models),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+        if self._fake_backend is not None:
+            stats["fake"] = self._fake_backend.stats()
+        return stats
+
+
+# Singleton instance shared by all agent services
+chat_model_provider = ChatModelProvider(
+    max_connections=settings.watsonx_max_connections,
+    backend=settings.llm_backend,
+)
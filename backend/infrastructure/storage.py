@@ -0,0 +1,49 @@
+"""Storage provider for sharing one S3Storage (and its S3 client) across requests."""
+from typing import Optional
+from services.core.s3_storage import S3Storage
+from services.core.storage_exceptions import StorageConfigurationError
+
+
+class StorageProvider:
+    """Manages the shared S3Storage and its client lifecycle."""
+    
+    def __init__(self):
+        """Initialize the provider without a storage backend."""
+        self._storage: Optional[S3Storage] = None
+    
+    def get_storage(self) -> S3Storage:
+        """
+        Get the shared S3Storage.
+        
+        Returns:
+            Shared S3Storage instance
+            
+        Raises:
+            StorageConfigurationError: If S3 configuration is incomplete
+        """
+        if self._storage is None:
+            self._storage = S3Storage()
+        return self._storage
+    
+    async def init(self) -> None:
+        """Open the shared S3 client if storage is configured.
+        
+        Call this on application startup.
+        """
+        try:
+            storage = self.get_storage()
+        except StorageConfigurationError:
+            return
+        await storage.open()
+    
+    async def close(self) -> None:
+        """Close the shared S3 client.
+        
+        Call this on application shutdown.
+        """
+        if self._storage is not None:
+            await self._storage.close()
+
+
+# Singleton instance for FastAPI dependency injection
+storage_provider = StorageProvider()
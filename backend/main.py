@@ -1,13 +1,26 @@
 """FastAPI application entry point."""
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from infrastructure.database import db_provider
+from infrastructure.llm import chat_model_provider
+from infrastructure.storage import storage_provider
 from controllers.auth_controller import router as auth_router
 from controllers.trip_seed_controller import router as trip_seed_router
 from controllers.trip_controller import router as trip_router
 from controllers.trip_day_controller import router as trip_day_router
 from controllers.trip_stop_controller import router as trip_stop_router
+from controllers.trip_stop_controller import trip_router as trip_stop_batch_router
 from controllers.attraction_controller import router as attraction_router
+from controllers.image_controller import router as image_router
+from services.core.catalog.attraction_catalog import attraction_catalog
+from services.core.itinerary_cache import itinerary_cache
+from services.core.presigned_url_cache import presigned_url_cache
+from services.core.image_derivatives import image_derivative_pipeline
+from services.core.agent.llm_dispatcher import llm_dispatcher
+from services.core.agent.llm_resilience import llm_resilience
+from services.core.agent.response_cache import agent_response_cache
+from services.core.agent.trip_seed_fast_path import trip_seed_fast_path
 
 
 app = FastAPI(
@@ -31,7 +44,9 @@ app.include_router(trip_seed_router)
 app.include_router(trip_router)
 app.include_router(trip_day_router)
 app.include_router(trip_stop_router)
+app.include_router(trip_stop_batch_router)
 app.include_router(attraction_router)
+app.include_router(image_router)
 
 
 @app.on_event("startup")
@@ -39,6 +54,30 @@ async def startup():
     """Initialize infrastructure providers on app startup."""
     await db_provider.init()
     print("Database provider initialized")
+    
+    # Warm the attraction catalog so the first request doesn't pay for the load
+    try:
+        await attraction_catalog.refresh()
+        print(f"Attraction catalog loaded: {attraction_catalog.stats()}")
+    except Exception as e:
+        print(f"Attraction catalog warm-up skipped: {e}")
+    
+    if chat_model_provider.backend != "watsonx":
+        print(f"Chat model backend: {chat_model_provider.backend}")
+    else:
+        # Authenticate the shared WatsonX client now instead of on the first chat turn
+        try:
+            await asyncio.to_thread(chat_model_provider.get_default_chat_model)
+            print(f"Chat model provider initialized: {chat_model_provider.stats()}")
+        except Exception as e:
+            print(f"Chat model warm-up skipped: {e}")
+    
+    # Open the shared S3 client (connection pool) once instead of per storage call
+    try:
+        await storage_provider.init()
+        print("Storage provider initialized")
+    except Exception as e:
+        print(f"Storage provider initialization skipped: {e}")
 
 
 @app.on_event("shutdown")
@@ -46,6 +85,15 @@ async def shutdown():
     """Close infrastructure providers on app shutdown."""
     await db_provider.close()
     print("Database provider closed")
+    
+    await chat_model_provider.close()
+    print("Chat model provider closed")
+    
+    await storage_provider.close()
+    print("Storage provider closed")
+    
+    image_derivative_pipeline.close()
+    print("Image derivative pipeline closed")
 
 
 @app.get("/")
@@ -63,3 +111,18 @@ async def health():
         "database": "connected" if db_healthy else "disconnected",
     }
 
+
+@app.get("/metrics")
+async def metrics():
+    """In-process performance metrics (caches, catalogs, shared clients)."""
+    return {
+        "attraction_catalog": attraction_catalog.stats(),
+        "itinerary_cache": itinerary_cache.stats(),
+        "chat_models": chat_model_provider.stats(),
+        "trip_seed_fast_path": trip_seed_fast_path.stats(),
+        "agent_response_cache": agent_response_cache.stats(),
+        "llm_dispatcher": llm_dispatcher.stats(),
+        "llm_resilience": llm_resilience.stats(),
+        "presigned_url_cache": presigned_url_cache.stats(),
+        "image_derivatives": image_derivative_pipeline.stats(),
+    }
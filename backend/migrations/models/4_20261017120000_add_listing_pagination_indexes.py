@@ -0,0 +1,13 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_trips_user_id_6da28d" ON "trips" ("user_id", "created_at", "id");
+        CREATE INDEX IF NOT EXISTS "idx_trip_seeds_updated_b6cce9" ON "trip_seeds" ("updated_at", "id");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_trip_seeds_updated_b6cce9";
+        DROP INDEX IF EXISTS "idx_trips_user_id_6da28d";"""
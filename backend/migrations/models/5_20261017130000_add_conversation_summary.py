@@ -0,0 +1,13 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "conversations" ADD "summary" TEXT;
+        ALTER TABLE "conversations" ADD "summary_message_count" INT NOT NULL DEFAULT 0;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "conversations" DROP COLUMN "summary_message_count";
+        ALTER TABLE "conversations" DROP COLUMN "summary";"""
@@ -0,0 +1,15 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "conversations" ADD "message_count" INT NOT NULL DEFAULT 0;
+        UPDATE "conversations" SET "message_count" = (
+            SELECT COALESCE(MAX("sequence_index") + 1, 0) FROM "messages"
+            WHERE "messages"."conversation_id" = "conversations"."id"
+        );"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "conversations" DROP COLUMN "message_count";"""
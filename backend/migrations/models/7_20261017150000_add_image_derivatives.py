@@ -0,0 +1,17 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "images" ADD "width" INT;
+        ALTER TABLE "images" ADD "height" INT;
+        ALTER TABLE "images" ADD "medium_s3_key" VARCHAR(512);
+        ALTER TABLE "images" ADD "thumbnail_s3_key" VARCHAR(512);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "images" DROP COLUMN "thumbnail_s3_key";
+        ALTER TABLE "images" DROP COLUMN "medium_s3_key";
+        ALTER TABLE "images" DROP COLUMN "height";
+        ALTER TABLE "images" DROP COLUMN "width";"""
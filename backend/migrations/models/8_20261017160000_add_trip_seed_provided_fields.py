@@ -0,0 +1,12 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "trip_seeds" ADD "provided_fields" JSONB NOT NULL DEFAULT '["num_days", "trip_mode", "budget_band"]';
+        ALTER TABLE "trip_seeds" ALTER COLUMN "provided_fields" DROP DEFAULT;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "trip_seeds" DROP COLUMN "provided_fields";"""
@@ -2,45 +2,22 @@
 System prompt for Trip Seed Agent.
 
 This prompt is used to guide the agent in collecting trip planning information
-through natural conversation. The prompt can be customized with dynamic data.
-"""
+through natural conversation. The prompt is split in two parts:
 
+- TRIP_SEED_AGENT_STATIC_PROMPT: personality, field definitions, reply format
+  and examples. Built once per process and identical on every turn.
+- The "Current TripSeed State" section: a few lines rendered from the
+  TripSeed state and appended after the static part.
 
-def get_trip_seed_agent_prompt(trip_seed_state: dict = None) -> str:
-    """
-    Get the system prompt for the Trip Seed Agent.
-    
-    Args:
-        trip_seed_state: Optional dict with current TripSeed state to include in prompt
-        
-    Returns:
-        Complete system prompt string
-    """
-    # Format the current state if provided
-    state_section = ""
-    if trip_seed_state:
-        state_lines = []
-        state_lines.append("\n## Current TripSeed State")
-        state_lines.append("\nRequired Fields:")
-        
-        num_days = trip_seed_state.get("num_days")
-        trip_mode = trip_seed_state.get("trip_mode")
-        budget_band = trip_seed_state.get("budget_band")
-        
-        state_lines.append(f"  - num_days: {num_days if num_days is not None else 'NOT SET'}")
-        state_lines.append(f"  - trip_mode: {trip_mode if trip_mode is not None else 'NOT SET'}")
-        state_lines.append(f"  - budget_band: {budget_band if budget_band is not None else 'NOT SET'}")
-        
-        state_lines.append("\nOptional Fields:")
-        start_location = trip_seed_state.get("start_location_text")
-        companions = trip_seed_state.get("companions")
-        
-        state_lines.append(f"  - start_location_text: {start_location if start_location else 'NOT SET'}")
-        state_lines.append(f"  - companions: {companions if companions is not None else 'NOT SET'}")
-        
-        state_section = "\n".join(state_lines)
-    
-    prompt = f"""You are a warm, friendly, and enthusiastic travel planning assistant helping users plan their perfect Michigan adventure. Your goal is to collect trip planning information through natural, enjoyable conversation - not like filling out a form.
+Keeping the static part first means every turn's prompt starts with the same
+few thousand characters, so model servers with prefix (KV) caching can reuse
+it, and the per-turn work is rendering the short state section.
+"""
+from functools import lru_cache
+from typing import Optional
+
+# Everything but the state section; never changes within a process
+TRIP_SEED_AGENT_STATIC_PROMPT = """You are a warm, friendly, and enthusiastic travel planning assistant helping users plan their perfect Michigan adventure. Your goal is to collect trip planning information through natural, enjoyable conversation - not like filling out a form.
 
 ## Your Personality
 - Warm, friendly, and genuinely excited about travel
@@ -53,7 +30,6 @@ def get_trip_seed_agent_prompt(trip_seed_state: dict = None) -> str:
 You are helping users plan trips by collecting specific information through conversation. You need to gather:
 - Required information: number of days, trip mode, and budget preference
 - Optional but helpful information: starting location, who's traveling with them
-{state_section}
 
 ## Field Definitions
 
@@ -90,18 +66,18 @@ You are helping users plan trips by collecting specific information through conv
 
 1. **Always respond with JSON** containing:
    ```json
-   {{
+   {
      "response_text": "Your warm, conversational response here",
-     "extracted_data": {{
+     "extracted_data": {
        "num_days": 3 or null,
        "trip_mode": "road_trip" or null,
        "budget_band": "comfortable" or null,
        "start_location_text": "Detroit" or null,
        "companions": "couple" or null
-     }},
+     },
      "is_complete": true or false,
      "missing_fields": ["budget_band"] or []
-   }}
+   }
    ```
 
 2. **In your response_text**:
@@ -110,7 +86,7 @@ You are helping users plan trips by collecting specific information through conv
    - Ask follow-up questions naturally (don't rapid-fire questions)
    - Show enthusiasm about their trip
    - Reference previous conversation when relevant
-   - If you see current state above, acknowledge what you already know
+   - If you see the current TripSeed state below, acknowledge what you already know
 
 3. **In extracted_data**:
    - Only include fields that were mentioned or can be inferred from the current message
@@ -140,39 +116,100 @@ You are helping users plan trips by collecting specific information through conv
 
 **Your response**:
 ```json
-{{
+{
   "response_text": "That sounds wonderful! A 3-day road trip from Detroit - I love it! Are you thinking of exploring Michigan's Upper Peninsula, or heading somewhere else? Also, what's your budget comfort level - are you looking to keep things budget-friendly, go for a comfortable mid-range experience, or really splurge on premium accommodations?",
-  "extracted_data": {{
+  "extracted_data": {
     "num_days": 3,
     "trip_mode": "road_trip",
     "budget_band": null,
     "start_location_text": "Detroit",
     "companions": null
-  }},
+  },
   "is_complete": false,
   "missing_fields": ["budget_band"]
-}}
+}
 ```
 
 **User says**: "I'd say comfortable, not too cheap but not breaking the bank"
 
 **Your response**:
 ```json
-{{
+{
   "response_text": "Perfect! Comfortable is a great sweet spot - you'll have nice accommodations and experiences without going overboard. Wonderful! I have everything I need to start planning your trip. Let me create your personalized Michigan road trip itinerary now!",
-  "extracted_data": {{
+  "extracted_data": {
     "num_days": null,
     "trip_mode": null,
     "budget_band": "comfortable",
     "start_location_text": null,
     "companions": null
-  }},
+  },
   "is_complete": true,
   "missing_fields": []
-}}
+}
 ```
 
 Remember: Be warm, be natural, make this enjoyable! You're not a form - you're a friendly travel planning assistant."""
+
+
+def get_trip_seed_agent_prompt(trip_seed_state: Optional[dict] = None) -> str:
+    """
+    Get the system prompt for the Trip Seed Agent.
+    
+    Args:
+        trip_seed_state: Optional dict with current TripSeed state to include in prompt
+        
+    Returns:
+        Complete system prompt string (the static prompt, then the state section)
+    """
+    if not trip_seed_state:
+        return TRIP_SEED_AGENT_STATIC_PROMPT
     
-    return prompt
+    return _render_prompt(
+        trip_seed_state.get("num_days"),
+        trip_seed_state.get("trip_mode"),
+        trip_seed_state.get("budget_band"),
+        trip_seed_state.get("start_location_text"),
+        trip_seed_state.get("companions"),
+    )
 
+
+def render_trip_seed_state(trip_seed_state: dict) -> str:
+    """
+    Render the "Current TripSeed State" section of the prompt.
+    
+    Args:
+        trip_seed_state: Dict with current TripSeed state (None for unset fields)
+        
+    Returns:
+        The state section, starting with its heading
+    """
+    num_days = trip_seed_state.get("num_days")
+    trip_mode = trip_seed_state.get("trip_mode")
+    budget_band = trip_seed_state.get("budget_band")
+    start_location = trip_seed_state.get("start_location_text")
+    companions = trip_seed_state.get("companions")
+    
+    return "\n".join([
+        "## Current TripSeed State",
+        "\nRequired Fields:",
+        f"  - num_days: {num_days if num_days is not None else 'NOT SET'}",
+        f"  - trip_mode: {trip_mode if trip_mode is not None else 'NOT SET'}",
+        f"  - budget_band: {budget_band if budget_band is not None else 'NOT SET'}",
+        "\nOptional Fields:",
+        f"  - start_location_text: {start_location if start_location else 'NOT SET'}",
+        f"  - companions: {companions if companions is not None else 'NOT SET'}",
+    ])
+
+
+# Conversations move through a small set of states, so complete prompts are reused
+@lru_cache(maxsize=256)
+def _render_prompt(num_days, trip_mode, budget_band, start_location_text, companions) -> str:
+    """Build the complete prompt for one TripSeed state."""
+    state_section = render_trip_seed_state({
+        "num_days": num_days,
+        "trip_mode": trip_mode,
+        "budget_band": budget_band,
+        "start_location_text": start_location_text,
+        "companions": companions,
+    })
+    return f"{TRIP_SEED_AGENT_STATIC_PROMPT}\n\n{state_section}"
@@ -0,0 +1,130 @@
+"""
+Benchmark S3Storage per-operation latency: a new client per call vs the shared client.
+
+Runs put/get/delete/presign against the configured S3 endpoint (S3_* settings),
+e.g. a local MinIO or a moto server:
+
+    moto_server -p 5055 &
+    S3_ENDPOINT=http://localhost:5055 S3_ACCESS_KEY=test S3_SECRET_KEY=test \\
+    S3_BUCKET_NAME=bench S3_USE_SSL=false python scripts/benchmark_s3_storage.py
+
+The bucket is created if it does not exist.
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.core.s3_storage import S3Storage
+
+
+def summarize(samples: list) -> str:
+    """Format mean and p95 latency in milliseconds."""
+    samples = sorted(samples)
+    mean = sum(samples) / len(samples) * 1000
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000
+    return f"mean {mean:7.2f} ms  p95 {p95:7.2f} ms"
+
+
+async def run_per_call_client(storage: S3Storage, iterations: int, payload: bytes) -> dict:
+    """Every operation opens and closes its own client, as S3Storage used to."""
+    timings = {"put": [], "get": [], "delete": [], "presign": []}
+    
+    def client():
+        return storage.session.client(
+            's3',
+            endpoint_url=storage.endpoint_url,
+            aws_access_key_id=storage.access_key,
+            aws_secret_access_key=storage.secret_key,
+            use_ssl=storage.use_ssl,
+            region_name=storage.region,
+        )
+    
+    for index in range(iterations):
+        key = f"0/0/0/per-call-{index}.jpg"
+        
+        started = time.perf_counter()
+        async with client() as s3:
+            await s3.put_object(Bucket=storage.bucket_name, Key=key, Body=payload, ContentType="image/jpeg")
+        timings["put"].append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        async with client() as s3:
+            response = await s3.get_object(Bucket=storage.bucket_name, Key=key)
+            await response['Body'].read()
+        timings["get"].append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        async with client() as s3:
+            await s3.generate_presigned_url(
+                'get_object', Params={'Bucket': storage.bucket_name, 'Key': key}, ExpiresIn=3600
+            )
+        timings["presign"].append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        async with client() as s3:
+            await s3.delete_object(Bucket=storage.bucket_name, Key=key)
+        timings["delete"].append(time.perf_counter() - started)
+    
+    return timings
+
+
+async def run_shared_client(storage: S3Storage, iterations: int, payload: bytes) -> dict:
+    """Every operation goes through S3Storage and its shared client."""
+    timings = {"put": [], "get": [], "delete": [], "presign": []}
+    
+    for index in range(iterations):
+        started = time.perf_counter()
+        key = await storage.save_image(0, 0, 0, f"shared-{index}.jpg", io.BytesIO(payload), "image/jpeg")
+        timings["put"].append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        await storage.get_image(0, 0, 0, key)
+        timings["get"].append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        await storage.get_presigned_url(key)
+        timings["presign"].append(time.perf_counter() - started)
+        
+        started = time.perf_counter()
+        await storage.delete_image(0, 0, 0, key)
+        timings["delete"].append(time.perf_counter() - started)
+    
+    return timings
+
+
+async def main(iterations: int, payload_kb: int) -> None:
+    """Run both variants and print per-operation latency."""
+    storage = S3Storage()
+    payload = os.urandom(payload_kb * 1024)
+    
+    s3 = await storage._get_client()
+    try:
+        await s3.head_bucket(Bucket=storage.bucket_name)
+    except Exception:
+        await s3.create_bucket(Bucket=storage.bucket_name)
+    
+    try:
+        before = await run_per_call_client(storage, iterations, payload)
+        after = await run_shared_client(storage, iterations, payload)
+    finally:
+        await storage.close()
+    
+    print(f"{iterations} iterations, {payload_kb} KB objects, endpoint {storage.endpoint_url}")
+    for operation in before:
+        print(f"{operation:8} new client per call: {summarize(before[operation])}   "
+              f"shared client: {summarize(after[operation])}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50, help="Operations of each kind per variant")
+    parser.add_argument("--payload-kb", type=int, default=256, help="Object size in KB")
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.payload_kb))
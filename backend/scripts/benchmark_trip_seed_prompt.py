@@ -0,0 +1,84 @@
+"""
+Benchmark trip seed system prompt assembly.
+
+Compares building the complete prompt on every turn (what each turn paid
+before the static prefix was split out) with the cached assembly, and reports
+token estimates for the static prefix and the per-turn state section.
+
+Usage:
+    python scripts/benchmark_trip_seed_prompt.py --turns 100000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from prompts.trip_seed_agent import (
+    TRIP_SEED_AGENT_STATIC_PROMPT,
+    _render_prompt,
+    get_trip_seed_agent_prompt,
+    render_trip_seed_state,
+)
+from services.core.agent.context_window import estimate_tokens
+
+
+# States a conversation typically goes through, in order
+CONVERSATION_STATES = [
+    {},
+    {"num_days": 3, "trip_mode": None, "budget_band": None, "start_location_text": "Detroit", "companions": None},
+    {"num_days": 3, "trip_mode": "road_trip", "budget_band": None, "start_location_text": "Detroit", "companions": "friends"},
+    {"num_days": 3, "trip_mode": "road_trip", "budget_band": "comfortable", "start_location_text": "Detroit", "companions": "friends"},
+]
+
+# Before the split the state section was inserted right after this heading's section
+LEGACY_STATE_POSITION = "\n## Field Definitions"
+
+
+def time_per_call(build, turns: int) -> float:
+    """Average time per prompt build over `turns` turns, in microseconds."""
+    started = time.perf_counter()
+    for turn in range(turns):
+        build(CONVERSATION_STATES[turn % len(CONVERSATION_STATES)])
+    return (time.perf_counter() - started) / turns * 1_000_000
+
+
+def build_uncached(trip_seed_state: dict) -> str:
+    """Build the complete prompt from scratch, as every turn did before."""
+    if not trip_seed_state:
+        return TRIP_SEED_AGENT_STATIC_PROMPT
+    return _render_prompt.__wrapped__(
+        trip_seed_state.get("num_days"),
+        trip_seed_state.get("trip_mode"),
+        trip_seed_state.get("budget_band"),
+        trip_seed_state.get("start_location_text"),
+        trip_seed_state.get("companions"),
+    )
+
+
+def main(turns: int) -> None:
+    """Run the benchmark and print the results."""
+    uncached_us = time_per_call(build_uncached, turns)
+    cached_us = time_per_call(get_trip_seed_agent_prompt, turns)
+    print(f"Prompt assembly per turn: {uncached_us:.2f} us rebuilt, {cached_us:.2f} us cached "
+          f"({uncached_us / cached_us:.1f}x)")
+    
+    static_tokens = estimate_tokens(TRIP_SEED_AGENT_STATIC_PROMPT)
+    state_tokens = estimate_tokens(render_trip_seed_state(CONVERSATION_STATES[-1]))
+    legacy_prefix_tokens = estimate_tokens(
+        TRIP_SEED_AGENT_STATIC_PROMPT[:TRIP_SEED_AGENT_STATIC_PROMPT.index(LEGACY_STATE_POSITION)]
+    )
+    total_tokens = static_tokens + state_tokens
+    print(f"Estimated tokens: static prefix {static_tokens}, state section {state_tokens}, total {total_tokens}")
+    print(f"Prefix shared by every turn: {static_tokens} tokens ({static_tokens / total_tokens:.0%}) "
+          f"vs {legacy_prefix_tokens} tokens ({legacy_prefix_tokens / total_tokens:.0%}) "
+          f"with the state section in the middle of the prompt")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=100_000, help="Prompt builds per measurement")
+    args = parser.parse_args()
+    main(args.turns)
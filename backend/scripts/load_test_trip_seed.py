@@ -0,0 +1,139 @@
+"""
+Load test for TripSeedService.process_message against the local fake chat model.
+
+Runs concurrent simulated users through a short trip seed conversation end to
+end (database, fast path, dispatcher, resilience layer, model, parsing) and
+prints turn latency percentiles, throughput and the in-process metrics.
+Needs a migrated database (DATABASE_URL); WatsonX is never called.
+
+Usage:
+    python scripts/load_test_trip_seed.py --users 50 --rounds 2
+    LLM_FAKE_ERROR_RATE=0.05 python scripts/load_test_trip_seed.py --stream
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Must be set before settings are loaded
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from core.models.user import User
+from infrastructure.database import db_provider
+from infrastructure.llm import chat_model_provider
+from services.core.agent.conversation_service import ConversationService
+from services.core.agent.llm_dispatcher import llm_dispatcher
+from services.core.agent.llm_resilience import llm_resilience
+from services.core.agent.trip_seed_agent_service import TripSeedAgentService
+from services.core.agent.trip_seed_fast_path import trip_seed_fast_path
+from services.trip_seed_service import ProcessMessageResponse, TripSeedService
+
+
+# Simulated conversations, alternating between users. A turn hits the fast path
+# when it fills every required field still missing: the first turn of the
+# second conversation, and the last turn of the first once the model has
+# extracted the trip mode and the number of days.
+CONVERSATIONS = [
+    [
+        "Hi! We'd love to get away somewhere in Michigan this summer.",
+        "A road trip with friends sounds fun, we like beaches and small towns.",
+        "4 days",
+        "comfortable",
+    ],
+    [
+        "3 days, road trip with friends, comfortable",
+        "We like beaches and small towns.",
+    ],
+]
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Get a percentile of the samples, in milliseconds."""
+    samples = sorted(samples)
+    return round(samples[min(len(samples) - 1, int(len(samples) * fraction))] * 1000, 1)
+
+
+async def get_load_test_user(index: int) -> User:
+    """Get or create the user for a simulated client."""
+    user, _ = await User.get_or_create(
+        email=f"load-test-{index}@example.com",
+        defaults={"password_hash": "load_test", "full_name": f"Load Test {index}"},
+    )
+    return user
+
+
+async def run_user(
+    user: User,
+    conversation: list,
+    rounds: int,
+    stream: bool,
+    latencies: list,
+    errors: list,
+) -> None:
+    """Run a conversation `rounds` times for one user."""
+    conversation_service = ConversationService()
+    service = TripSeedService(
+        conversation_service=conversation_service,
+        agent_service=TripSeedAgentService(conversation_service=conversation_service),
+    )
+    
+    for _ in range(rounds):
+        conversation_id = None
+        for message in conversation:
+            started = time.perf_counter()
+            try:
+                if stream:
+                    result = None
+                    async for item in await service.process_message_stream(user.id, message, conversation_id):
+                        if isinstance(item, ProcessMessageResponse):
+                            result = item
+                else:
+                    result = await service.process_message(user.id, message, conversation_id)
+                conversation_id = result.conversation_id
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+
+
+async def main(users: int, rounds: int, stream: bool) -> None:
+    """Run the load test and print the results."""
+    await db_provider.init()
+    try:
+        clients = [await get_load_test_user(index) for index in range(users)]
+        latencies, errors = [], []
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            run_user(user, CONVERSATIONS[index % len(CONVERSATIONS)], rounds, stream, latencies, errors)
+            for index, user in enumerate(clients)
+        ))
+        elapsed = time.perf_counter() - started
+        
+        print(f"Backend: {chat_model_provider.backend}, users: {users}, rounds: {rounds}, stream: {stream}")
+        print(f"Turns: {len(latencies)} ok, {len(errors)} failed in {elapsed:.2f}s "
+              f"({len(latencies) / elapsed:.1f} turns/s)")
+        if latencies:
+            print(f"Latency ms: p50={percentile(latencies, 0.5)} p95={percentile(latencies, 0.95)} "
+                  f"p99={percentile(latencies, 0.99)} max={percentile(latencies, 1.0)}")
+        for error in sorted(set(errors))[:5]:
+            print(f"  error: {error}")
+        print(f"Chat models: {chat_model_provider.stats()}")
+        print(f"Fast path: {trip_seed_fast_path.stats()}")
+        print(f"Dispatcher: {llm_dispatcher.stats()}")
+        print(f"Resilience: {llm_resilience.stats()}")
+    finally:
+        await db_provider.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="Concurrent simulated users")
+    parser.add_argument("--rounds", type=int, default=1, help="Conversations per user")
+    parser.add_argument("--stream", action="store_true", help="Use the streaming path")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.rounds, args.stream))
@@ -3,19 +3,70 @@ Service for managing attractions.
 
 This service handles querying attractions filtered by vibes and location.
 """
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from core.identity_map import IdentityMap
 from core.models.places.attraction import Attraction
 from core.models.places.attraction_vibe import AttractionVibe
 from core.models.places.city import City
-from core.models.trips.trip import Trip
 from core.models.trips.trip_vibe import TripVibe
 from core.models.trips.trip_day import TripDay
 from dtos.attraction_dto import AttractionResponse, AttractionVibeInfo, AttractionsListResponse
+from services.core.catalog.attraction_catalog import attraction_catalog, CatalogEntry
+
+
+def _build_attraction_response(
+    attraction: Attraction,
+    vibe_infos: List[AttractionVibeInfo],
+    distance_km: Optional[float] = None,
+) -> AttractionResponse:
+    """Build an AttractionResponse from an attraction with its city loaded."""
+    return AttractionResponse(
+        id=attraction.id,
+        name=attraction.name,
+        type=attraction.type,
+        description=attraction.description,
+        city_id=attraction.city_id,
+        city_name=attraction.city.name,
+        latitude=float(attraction.latitude),
+        longitude=float(attraction.longitude),
+        url=attraction.url,
+        price_level=attraction.price_level,
+        hidden_gem_score=float(attraction.hidden_gem_score) if attraction.hidden_gem_score else None,
+        seasonality=attraction.seasonality,
+        image_url=attraction.image_url,
+        vibes=vibe_infos,
+        distance_km=round(distance_km, 3) if distance_km is not None else None,
+        created_at=attraction.created_at.isoformat(),
+        updated_at=attraction.updated_at.isoformat(),
+    )
+
+
+def _build_catalog_entry_response(entry: CatalogEntry) -> AttractionResponse:
+    """Build an AttractionResponse from a scored catalog entry."""
+    vibe_infos = [
+        AttractionVibeInfo(
+            vibe_id=vibe.id,
+            vibe_code=vibe.code,
+            vibe_label=vibe.label,
+            strength=strength,
+        )
+        for vibe, strength in entry.vibes
+    ]
+    return _build_attraction_response(entry.attraction, vibe_infos, entry.distance_km)
 
 
 class AttractionService:
     """Service for managing attractions."""
     
+    def __init__(self, identity_map: Optional[IdentityMap] = None):
+        """
+        Initialize the Attraction Service.
+        
+        Args:
+            identity_map: Request-scoped identity map (a private one is created if omitted)
+        """
+        self.identity_map = identity_map or IdentityMap()
+    
     async def get_attractions_by_trip_vibes(
         self,
         user_id: int,
@@ -37,7 +88,7 @@ class AttractionService:
             ValueError: If trip not found or doesn't belong to user
         """
         # Verify trip belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+        trip = await self.identity_map.get_trip(trip_id, user_id)
         if not trip:
             raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
         
@@ -57,53 +108,11 @@ class AttractionService:
             
             if alpena_city:
                 print(f"✅ Found Alpena city (id={alpena_city.id}), fetching attractions...")
-                # Get all attractions for Alpena
-                attractions = await Attraction.filter(city_id=alpena_city.id).prefetch_related('city').all()
-                print(f"📋 Found {len(attractions)} attractions for Alpena")
-                
-                # Build response DTOs
-                attraction_responses = []
-                for attraction in attractions:
-                    # Get vibes for this attraction
-                    attraction_vibes = await AttractionVibe.filter(
-                        attraction_id=attraction.id
-                    ).prefetch_related('vibe').all()
-                    
-                    vibe_infos = [
-                        AttractionVibeInfo(
-                            vibe_id=av.vibe_id,
-                            vibe_code=av.vibe.code,
-                            vibe_label=av.vibe.label,
-                            strength=float(av.strength),
-                        )
-                        for av in attraction_vibes
-                    ]
-                    
-                    attraction_responses.append(
-                        AttractionResponse(
-                            id=attraction.id,
-                            name=attraction.name,
-                            type=attraction.type,
-                            description=attraction.description,
-                            city_id=attraction.city_id,
-                            city_name=attraction.city.name,
-                            latitude=float(attraction.latitude),
-                            longitude=float(attraction.longitude),
-                            url=attraction.url,
-                            price_level=attraction.price_level,
-                            hidden_gem_score=float(attraction.hidden_gem_score) if attraction.hidden_gem_score else None,
-                            seasonality=attraction.seasonality,
-                            image_url=attraction.image_url,
-                            vibes=vibe_infos,
-                            created_at=attraction.created_at.isoformat(),
-                            updated_at=attraction.updated_at.isoformat(),
-                        )
-                    )
-                
-                print(f"✅ Returning {len(attraction_responses)} Alpena attractions")
+                response = await self.get_attractions_by_city(alpena_city.id, limit=limit)
+                print(f"✅ Returning {response.total} Alpena attractions")
                 return AttractionsListResponse(
-                    attractions=attraction_responses,
-                    total=len(attraction_responses),
+                    attractions=response.attractions,
+                    total=response.total,
                     trip_id=trip_id,
                     matching_vibe_ids=[],
                 )
@@ -117,90 +126,13 @@ class AttractionService:
                     matching_vibe_ids=[],
                 )
         
-        # Get attractions that have at least one matching vibe
-        # We'll find attractions that have any of the trip's vibes
-        # and order by total vibe strength match
-        attraction_vibes = await AttractionVibe.filter(
-            vibe_id__in=vibe_ids
-        ).prefetch_related('attraction__city', 'vibe').all()
-        
-        # Group by attraction and calculate match score
-        attraction_scores = {}  # attraction_id -> (attraction, total_strength, vibes)
-        
-        for av in attraction_vibes:
-            attraction = av.attraction
-            if attraction.id not in attraction_scores:
-                attraction_scores[attraction.id] = {
-                    'attraction': attraction,
-                    'total_strength': 0.0,
-                    'vibes': []
-                }
-            
-            # Add to total strength (weighted by trip vibe strength)
-            trip_vibe = next((tv for tv in trip_vibes if tv.vibe_id == av.vibe_id), None)
-            if trip_vibe:
-                # Weight by both trip vibe strength and attraction vibe strength
-                match_strength = float(av.strength) * float(trip_vibe.strength)
-            else:
-                match_strength = float(av.strength)
-            
-            attraction_scores[attraction.id]['total_strength'] += match_strength
-            attraction_scores[attraction.id]['vibes'].append({
-                'vibe_id': av.vibe_id,
-                'vibe_code': av.vibe.code,
-                'vibe_label': av.vibe.label,
-                'strength': float(av.strength),
-            })
-        
-        # Sort by total strength (best matches first)
-        sorted_attractions = sorted(
-            attraction_scores.values(),
-            key=lambda x: x['total_strength'],
-            reverse=True
-        )
-        
-        # Apply limit if provided
-        if limit:
-            sorted_attractions = sorted_attractions[:limit]
-        
-        # Build response DTOs
-        attraction_responses = []
-        for item in sorted_attractions:
-            attraction = item['attraction']
-            vibe_infos = [
-                AttractionVibeInfo(
-                    vibe_id=v['vibe_id'],
-                    vibe_code=v['vibe_code'],
-                    vibe_label=v['vibe_label'],
-                    strength=v['strength'],
-                )
-                for v in item['vibes']
-            ]
-            
-            attraction_responses.append(
-                AttractionResponse(
-                    id=attraction.id,
-                    name=attraction.name,
-                    type=attraction.type,
-                    description=attraction.description,
-                    city_id=attraction.city_id,
-                    city_name=attraction.city.name,
-                    latitude=float(attraction.latitude),
-                    longitude=float(attraction.longitude),
-                    url=attraction.url,
-                    price_level=attraction.price_level,
-                    hidden_gem_score=float(attraction.hidden_gem_score) if attraction.hidden_gem_score else None,
-                    seasonality=attraction.seasonality,
-                    image_url=attraction.image_url,
-                    vibes=vibe_infos,
-                    created_at=attraction.created_at.isoformat(),
-                    updated_at=attraction.updated_at.isoformat(),
-                )
-            )
+        # Score against the in-memory catalog, weighting by trip vibe strength
+        vibe_weights = {tv.vibe_id: float(tv.strength) for tv in trip_vibes}
+        entries = await attraction_catalog.top_k(vibe_weights, k=limit)
         
         return AttractionsListResponse(
-            attractions=attraction_responses,
-            total=len(attraction_responses),
+            attractions=[_build_catalog_entry_response(entry) for entry in entries],
+            total=len(entries),
             trip_id=trip_id,
             matching_vibe_ids=vibe_ids,
         )
@@ -227,80 +159,174 @@ class AttractionService:
                 matching_vibe_ids=[],
             )
         
-        # Get attractions that have at least one matching vibe
-        attraction_vibes = await AttractionVibe.filter(
-            vibe_id__in=vibe_ids
-        ).prefetch_related('attraction__city', 'vibe').all()
+        # Score against the in-memory catalog (every requested vibe weighted equally)
+        vibe_weights = {vibe_id: 1.0 for vibe_id in vibe_ids}
+        entries = await attraction_catalog.top_k(vibe_weights, k=limit)
         
-        # Group by attraction and calculate match score
-        attraction_scores = {}  # attraction_id -> (attraction, total_strength, vibes)
+        return AttractionsListResponse(
+            attractions=[_build_catalog_entry_response(entry) for entry in entries],
+            total=len(entries),
+            matching_vibe_ids=vibe_ids,
+        )
+    
+    async def get_attractions_by_city(
+        self,
+        city_id: int,
+        limit: Optional[int] = None,
+    ) -> AttractionsListResponse:
+        """
+        Get all attractions in a city with their vibes.
+        
+        Uses a fixed number of queries regardless of how many attractions
+        the city has (attractions + city, then one batched vibe query).
         
-        for av in attraction_vibes:
-            attraction = av.attraction
-            if attraction.id not in attraction_scores:
-                attraction_scores[attraction.id] = {
-                    'attraction': attraction,
-                    'total_strength': 0.0,
-                    'vibes': []
-                }
+        Args:
+            city_id: ID of the city to browse
+            limit: Optional limit on number of results
             
-            attraction_scores[attraction.id]['total_strength'] += float(av.strength)
-            attraction_scores[attraction.id]['vibes'].append({
-                'vibe_id': av.vibe_id,
-                'vibe_code': av.vibe.code,
-                'vibe_label': av.vibe.label,
-                'strength': float(av.strength),
-            })
+        Returns:
+            AttractionsListResponse with the city's attractions
+        """
+        query = Attraction.filter(city_id=city_id).prefetch_related('city').order_by('id')
+        if limit:
+            query = query.limit(limit)
+        attractions = await query
         
-        # Sort by total strength (best matches first)
-        sorted_attractions = sorted(
-            attraction_scores.values(),
-            key=lambda x: x['total_strength'],
-            reverse=True
+        vibes_by_attraction = await self.get_vibe_infos_for_attractions(
+            [attraction.id for attraction in attractions]
         )
         
-        # Apply limit if provided
-        if limit:
-            sorted_attractions = sorted_attractions[:limit]
+        attraction_responses = [
+            _build_attraction_response(attraction, vibes_by_attraction.get(attraction.id, []))
+            for attraction in attractions
+        ]
         
-        # Build response DTOs
-        attraction_responses = []
-        for item in sorted_attractions:
-            attraction = item['attraction']
-            vibe_infos = [
-                AttractionVibeInfo(
-                    vibe_id=v['vibe_id'],
-                    vibe_code=v['vibe_code'],
-                    vibe_label=v['vibe_label'],
-                    strength=v['strength'],
-                )
-                for v in item['vibes']
-            ]
+        return AttractionsListResponse(
+            attractions=attraction_responses,
+            total=len(attraction_responses),
+            matching_vibe_ids=[],
+        )
+    
+    async def get_vibe_infos_for_attractions(
+        self,
+        attraction_ids: List[int],
+    ) -> Dict[int, List[AttractionVibeInfo]]:
+        """
+        Load vibes for a set of attractions in a single query.
+        
+        Args:
+            attraction_ids: IDs of the attractions to load vibes for
             
-            attraction_responses.append(
-                AttractionResponse(
-                    id=attraction.id,
-                    name=attraction.name,
-                    type=attraction.type,
-                    description=attraction.description,
-                    city_id=attraction.city_id,
-                    city_name=attraction.city.name,
-                    latitude=float(attraction.latitude),
-                    longitude=float(attraction.longitude),
-                    url=attraction.url,
-                    price_level=attraction.price_level,
-                    hidden_gem_score=float(attraction.hidden_gem_score) if attraction.hidden_gem_score else None,
-                    seasonality=attraction.seasonality,
-                    image_url=attraction.image_url,
-                    vibes=vibe_infos,
-                    created_at=attraction.created_at.isoformat(),
-                    updated_at=attraction.updated_at.isoformat(),
+        Returns:
+            Dict mapping attraction ID to its list of AttractionVibeInfo
+            (attractions without vibes are absent from the dict)
+        """
+        if not attraction_ids:
+            return {}
+        
+        # values() joins the vibe table, so this is one round trip
+        rows = await AttractionVibe.filter(
+            attraction_id__in=attraction_ids
+        ).order_by('id').values(
+            'attraction_id',
+            'vibe_id',
+            'strength',
+            'vibe__code',
+            'vibe__label',
+        )
+        
+        vibes_by_attraction: Dict[int, List[AttractionVibeInfo]] = {}
+        for row in rows:
+            vibes_by_attraction.setdefault(row['attraction_id'], []).append(
+                AttractionVibeInfo(
+                    vibe_id=row['vibe_id'],
+                    vibe_code=row['vibe__code'],
+                    vibe_label=row['vibe__label'],
+                    strength=float(row['strength']),
                 )
             )
         
+        return vibes_by_attraction
+    
+    async def get_nearby_attractions(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int = 20,
+        radius_km: Optional[float] = None,
+    ) -> AttractionsListResponse:
+        """
+        Get the attractions nearest to a point.
+        
+        Served from the catalog's spatial index, so the cost does not grow
+        with the size of the attractions table.
+        
+        Args:
+            latitude: Latitude of the point
+            longitude: Longitude of the point
+            limit: Maximum number of attractions to return
+            radius_km: Optional search radius in kilometres
+            
+        Returns:
+            AttractionsListResponse with attractions ordered by distance
+            
+        Raises:
+            ValueError: If the coordinates or radius are out of range
+        """
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError(f"Invalid coordinates: ({latitude}, {longitude})")
+        if radius_km is not None and radius_km <= 0:
+            raise ValueError("radius_km must be positive")
+        
+        entries = await attraction_catalog.nearest(latitude, longitude, k=limit, radius_km=radius_km)
+        
         return AttractionsListResponse(
-            attractions=attraction_responses,
-            total=len(attraction_responses),
-            matching_vibe_ids=vibe_ids,
+            attractions=[_build_catalog_entry_response(entry) for entry in entries],
+            total=len(entries),
         )
-
+    
+    async def get_trip_start_point(
+        self,
+        user_id: int,
+        trip_id: int,
+    ) -> Tuple[float, float]:
+        """
+        Get the starting coordinates of a trip.
+        
+        Args:
+            user_id: ID of the user (to verify trip ownership)
+            trip_id: ID of the trip
+            
+        Returns:
+            Tuple of (latitude, longitude)
+            
+        Raises:
+            ValueError: If trip not found, doesn't belong to user, or has no start coordinates
+        """
+        trip = await self.identity_map.get_trip(trip_id, user_id)
+        if not trip:
+            raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
+        
+        if trip.start_latitude is None or trip.start_longitude is None:
+            raise ValueError(f"Trip {trip_id} has no start coordinates")
+        
+        return float(trip.start_latitude), float(trip.start_longitude)
+    
+    async def get_city_point(self, city_id: int) -> Tuple[float, float]:
+        """
+        Get the coordinates of a city (e.g. a trip day's base city).
+        
+        Args:
+            city_id: ID of the city
+            
+        Returns:
+            Tuple of (latitude, longitude)
+            
+        Raises:
+            ValueError: If city not found
+        """
+        city = await self.identity_map.get_city(city_id)
+        if not city:
+            raise ValueError(f"City {city_id} not found")
+        
+        return float(city.latitude), float(city.longitude)
@@ -1,19 +1,22 @@
 """Core storage services package."""
-from services.core.storage_interface import StorageInterface
+from services.core.storage_interface import StorageInterface, ImageStream
 from services.core.s3_storage import S3Storage
 from services.core.storage_service import StorageService
 from services.core.storage_exceptions import (
     StorageError,
     ImageNotFoundError,
+    InvalidRangeError,
     StorageConfigurationError,
 )
 
 __all__ = [
     "StorageInterface",
+    "ImageStream",
     "S3Storage",
     "StorageService",
     "StorageError",
     "ImageNotFoundError",
+    "InvalidRangeError",
     "StorageConfigurationError",
 ]
 
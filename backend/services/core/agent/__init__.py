@@ -1,5 +1,5 @@
 """Agent services package."""
-from services.core.agent.base_agent_service import BaseAgentService
+from services.core.agent.base_agent_service import AgentStreamChunk, BaseAgentService
 from services.core.agent.conversation_service import ConversationService
 from services.core.agent.trip_seed_agent_service import (
     TripSeedAgentService,
@@ -8,6 +8,7 @@ from services.core.agent.trip_seed_agent_service import (
 )
 
 __all__ = [
+    "AgentStreamChunk",
     "BaseAgentService",
     "ConversationService",
     "TripSeedAgentService",
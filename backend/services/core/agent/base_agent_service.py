@@ -1,15 +1,28 @@
 """Base agent service with generic Pydantic model support."""
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Optional
+from dataclasses import dataclass
+from typing import AsyncIterator, Generic, List, TypeVar, Optional
 from pydantic import BaseModel
-from langchain_ibm import ChatWatsonx
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from core.config import settings
+from infrastructure.llm import chat_model_provider
+from services.core.agent.context_window import ContextWindowManager, estimate_tokens
 from services.core.agent.conversation_service import ConversationService
+from services.core.agent.llm_dispatcher import LLMDispatcher, Priority, llm_dispatcher
+from services.core.agent.llm_exceptions import LLMError
+from services.core.agent.llm_resilience import ResilientLLMCaller, llm_resilience
+from services.core.agent.response_cache import ResponseCache, agent_response_cache
 
 T = TypeVar('T', bound=BaseModel)
 
 
+@dataclass
+class AgentStreamChunk(Generic[T]):
+    """A piece of a streamed agent reply."""
+    text: str = ""  # Raw model output generated since the previous chunk
+    response: Optional[T] = None  # Parsed response, set on the final chunk only
+
+
 class BaseAgentService(ABC, Generic[T]):
     """Base agent service for IBM WatsonX with Pydantic response models."""
     
@@ -21,6 +34,10 @@ class BaseAgentService(ABC, Generic[T]):
         url: Optional[str] = None,
         system_prompt: Optional[str] = None,
         conversation_service: Optional[ConversationService] = None,
+        response_cache: Optional[ResponseCache] = None,
+        cache_sampled_responses: Optional[bool] = None,
+        dispatcher: Optional[LLMDispatcher] = None,
+        resilience: Optional[ResilientLLMCaller] = None,
         **kwargs
     ):
         """
@@ -28,12 +45,19 @@ class BaseAgentService(ABC, Generic[T]):
         
         Args:
             model_id: The WatsonX model ID (defaults to WATSONX_MODEL_ID from settings)
-            api_key: IBM WatsonX API key (defaults to WATSONX_APIKEY from settings)
+            api_key: IBM WatsonX API key (defaults to WATSONX_APIKEY from settings;
+                credentials are not required with LLM_BACKEND=fake)
             project_id: IBM WatsonX project ID (defaults to WATSONX_PROJECT_ID from settings)
             url: IBM WatsonX service URL (defaults to WATSONX_URL from settings)
             system_prompt: System prompt for this agent (can be loaded from prompts folder)
             conversation_service: Optional conversation service for history management
-            **kwargs: Additional parameters to pass to ChatWatsonx (including params dict)
+            response_cache: Optional response cache (defaults to the shared instance)
+            cache_sampled_responses: Cache calls with temperature > 0 too
+                (defaults to AGENT_RESPONSE_CACHE_ALLOW_SAMPLING)
+            dispatcher: Optional LLM call dispatcher (defaults to the shared instance)
+            resilience: Optional timeout/retry/circuit breaker wrapper for model calls
+                (defaults to the shared instance)
+            **kwargs: Additional parameters (including a params dict sent with every model call)
         """
         # Use explicit parameters first, fall back to settings
         self.model_id = model_id or settings.watsonx_model_id or "ibm/granite-3-8b-instruct"
@@ -41,31 +65,51 @@ class BaseAgentService(ABC, Generic[T]):
         self.project_id = project_id if project_id is not None else settings.watsonx_project_id
         self.url = url if url is not None else settings.watsonx_url
         
-        if not self.api_key:
-            raise ValueError("WATSONX_APIKEY is required. Set it in .env file or pass as parameter.")
-        if not self.project_id:
-            raise ValueError("WATSONX_PROJECT_ID is required. Set it in .env file or pass as parameter.")
-        if not self.url:
-            raise ValueError("WATSONX_URL is required. Set it in .env file or pass as parameter.")
+        # The fake backend answers locally and needs no credentials
+        if chat_model_provider.backend == "watsonx":
+            if not self.api_key:
+                raise ValueError("WATSONX_APIKEY is required. Set it in .env file or pass as parameter.")
+            if not self.project_id:
+                raise ValueError("WATSONX_PROJECT_ID is required. Set it in .env file or pass as parameter.")
+            if not self.url:
+                raise ValueError("WATSONX_URL is required. Set it in .env file or pass as parameter.")
         
         self.system_prompt = system_prompt
         self.conversation_service = conversation_service
+        # Bounds the history sent with each prompt (recent turns + truncated transcript tail)
+        self.context_manager = ContextWindowManager(conversation_service) if conversation_service else None
+        
+        self.response_cache = response_cache or agent_response_cache
+        self.dispatcher = dispatcher or llm_dispatcher
+        self.resilience = resilience or llm_resilience
+        self.cache_sampled_responses = (
+            cache_sampled_responses if cache_sampled_responses is not None
+            else settings.agent_response_cache_allow_sampling
+        )
         
-        # Default parameters for the model
-        default_params = {
+        # Default parameters for the model, sent with each call so agents can share a client
+        self.params = {
             "max_new_tokens": 200,
             "temperature": 0.0,
             "top_p": 0.9,
             **kwargs.get("params", {})
         }
         
-        self.chat_model = ChatWatsonx(
-            model_id=self.model_id,
-            url=self.url,
-            apikey=self.api_key,
-            project_id=self.project_id,
-            params=default_params
-        )
+        if chat_model_provider.backend == "fake":
+            # Fail at construction rather than on every request
+            if type(self).fake_response is BaseAgentService.fake_response:
+                raise ValueError(
+                    f"{type(self).__name__} does not support LLM_BACKEND=fake; it must override fake_response()"
+                )
+            self.chat_model = chat_model_provider.get_fake_chat_model(responder=self.fake_response)
+        else:
+            # Shared, long-lived client (connection pool and IAM token are reused across requests)
+            self.chat_model = chat_model_provider.get_chat_model(
+                model_id=self.model_id,
+                url=self.url,
+                api_key=self.api_key,
+                project_id=self.project_id,
+            )
     
     @abstractmethod
     def parse_response(self, response_text: str) -> T:
@@ -86,6 +130,22 @@ class BaseAgentService(ABC, Generic[T]):
         """
         pass
     
+    def fake_response(self, messages: List[BaseMessage]) -> str:
+        """
+        Build the raw reply of the local fake model (LLM_BACKEND=fake).
+        
+        Agents that support the fake backend override this to return a reply
+        their `parse_response` accepts; constructing an agent that doesn't
+        raises ValueError while LLM_BACKEND=fake.
+        
+        Args:
+            messages: Messages sent to the model (the prompt is last)
+            
+        Returns:
+            Raw response text
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support the fake LLM backend")
+    
     async def process(
         self,
         prompt: str,
@@ -94,6 +154,8 @@ class BaseAgentService(ABC, Generic[T]):
         conversation_id: Optional[int] = None,
         use_history: bool = False,
         original_user_message: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
     ) -> T:
         """
         Process a prompt and return a parsed Pydantic response.
@@ -104,28 +166,180 @@ class BaseAgentService(ABC, Generic[T]):
             trip_id: Optional trip ID for conversation context
             conversation_id: Optional existing conversation ID
             use_history: Whether to use conversation history (requires conversation_service)
+            original_user_message: Optional message to save instead of the prompt
+            system_prompt: Optional system prompt for this call (defaults to the agent's)
+            priority: Dispatch priority of the model call (interactive turns by default)
             
         Returns:
             Parsed Pydantic model response
             
         Raises:
             ValueError: If prompt is empty or response cannot be parsed
+            LLMQueueFullError: If too many model calls are waiting
+            LLMUnavailableError: If the circuit breaker is open
+            LLMTimeoutError: If the model call timed out
             Exception: If API call fails
         """
         if not prompt or not prompt.strip():
             raise ValueError("Prompt cannot be empty")
         
-        # Build messages list
+        messages = await self._build_messages(prompt, conversation_id, use_history, system_prompt)
+        cache_key = self._response_cache_key(messages)
+        
+        try:
+            response_text = await self.response_cache.get(cache_key) if cache_key else None
+            from_cache = response_text is not None
+            
+            if not from_cache:
+                # Call WatsonX asynchronously once the dispatcher grants a slot
+                # (with timeouts, retries on transient errors and the circuit breaker)
+                async with self.dispatcher.slot(user_id, priority):
+                    response = await self.resilience.call(
+                        lambda: self.chat_model.ainvoke(messages, params=self.params),
+                        dispatcher=self.dispatcher,
+                    )
+                
+                # Extract content from response
+                if hasattr(response, 'content'):
+                    response_text = str(response.content)
+                else:
+                    response_text = str(response)
+            
+            parsed_response = await self._complete_response(
+                response_text,
+                prompt=prompt,
+                user_id=user_id,
+                trip_id=trip_id,
+                conversation_id=conversation_id,
+                use_history=use_history,
+                original_user_message=original_user_message,
+            )
+            
+            # Only cache replies that parsed successfully
+            if cache_key and not from_cache:
+                await self.response_cache.set(cache_key, response_text)
+            
+            return parsed_response
+            
+        except LLMError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to process prompt with WatsonX: {str(e)}") from e
+    
+    async def process_stream(
+        self,
+        prompt: str,
+        user_id: Optional[int] = None,
+        trip_id: Optional[int] = None,
+        conversation_id: Optional[int] = None,
+        use_history: bool = False,
+        original_user_message: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[AgentStreamChunk[T]]:
+        """
+        Process a prompt, yielding the raw reply as the model generates it.
+        
+        Yields one AgentStreamChunk per model chunk with its text, then a final
+        AgentStreamChunk whose `response` is the parsed reply. Conversation
+        history is saved once the reply is complete, exactly as in `process`.
+        
+        Args:
+            prompt: User's input prompt
+            user_id: Optional user ID for conversation history
+            trip_id: Optional trip ID for conversation context
+            conversation_id: Optional existing conversation ID
+            use_history: Whether to use conversation history (requires conversation_service)
+            original_user_message: Optional message to save instead of the prompt
+            system_prompt: Optional system prompt for this call (defaults to the agent's)
+            priority: Dispatch priority of the model call (interactive turns by default)
+            
+        Yields:
+            AgentStreamChunk objects
+            
+        Raises:
+            ValueError: If prompt is empty
+            LLMQueueFullError: If too many model calls are waiting
+            LLMUnavailableError: If the circuit breaker is open
+            LLMTimeoutError: If the model call timed out
+            Exception: If API call fails or the complete reply cannot be parsed
+        """
+        if not prompt or not prompt.strip():
+            raise ValueError("Prompt cannot be empty")
+        
+        messages = await self._build_messages(prompt, conversation_id, use_history, system_prompt)
+        cache_key = self._response_cache_key(messages)
+        
+        try:
+            response_text = await self.response_cache.get(cache_key) if cache_key else None
+            from_cache = response_text is not None
+            
+            if from_cache:
+                yield AgentStreamChunk(text=response_text)
+            else:
+                chunks = []
+                # The slot is held until the model finishes streaming
+                async with self.dispatcher.slot(user_id, priority):
+                    async for chunk in self.resilience.stream(
+                        lambda: self.chat_model.astream(messages, params=self.params)
+                    ):
+                        text = str(chunk.content) if hasattr(chunk, 'content') else str(chunk)
+                        if text:
+                            chunks.append(text)
+                            yield AgentStreamChunk(text=text)
+                response_text = "".join(chunks)
+            
+            parsed_response = await self._complete_response(
+                response_text,
+                prompt=prompt,
+                user_id=user_id,
+                trip_id=trip_id,
+                conversation_id=conversation_id,
+                use_history=use_history,
+                original_user_message=original_user_message,
+            )
+            
+            if cache_key and not from_cache:
+                await self.response_cache.set(cache_key, response_text)
+        except LLMError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to process prompt with WatsonX: {str(e)}") from e
+        
+        yield AgentStreamChunk(response=parsed_response)
+    
+    def _response_cache_key(self, messages: List[BaseMessage]) -> Optional[str]:
+        """Get the response cache key for a call, or None if it must not be cached."""
+        if not self.response_cache.is_cacheable(self.params, self.cache_sampled_responses):
+            return None
+        return self.response_cache.build_key(self.model_id, self.params, messages)
+    
+    async def _build_messages(
+        self,
+        prompt: str,
+        conversation_id: Optional[int],
+        use_history: bool,
+        system_prompt: Optional[str] = None,
+    ) -> List[BaseMessage]:
+        """Build the message list: system prompt, optional history, then the prompt."""
         messages = []
         
-        # Add system prompt if available
-        if self.system_prompt:
-            messages.append(SystemMessage(content=self.system_prompt))
+        # Add system prompt if available (per-call prompt takes precedence)
+        system_prompt = system_prompt or self.system_prompt
+        if system_prompt:
+            messages.append(SystemMessage(content=system_prompt))
         
-        # Load conversation history if requested
-        if use_history and self.conversation_service and conversation_id:
-            history = await self.conversation_service.get_conversation_messages(conversation_id)
-            for msg in history:
+        # Load conversation history if requested: a truncated tail of older turns, then the recent ones
+        if use_history and self.context_manager and conversation_id:
+            context = await self.context_manager.get_context(
+                conversation_id,
+                reserved_tokens=estimate_tokens(system_prompt) + estimate_tokens(prompt),
+            )
+            if context.summary:
+                messages.append(SystemMessage(
+                    content=f"Earlier conversation (older lines omitted, long messages truncated):\n{context.summary}"
+                ))
+            for msg in context.messages:
                 if msg.role == "system":
                     messages.append(SystemMessage(content=msg.content))
                 elif msg.role == "assistant":
@@ -136,65 +350,51 @@ class BaseAgentService(ABC, Generic[T]):
         # Add current user message
         messages.append(HumanMessage(content=prompt))
         
-        try:
-            # Call WatsonX asynchronously
-            response = await self.chat_model.ainvoke(messages)
-            
-            # Extract content from response
-            if hasattr(response, 'content'):
-                response_text = str(response.content)
-            else:
-                response_text = str(response)
-            
-            # Parse response into Pydantic model
-            parsed_response = self.parse_response(response_text)
-            
-            # Get the text to save to conversation history
-            # If the parsed response has a response_text attribute (like TripSeedAgentResponse),
-            # use that instead of the raw JSON
-            message_content = response_text
-            if hasattr(parsed_response, 'response_text'):
-                message_content = parsed_response.response_text
-            
-            # Save to conversation history if enabled
-            if use_history and self.conversation_service:
-                if conversation_id:
-                    # Add messages to existing conversation
-                    # Use original_user_message if provided, otherwise use prompt
-                    user_message_to_save = original_user_message if original_user_message else prompt
-                    await self.conversation_service.add_message(
-                        conversation_id=conversation_id,
-                        role="user",
-                        content=user_message_to_save
-                    )
-                    await self.conversation_service.add_message(
-                        conversation_id=conversation_id,
-                        role="assistant",
-                        content=message_content
-                    )
-                elif user_id:
-                    # Create new conversation
-                    conv = await self.conversation_service.create_conversation(
-                        user_id=user_id,
-                        trip_id=trip_id
-                    )
-                    # Use original_user_message if provided, otherwise use prompt
-                    user_message_to_save = original_user_message if original_user_message else prompt
-                    await self.conversation_service.add_message(
-                        conversation_id=conv.id,
-                        role="user",
-                        content=user_message_to_save
-                    )
-                    await self.conversation_service.add_message(
-                        conversation_id=conv.id,
-                        role="assistant",
-                        content=message_content
-                    )
-            
-            return parsed_response
-            
-        except Exception as e:
-            raise Exception(f"Failed to process prompt with WatsonX: {str(e)}") from e
+        return messages
+    
+    async def _complete_response(
+        self,
+        response_text: str,
+        prompt: str,
+        user_id: Optional[int],
+        trip_id: Optional[int],
+        conversation_id: Optional[int],
+        use_history: bool,
+        original_user_message: Optional[str],
+    ) -> T:
+        """Parse a complete reply and save the exchange to conversation history."""
+        # Parse response into Pydantic model
+        parsed_response = self.parse_response(response_text)
+        
+        # Get the text to save to conversation history
+        # If the parsed response has a response_text attribute (like TripSeedAgentResponse),
+        # use that instead of the raw JSON
+        message_content = response_text
+        if hasattr(parsed_response, 'response_text'):
+            message_content = parsed_response.response_text
+        
+        # Save to conversation history if enabled
+        if use_history and self.conversation_service:
+            # Use original_user_message if provided, otherwise use prompt
+            user_message_to_save = original_user_message if original_user_message else prompt
+            if not conversation_id and user_id:
+                # Create new conversation
+                conv = await self.conversation_service.create_conversation(
+                    user_id=user_id,
+                    trip_id=trip_id
+                )
+                conversation_id = conv.id
+            if conversation_id:
+                # Save the whole turn in one transaction
+                await self.conversation_service.add_messages(
+                    conversation_id=conversation_id,
+                    messages=[
+                        ("user", user_message_to_save),
+                        ("assistant", message_content),
+                    ],
+                )
+        
+        return parsed_response
     
     async def process_simple(self, prompt: str) -> T:
         """
@@ -0,0 +1,169 @@
+"""
+Bounded conversation context for agent prompts.
+
+Replaying every message of a conversation makes each turn's prompt (and so
+its latency and cost) grow with the length of the conversation.
+ContextWindowManager keeps it flat:
+
+- the last `max_turns` turns are sent verbatim, as long as they fit in the
+  token budget left after the system prompt and the current prompt;
+- everything older is folded into a truncated transcript tail stored on
+  the Conversation (`summary`, covering the first `summary_message_count`
+  messages): one line per message, cut to SUMMARY_LINE_CHARS, keeping only
+  the newest lines that fit in `summary_token_budget` tokens.
+
+The tail is not a summary. Whatever was said before its oldest line is gone,
+so facts the agent must not forget belong in its structured state (e.g. the
+TripSeed fields, sent in the system prompt), not in the history.
+
+Each turn reads the window and the (few) messages that just left it, so the
+work per turn does not depend on how long the conversation is.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+from core.config import settings
+from core.models.conversation import Message
+from services.core.agent.conversation_service import ConversationService
+
+# Longest excerpt of a single message kept in the transcript tail
+SUMMARY_LINE_CHARS = 200
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Estimate the number of tokens in a text.
+    
+    Uses the usual ~4 characters per token approximation for English text,
+    which is close enough for budgeting without loading a tokenizer.
+    """
+    if not text:
+        return 0
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class ContextWindow:
+    """History to send with a prompt."""
+    summary: Optional[str] = None  # Truncated transcript tail of the messages before `messages`
+    messages: List[Message] = field(default_factory=list)  # Recent messages, oldest first
+
+
+class ContextWindowManager:
+    """Selects the history window and maintains the truncated transcript tail."""
+    
+    def __init__(
+        self,
+        conversation_service: ConversationService,
+        max_turns: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        summary_token_budget: Optional[int] = None,
+    ):
+        """
+        Initialize the manager.
+        
+        Args:
+            conversation_service: Conversation service for loading and updating history
+            max_turns: Turns (user + assistant message pairs) kept verbatim
+                (defaults to AGENT_HISTORY_MAX_TURNS)
+            token_budget: Estimated tokens for the whole prompt
+                (defaults to AGENT_CONTEXT_TOKEN_BUDGET)
+            summary_token_budget: Estimated tokens for the transcript tail
+                (defaults to AGENT_SUMMARY_TOKEN_BUDGET)
+        """
+        self.conversation_service = conversation_service
+        self.max_turns = max_turns if max_turns is not None else settings.agent_history_max_turns
+        self.token_budget = token_budget if token_budget is not None else settings.agent_context_token_budget
+        self.summary_token_budget = (
+            summary_token_budget if summary_token_budget is not None
+            else settings.agent_summary_token_budget
+        )
+    
+    async def get_context(
+        self,
+        conversation_id: int,
+        reserved_tokens: int = 0,
+    ) -> ContextWindow:
+        """
+        Get the history window for the next turn of a conversation.
+        
+        Messages that no longer fit in the window are folded into the
+        conversation's transcript tail before returning.
+        
+        Args:
+            conversation_id: Conversation ID
+            reserved_tokens: Estimated tokens already used by the system prompt
+                and the current prompt
+                
+        Returns:
+            ContextWindow with the transcript tail and the recent messages
+        """
+        conversation = await self.conversation_service.get_conversation(conversation_id)
+        if not conversation:
+            return ContextWindow()
+        
+        summary = conversation.summary
+        summarized_count = conversation.summary_message_count
+        
+        recent = await self.conversation_service.get_recent_messages(
+            conversation_id,
+            limit=self.max_turns * 2,
+        )
+        recent = [msg for msg in recent if msg.sequence_index >= summarized_count]
+        if not recent:
+            return ContextWindow(summary=summary)
+        
+        # Keep the newest messages that fit next to the prompt and the summary
+        available = self.token_budget - reserved_tokens - self.summary_token_budget
+        window: List[Message] = []
+        used = 0
+        for msg in reversed(recent):
+            cost = estimate_tokens(msg.content)
+            if window and used + cost > available:
+                break
+            window.insert(0, msg)
+            used += cost
+        
+        window_start = window[0].sequence_index
+        if window_start > summarized_count:
+            expired = await self.conversation_service.get_messages_in_range(
+                conversation_id,
+                start_index=summarized_count,
+                end_index=window_start,
+            )
+            summary = self.fold_transcript_tail(summary, expired)
+            await self.conversation_service.update_summary(
+                conversation_id,
+                summary=summary,
+                summary_message_count=window_start,
+            )
+        
+        return ContextWindow(summary=summary, messages=window)
+    
+    def fold_transcript_tail(self, tail: Optional[str], messages: List[Message]) -> Optional[str]:
+        """
+        Append messages to a truncated transcript tail.
+        
+        Adds one "Role: text" line per message, with whitespace collapsed and
+        the text cut to SUMMARY_LINE_CHARS, then drops the oldest lines until
+        the tail fits in its token budget (the newest line is always kept).
+        Nothing is condensed: dropped lines are lost, which is acceptable only
+        because the agent's structured state is sent separately.
+        
+        Args:
+            tail: Current transcript tail (None if nothing was folded yet)
+            messages: Messages leaving the window, oldest first
+            
+        Returns:
+            Updated transcript tail
+        """
+        lines = tail.split("\n") if tail else []
+        for msg in messages:
+            text = " ".join(msg.content.split())
+            if len(text) > SUMMARY_LINE_CHARS:
+                text = text[:SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+            lines.append(f"{msg.role.capitalize()}: {text}")
+        
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_token_budget:
+            lines.pop(0)
+        
+        return "\n".join(lines) if lines else None
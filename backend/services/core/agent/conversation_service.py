@@ -1,5 +1,9 @@
 """Service for managing conversation history."""
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from tortoise import timezone
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
 from core.models.conversation import Conversation, Message
 from dtos.agent_dto import ConversationResponse, MessageResponse
 
@@ -97,25 +101,85 @@ class ConversationService:
         Raises:
             ValueError: If conversation doesn't exist
         """
-        conversation = await Conversation.get_or_none(id=conversation_id)
-        if not conversation:
-            raise ValueError(f"Conversation {conversation_id} not found")
+        async with in_transaction() as connection:
+            sequence_index = await self._allocate_sequence_indexes(conversation_id, 1, connection)
+            return await Message.create(
+                conversation_id=conversation_id,
+                role=role,
+                content=content,
+                sequence_index=sequence_index,
+                using_db=connection,
+            )
+    
+    async def add_messages(
+        self,
+        conversation_id: int,
+        messages: List[Tuple[str, str]],
+    ) -> None:
+        """
+        Add several messages to a conversation in one transaction.
         
-        # Calculate the next sequence_index by counting existing messages
-        existing_count = await Message.filter(conversation_id=conversation_id).count()
-        sequence_index = existing_count  # 0-indexed: first message is 0, second is 1, etc.
+        Used to save a whole turn (user message and assistant reply) at once:
+        one UPDATE allocates the sequence indexes and touches the conversation,
+        one INSERT writes the messages.
         
-        message = await Message.create(
-            conversation=conversation,
-            role=role,
-            content=content,
-            sequence_index=sequence_index,
-        )
+        Args:
+            conversation_id: Conversation ID
+            messages: (role, content) pairs in order
+            
+        Raises:
+            ValueError: If conversation doesn't exist
+        """
+        if not messages:
+            return
         
-        # Update conversation timestamp
-        await conversation.save()
+        async with in_transaction() as connection:
+            first_index = await self._allocate_sequence_indexes(
+                conversation_id, len(messages), connection
+            )
+            await Message.bulk_create(
+                [
+                    Message(
+                        conversation_id=conversation_id,
+                        role=role,
+                        content=content,
+                        sequence_index=first_index + offset,
+                    )
+                    for offset, (role, content) in enumerate(messages)
+                ],
+                using_db=connection,
+            )
+    
+    async def _allocate_sequence_indexes(
+        self,
+        conversation_id: int,
+        count: int,
+        connection: BaseDBAsyncClient,
+    ) -> int:
+        """
+        Reserve `count` consecutive sequence indexes and touch the conversation.
+        
+        The counter is incremented in the database, which locks the
+        conversation row until the transaction ends, so concurrent turns
+        never get the same indexes.
         
-        return message
+        Returns:
+            The first reserved sequence index
+            
+        Raises:
+            ValueError: If conversation doesn't exist
+        """
+        updated = await Conversation.filter(id=conversation_id).using_db(connection).update(
+            message_count=F("message_count") + count,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            raise ValueError(f"Conversation {conversation_id} not found")
+        
+        conversation = await Conversation.filter(id=conversation_id).using_db(connection).only(
+            "id", "message_count"
+        ).get()
+        return conversation.message_count - count
     
     async def get_conversation_messages(
         self,
@@ -139,6 +203,68 @@ class ConversationService:
         
         return await query
     
+    async def get_recent_messages(
+        self,
+        conversation_id: int,
+        limit: int,
+    ) -> List[Message]:
+        """
+        Get the most recent messages of a conversation.
+        
+        Args:
+            conversation_id: Conversation ID
+            limit: Maximum number of messages to return
+            
+        Returns:
+            List of Message objects in chronological (sequence_index) order
+        """
+        messages = await Message.filter(
+            conversation_id=conversation_id
+        ).order_by('-sequence_index', '-id').limit(limit)
+        return list(reversed(messages))
+    
+    async def get_messages_in_range(
+        self,
+        conversation_id: int,
+        start_index: int,
+        end_index: int,
+    ) -> List[Message]:
+        """
+        Get messages with start_index <= sequence_index < end_index.
+        
+        Args:
+            conversation_id: Conversation ID
+            start_index: First sequence_index to include
+            end_index: First sequence_index to exclude
+            
+        Returns:
+            List of Message objects in chronological (sequence_index) order
+        """
+        return await Message.filter(
+            conversation_id=conversation_id,
+            sequence_index__gte=start_index,
+            sequence_index__lt=end_index,
+        ).order_by('sequence_index', 'id')
+    
+    async def update_summary(
+        self,
+        conversation_id: int,
+        summary: Optional[str],
+        summary_message_count: int,
+    ) -> None:
+        """
+        Store the truncated transcript tail of a conversation's older messages.
+        
+        Args:
+            conversation_id: Conversation ID
+            summary: Transcript tail text
+            summary_message_count: Number of leading messages folded into the tail
+        """
+        await Conversation.filter(id=conversation_id).update(
+            summary=summary,
+            summary_message_count=summary_message_count,
+        )
+    
     async def delete_conversation(
         self,
         conversation_id: int,
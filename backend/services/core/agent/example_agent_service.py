@@ -7,10 +7,12 @@ Each agent should:
 2. Implement parse_response() method
 3. Define their Pydantic response model
 4. Optionally load system prompt from prompts/ folder
+5. Implement fake_response() so it runs with LLM_BACKEND=fake
 """
 import json
 import re
-from typing import Optional
+from typing import List, Optional
+from langchain_core.messages import BaseMessage
 from pydantic import BaseModel
 from services.core.agent.base_agent_service import BaseAgentService
 from services.core.agent.conversation_service import ConversationService
@@ -111,4 +113,16 @@ class ExampleAgentService(BaseAgentService[ExampleAgentResponse]):
         raise ValueError(
             f"Could not parse response as ExampleAgentResponse: {response_text[:200]}"
         )
-
+    
+    def fake_response(self, messages: List[BaseMessage]) -> str:
+        """
+        Build a reply for the local fake model (LLM_BACKEND=fake).
+        
+        Returns JSON that `parse_response` accepts, echoing the prompt.
+        """
+        prompt = str(messages[-1].content) if messages else ""
+        return json.dumps({
+            "answer": f"Example answer to: {prompt[:100]}",
+            "confidence": 1.0,
+            "reasoning": "Generated by the fake LLM backend",
+        })
@@ -0,0 +1,122 @@
+"""
+Incremental extraction of a string field from a streamed JSON reply.
+
+Agents reply with a JSON object such as {"response_text": "...", ...}. While
+the reply is still being generated it is not valid JSON, so it can't be
+parsed; JsonStringFieldStreamer scans the chunks as they arrive and returns
+the decoded characters of one string field as soon as they are available.
+"""
+import json
+import re
+
+# JSON escapes that map to a single character
+_SIMPLE_ESCAPES = {
+    '"': '"',
+    '\\': '\\',
+    '/': '/',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+}
+
+
+class JsonStringFieldStreamer:
+    """
+    Streams the value of a top-level string field out of partial JSON.
+    
+    Usage:
+        streamer = JsonStringFieldStreamer("response_text")
+        async for chunk in model_chunks:
+            text = streamer.feed(chunk)
+            if text:
+                ...  # send to the client
+    """
+    
+    def __init__(self, field_name: str):
+        """
+        Initialize the streamer.
+        
+        Args:
+            field_name: Name of the string field to extract
+        """
+        self._key_pattern = re.compile(r'"' + re.escape(field_name) + r'"\s*:\s*"')
+        self._buffer = ""
+        self._position = 0  # Next unread index into the buffer (while in the value)
+        self._in_value = False
+        self.done = False
+    
+    def feed(self, chunk: str) -> str:
+        """
+        Consume the next chunk of the reply.
+        
+        Args:
+            chunk: Raw text generated since the previous call
+        
+        Returns:
+            Newly decoded characters of the field (empty if none yet)
+        """
+        if self.done or not chunk:
+            return ""
+        
+        self._buffer += chunk
+        
+        if not self._in_value:
+            match = self._key_pattern.search(self._buffer)
+            if not match:
+                return ""
+            self._in_value = True
+            self._position = match.end()
+        
+        output = []
+        buffer = self._buffer
+        i = self._position
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self.done = True
+                i += 1
+                break
+            if char != '\\':
+                output.append(char)
+                i += 1
+                continue
+            
+            # Escape sequence; wait for more input if it is cut off
+            if i + 1 >= len(buffer):
+                break
+            escape = buffer[i + 1]
+            if escape == 'u':
+                if i + 6 > len(buffer):
+                    break
+                decoded, length = self._decode_unicode_escape(buffer, i)
+                if decoded is None:
+                    break
+                output.append(decoded)
+                i += length
+            else:
+                output.append(_SIMPLE_ESCAPES.get(escape, escape))
+                i += 2
+        
+        self._position = i
+        return "".join(output)
+    
+    @staticmethod
+    def _decode_unicode_escape(buffer: str, start: int):
+        """Decode a \\uXXXX escape (or surrogate pair) at start; (None, 0) if incomplete."""
+        escape = buffer[start:start + 6]
+        try:
+            code = int(escape[2:], 16)
+        except ValueError:
+            # Not valid JSON; pass the text through rather than failing the stream
+            return escape, 6
+        if 0xD800 <= code <= 0xDBFF:
+            # High surrogate: needs the following \\uXXXX low surrogate
+            if start + 12 > len(buffer):
+                return None, 0
+            try:
+                return json.loads(f'"{buffer[start:start + 12]}"'), 12
+            except ValueError:
+                return chr(code), 6
+        return chr(code), 6
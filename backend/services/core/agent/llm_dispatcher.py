@@ -0,0 +1,202 @@
+"""
+Dispatch layer for outbound LLM calls.
+
+Every model call made by an agent service takes a slot from the process-wide
+LLMDispatcher first:
+
+- at most `max_concurrency` calls run at once, so bursts queue up here
+  instead of hitting WatsonX rate limits;
+- waiting calls are grouped by user and served round-robin, so one user's
+  burst can't starve everyone else;
+- interactive turns are served before background jobs;
+- at most `max_queue_size` calls wait; beyond that calls are rejected
+  immediately with LLMQueueFullError (HTTP 429) instead of piling up.
+
+Queue wait times are recorded for /metrics.
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Deque, Dict, Hashable, Optional
+from core.config import settings
+from services.core.agent.llm_exceptions import LLMQueueFullError
+
+# Number of recent queue wait samples kept for percentiles
+WAIT_SAMPLE_SIZE = 1000
+
+
+class Priority(IntEnum):
+    """Priority of an LLM call (lower is served first)."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class LLMDispatcher:
+    """Concurrency cap with a bounded, fair, prioritized wait queue."""
+    
+    def __init__(self, max_concurrency: int, max_queue_size: int):
+        """
+        Initialize the dispatcher.
+        
+        Args:
+            max_concurrency: Maximum number of concurrent LLM calls
+            max_queue_size: Maximum number of calls waiting for a slot
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self._in_flight = 0
+        self._queued = 0
+        # Per priority: user -> waiting futures, users in round-robin order
+        self._waiting: Dict[Priority, "OrderedDict[Hashable, Deque[asyncio.Future]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._wait_samples: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self.dispatched = 0
+        self.rejected = 0
+    
+    @asynccontextmanager
+    async def slot(
+        self,
+        user_id: Optional[int] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[None]:
+        """
+        Hold a call slot for the duration of the block.
+        
+        Usage:
+            async with llm_dispatcher.slot(user_id):
+                response = await chat_model.ainvoke(messages)
+                
+        Args:
+            user_id: User the call is made for (calls without a user share one queue)
+            priority: Priority of the call
+            
+        Raises:
+            LLMQueueFullError: If the wait queue is full
+        """
+        await self.acquire(user_id, priority)
+        try:
+            yield
+        finally:
+            self.release()
+    
+    async def acquire(
+        self,
+        user_id: Optional[int] = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> None:
+        """
+        Wait for a call slot. Pair every successful call with `release()`.
+        
+        Raises:
+            LLMQueueFullError: If the wait queue is full
+        """
+        if self._in_flight < self.max_concurrency and self._queued == 0:
+            self._in_flight += 1
+            self.dispatched += 1
+            self._wait_samples.append(0.0)
+            return
+        
+        if self._queued >= self.max_queue_size:
+            self.rejected += 1
+            raise LLMQueueFullError("Too many requests are waiting for the model; please retry shortly")
+        
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[priority].setdefault(user_id, deque()).append(future)
+        self._queued += 1
+        
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                self._remove(priority, user_id, future)
+            else:
+                # The slot was handed over just as the caller was cancelled
+                self.release()
+            raise
+        
+        self._wait_samples.append(time.monotonic() - started)
+    
+    def try_acquire(self) -> bool:
+        """
+        Take a call slot only if one is free and nobody is waiting for it.
+        
+        Used for optional extra calls (hedged duplicates), which must neither
+        exceed the cap nor queue ahead of real calls. Pair every True with
+        `release()`.
+        
+        Returns:
+            Whether a slot was taken
+        """
+        if self._in_flight >= self.max_concurrency or self._queued:
+            return False
+        self._in_flight += 1
+        self.dispatched += 1
+        return True
+    
+    def release(self) -> None:
+        """Give a slot back and hand it to the next waiting call."""
+        self._in_flight -= 1
+        
+        while self._in_flight < self.max_concurrency:
+            future = self._next_waiter()
+            if future is None:
+                return
+            self._in_flight += 1
+            self.dispatched += 1
+            future.set_result(None)
+    
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Pop the next waiter: highest priority first, round-robin across users."""
+        for priority in Priority:
+            users = self._waiting[priority]
+            while users:
+                user_id, waiters = users.popitem(last=False)
+                future = waiters.popleft()
+                if waiters:
+                    # Back of the line for this user's remaining calls
+                    users[user_id] = waiters
+                self._queued -= 1
+                if not future.done():
+                    return future
+        return None
+    
+    def _remove(self, priority: Priority, user_id: Optional[int], future: asyncio.Future) -> None:
+        """Drop a cancelled waiter from the queue."""
+        waiters = self._waiting[priority].get(user_id)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            self._queued -= 1
+            if not waiters:
+                del self._waiting[priority][user_id]
+    
+    def stats(self) -> dict:
+        """Get concurrency, queue and wait time metrics."""
+        samples = sorted(self._wait_samples)
+        
+        def percentile(fraction: float) -> Optional[float]:
+            if not samples:
+                return None
+            return round(samples[min(len(samples) - 1, int(len(samples) * fraction))] * 1000, 1)
+        
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "max_queue_size": self.max_queue_size,
+            "dispatched": self.dispatched,
+            "rejected": self.rejected,
+            "queue_wait_ms_p50": percentile(0.5),
+            "queue_wait_ms_p95": percentile(0.95),
+            "queue_wait_ms_max": round(samples[-1] * 1000, 1) if samples else None,
+        }
+
+
+# Singleton instance shared by all agent services in this process
+llm_dispatcher = LLMDispatcher(
+    max_concurrency=settings.llm_max_concurrency,
+    max_queue_size=settings.llm_max_queue_size,
+)
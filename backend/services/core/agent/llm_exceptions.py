@@ -0,0 +1,21 @@
+"""Custom exceptions for outbound LLM calls."""
+
+
+class LLMError(Exception):
+    """Base exception for LLM call failures that callers handle specifically."""
+    pass
+
+
+class LLMQueueFullError(LLMError):
+    """Raised when the LLM dispatch queue is full and the call is rejected."""
+    pass
+
+
+class LLMTimeoutError(LLMError):
+    """Raised when an LLM call (including its retries) does not finish in time."""
+    pass
+
+
+class LLMUnavailableError(LLMError):
+    """Raised when the circuit breaker is open and LLM calls fail fast."""
+    pass
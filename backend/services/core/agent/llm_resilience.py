@@ -0,0 +1,463 @@
+"""
+Resilience layer for outbound LLM calls.
+
+ResilientLLMCaller wraps each model call made by an agent service:
+
+- every attempt is bounded by `timeout_seconds` (for streams: the wait for
+  each chunk);
+- transient failures (timeouts, connection errors, 408/429/5xx responses)
+  are retried up to `max_retries` times with full-jitter exponential
+  backoff, so a burst of retries doesn't hit WatsonX in lockstep;
+- optionally, a call still running after the recent p95 latency gets a
+  hedged duplicate, and whichever answers first wins. The duplicate takes
+  its own dispatcher slot and is skipped when none is free, so hedging
+  never exceeds LLM_MAX_CONCURRENCY;
+- a CircuitBreaker tracks the upstream failure rate; once it spikes, calls
+  fail fast with LLMUnavailableError (callers may fall back to a
+  deterministic path) until a probe call succeeds again.
+
+Streams are only retried until their first chunk arrives: after that the
+text has already been sent to the client. Streams are never hedged.
+
+Retry, timeout, hedge and breaker counters are exposed on /metrics.
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from enum import Enum
+from typing import AsyncIterator, Awaitable, Callable, Deque, Optional, Tuple, TypeVar
+import httpx
+from core.config import settings
+from services.core.agent.llm_dispatcher import LLMDispatcher
+from services.core.agent.llm_exceptions import LLMTimeoutError, LLMUnavailableError
+
+R = TypeVar('R')
+
+# HTTP statuses worth retrying (rate limiting and upstream/gateway errors)
+TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+# Number of recent successful call latencies kept for the hedging delay
+LATENCY_SAMPLE_SIZE = 200
+
+# Hedging starts once there are enough samples for a meaningful p95
+MIN_HEDGE_SAMPLES = 20
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Check whether a failed call is worth retrying.
+    
+    Looks through the exception chain, since clients often wrap transport
+    errors in their own exception types.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (TimeoutError, ConnectionError, httpx.TimeoutException, httpx.TransportError)):
+            return True
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+        if status_code is not None:
+            return int(status_code) in TRANSIENT_STATUS_CODES
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class CircuitState(str, Enum):
+    """State of a circuit breaker."""
+    CLOSED = "closed"  # Calls go through
+    OPEN = "open"  # Calls fail fast
+    HALF_OPEN = "half_open"  # One probe call goes through
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker over a sliding time window."""
+    
+    def __init__(
+        self,
+        failure_rate_threshold: float,
+        min_calls: int,
+        window_seconds: float,
+        open_seconds: float,
+    ):
+        """
+        Initialize a closed breaker.
+        
+        Args:
+            failure_rate_threshold: Failure rate (0-1) in the window that opens the breaker
+            min_calls: Minimum calls in the window before the failure rate is trusted
+            window_seconds: Length of the sliding window
+            open_seconds: How long the breaker stays open before letting a probe through
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.state = CircuitState.CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (timestamp, succeeded)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self.short_circuited = 0
+    
+    def allow(self) -> bool:
+        """
+        Check whether a call may go through (and claim the probe when half-open).
+        
+        Returns:
+            False if the call must fail fast
+        """
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.short_circuited += 1
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._probe_in_flight = False
+        
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probe_in_flight:
+                self.short_circuited += 1
+                return False
+            self._probe_in_flight = True
+        
+        return True
+    
+    def record_success(self) -> None:
+        """Record a call that reached a healthy upstream."""
+        if self.state == CircuitState.HALF_OPEN:
+            self._close()
+            return
+        self._record(True)
+    
+    def record_failure(self) -> None:
+        """Record a failed attempt, opening the breaker if the failure rate spikes."""
+        if self.state == CircuitState.HALF_OPEN:
+            self._open()
+            return
+        self._record(False)
+        
+        calls = len(self._outcomes)
+        if calls >= self.min_calls and self._failure_rate() >= self.failure_rate_threshold:
+            self._open()
+    
+    def release_probe(self) -> None:
+        """Give the probe back if it ended without an outcome (e.g. it was cancelled)."""
+        self._probe_in_flight = False
+    
+    def stats(self) -> dict:
+        """Get breaker state and window metrics."""
+        self._prune()
+        failure_rate = self._failure_rate()
+        return {
+            "state": self.state.value,
+            "calls_in_window": len(self._outcomes),
+            "failure_rate": round(failure_rate, 3) if self._outcomes else None,
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+        }
+    
+    def _record(self, succeeded: bool) -> None:
+        self._outcomes.append((time.monotonic(), succeeded))
+        self._prune()
+    
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+    
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+        return failures / len(self._outcomes)
+    
+    def _open(self) -> None:
+        self.state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.times_opened += 1
+    
+    def _close(self) -> None:
+        self.state = CircuitState.CLOSED
+        self._outcomes.clear()
+        self._probe_in_flight = False
+
+
+class ResilientLLMCaller:
+    """Timeouts, jittered retries, hedging and a circuit breaker around model calls."""
+    
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        timeout_seconds: float,
+        max_retries: int,
+        retry_base_delay_seconds: float,
+        retry_max_delay_seconds: float,
+        hedging_enabled: bool = False,
+        hedge_min_delay_seconds: float = 1.0,
+    ):
+        """
+        Initialize the caller.
+        
+        Args:
+            breaker: Circuit breaker tracking upstream health
+            timeout_seconds: Timeout of a single attempt (for streams: of each chunk)
+            max_retries: Retries after the first attempt on transient errors
+            retry_base_delay_seconds: Backoff cap of the first retry (doubles per retry)
+            retry_max_delay_seconds: Maximum backoff cap
+            hedging_enabled: Send a duplicate request when a call is slower than the recent p95
+            hedge_min_delay_seconds: Never hedge before this delay
+        """
+        self.breaker = breaker
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_base_delay_seconds = retry_base_delay_seconds
+        self.retry_max_delay_seconds = retry_max_delay_seconds
+        self.hedging_enabled = hedging_enabled
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self.calls = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+    
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[R]],
+        dispatcher: Optional[LLMDispatcher] = None,
+    ) -> R:
+        """
+        Run a model call with timeouts, retries, hedging and the circuit breaker.
+        
+        Args:
+            fn: Starts one attempt of the call (called again for each retry or hedge)
+            dispatcher: Dispatcher the caller holds a slot of; a hedged duplicate
+                is only sent if it can take a second slot without waiting
+                (None hedges without a concurrency limit)
+            
+        Returns:
+            The result of the first successful attempt
+            
+        Raises:
+            LLMUnavailableError: If the circuit breaker is open
+            LLMTimeoutError: If the last attempt timed out
+            Exception: The last attempt's error if it was not transient or retries ran out
+        """
+        self._ensure_available()
+        
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(self._hedged(fn, dispatcher), self.timeout_seconds)
+            except asyncio.CancelledError:
+                self.breaker.release_probe()
+                raise
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    if isinstance(e, TimeoutError):
+                        raise LLMTimeoutError(f"Model call timed out after {attempt + 1} attempt(s)") from e
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            
+            self._latencies.append(time.monotonic() - started)
+            self.breaker.record_success()
+            return result
+    
+    async def stream(self, fn: Callable[[], AsyncIterator[R]]) -> AsyncIterator[R]:
+        """
+        Run a streaming model call, retrying until its first chunk arrives.
+        
+        Args:
+            fn: Opens one attempt of the stream (called again for each retry)
+            
+        Yields:
+            Chunks of the first attempt that produced one
+            
+        Raises:
+            LLMUnavailableError: If the circuit breaker is open
+            LLMTimeoutError: If no chunk arrived in time
+            Exception: The error of the stream if it was not transient, retries ran out
+                or it failed after the first chunk
+        """
+        self._ensure_available()
+        
+        attempt = 0
+        while True:
+            chunks = fn().__aiter__()
+            try:
+                first = await asyncio.wait_for(chunks.__anext__(), self.timeout_seconds)
+            except StopAsyncIteration:
+                self.breaker.record_success()
+                return
+            except asyncio.CancelledError:
+                self.breaker.release_probe()
+                await self._close_abandoned(chunks)
+                raise
+            except Exception as e:
+                # Close the failed attempt before waiting, so it doesn't hold its connection
+                await self._close_abandoned(chunks)
+                if not self._should_retry(e, attempt):
+                    if isinstance(e, TimeoutError):
+                        raise LLMTimeoutError(f"Model stream timed out after {attempt + 1} attempt(s)") from e
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+            break
+        
+        try:
+            yield first
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), self.timeout_seconds)
+                except StopAsyncIteration:
+                    break
+                yield chunk
+        except (asyncio.CancelledError, GeneratorExit):
+            # Cancelled, or the consumer stopped reading
+            self.breaker.release_probe()
+            raise
+        except Exception as e:
+            self._record_failure(e)
+            if isinstance(e, TimeoutError):
+                raise LLMTimeoutError("Model stream stalled") from e
+            raise
+        finally:
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        
+        self.breaker.record_success()
+    
+    @staticmethod
+    async def _close_abandoned(chunks: AsyncIterator) -> None:
+        """Close a stream attempt that is given up on, ignoring errors from closing it."""
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is None:
+            return
+        try:
+            await aclose()
+        except Exception:
+            pass
+    
+    def stats(self) -> dict:
+        """Get call, retry, timeout and hedge counters and the breaker state."""
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedges_skipped": self.hedges_skipped,
+            "latency_ms_p95": round(self._p95() * 1000, 1) if self._latencies else None,
+            "breaker": self.breaker.stats(),
+        }
+    
+    def _ensure_available(self) -> None:
+        """Fail fast while the breaker is open."""
+        if not self.breaker.allow():
+            raise LLMUnavailableError("The model service is temporarily unavailable; please retry shortly")
+        self.calls += 1
+    
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        """Record a failed attempt and decide whether to retry it."""
+        if not self._record_failure(error):
+            return False
+        if attempt >= self.max_retries or self.breaker.state != CircuitState.CLOSED:
+            self.failures += 1
+            return False
+        self.retries += 1
+        return True
+    
+    def _record_failure(self, error: Exception) -> bool:
+        """
+        Record a failed attempt with the breaker.
+        
+        Returns:
+            Whether the error was transient
+        """
+        if not is_transient_error(error):
+            # The upstream answered (e.g. rejected the request), so it is healthy
+            self.breaker.record_success()
+            return False
+        
+        if isinstance(error, TimeoutError):
+            self.timeouts += 1
+        self.breaker.record_failure()
+        return True
+    
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt + 1`."""
+        cap = min(self.retry_max_delay_seconds, self.retry_base_delay_seconds * (2 ** attempt))
+        return random.uniform(0, cap)
+    
+    def _p95(self) -> float:
+        samples = sorted(self._latencies)
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    
+    def _hedge_delay(self) -> Optional[float]:
+        """Delay after which a hedged request is sent, or None to not hedge."""
+        if not self.hedging_enabled or len(self._latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        return max(self.hedge_min_delay_seconds, self._p95())
+    
+    async def _hedged(self, fn: Callable[[], Awaitable[R]], dispatcher: Optional[LLMDispatcher] = None) -> R:
+        """Run one attempt, sending a duplicate if it is slower than the hedge delay."""
+        delay = self._hedge_delay()
+        if delay is None:
+            return await fn()
+        
+        tasks = [asyncio.ensure_future(fn())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return tasks[0].result()
+            
+            # The duplicate needs its own slot; don't wait for one
+            if dispatcher is not None and not dispatcher.try_acquire():
+                self.hedges_skipped += 1
+                return await tasks[0]
+            
+            self.hedges += 1
+            tasks.append(asyncio.ensure_future(fn()))
+            if dispatcher is not None:
+                tasks[1].add_done_callback(lambda _: dispatcher.release())
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+
+# Singleton instance shared by all agent services in this process (one breaker per upstream)
+llm_resilience = ResilientLLMCaller(
+    breaker=CircuitBreaker(
+        failure_rate_threshold=settings.llm_breaker_failure_rate,
+        min_calls=settings.llm_breaker_min_calls,
+        window_seconds=settings.llm_breaker_window_seconds,
+        open_seconds=settings.llm_breaker_open_seconds,
+    ),
+    timeout_seconds=settings.llm_call_timeout_seconds,
+    max_retries=settings.llm_max_retries,
+    retry_base_delay_seconds=settings.llm_retry_base_delay_seconds,
+    retry_max_delay_seconds=settings.llm_retry_max_delay_seconds,
+    hedging_enabled=settings.llm_hedging_enabled,
+    hedge_min_delay_seconds=settings.llm_hedge_min_delay_seconds,
+)
@@ -0,0 +1,218 @@
+"""
+Response cache for agent model calls.
+
+Identical requests (same model, params, system prompt and conversation) are
+answered from the cache instead of calling WatsonX again. Keys hash the
+model id, the generation params, the system prompt and the message history
+after whitespace/case normalization, so "Plan me a weekend trip" and
+"plan me a  weekend trip " share an entry.
+
+Only deterministic calls are cached by default: with temperature > 0 the
+model is expected to vary its wording, so agents must opt in explicitly
+(`cache_sampled_responses` or AGENT_RESPONSE_CACHE_ALLOW_SAMPLING).
+
+Storage goes through ResponseCacheBackend. The default backend is an
+in-process TTL + LRU map; a shared backend (e.g. Redis) can implement the
+same interface so several workers share entries.
+"""
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from langchain_core.messages import BaseMessage
+from core.config import settings
+
+
+class ResponseCacheBackend(ABC):
+    """Abstract storage for cached agent responses."""
+    
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Raw response text, or None if missing or expired
+        """
+        pass
+    
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        """
+        Store a response.
+        
+        Args:
+            key: Cache key
+            value: Raw response text
+            ttl_seconds: Time to live in seconds
+        """
+        pass
+    
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop every cached response."""
+        pass
+    
+    def stats(self) -> dict:
+        """Get backend-specific metrics."""
+        return {}
+
+
+class InMemoryResponseCacheBackend(ResponseCacheBackend):
+    """Per-process TTL + LRU backend."""
+    
+    def __init__(self, max_entries: int):
+        """
+        Initialize an empty backend.
+        
+        Args:
+            max_entries: Maximum number of cached responses
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+    
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        if self.max_entries <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    async def clear(self) -> None:
+        self._entries.clear()
+    
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class ResponseCache:
+    """Keys, eligibility rules and metrics on top of a ResponseCacheBackend."""
+    
+    def __init__(
+        self,
+        backend: ResponseCacheBackend,
+        ttl_seconds: int,
+        enabled: bool = True,
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            backend: Storage backend
+            ttl_seconds: Time to live of cached responses
+            enabled: Whether responses are cached at all
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+    
+    def is_cacheable(self, params: dict, allow_sampling: bool = False) -> bool:
+        """
+        Check whether a call with these params may use the cache.
+        
+        Args:
+            params: Generation params of the call
+            allow_sampling: Whether the caller opted in to caching sampled (temperature > 0) calls
+        """
+        if not self.enabled:
+            return False
+        return (params.get("temperature") or 0) <= 0 or allow_sampling
+    
+    def build_key(
+        self,
+        model_id: str,
+        params: dict,
+        messages: List[BaseMessage],
+    ) -> str:
+        """
+        Build the cache key of a call.
+        
+        Args:
+            model_id: The WatsonX model ID
+            params: Generation params
+            messages: Messages sent to the model (system prompt first, if any)
+            
+        Returns:
+            Hex digest identifying the call
+        """
+        system_prompt = ""
+        history = messages
+        if messages and messages[0].type == "system":
+            system_prompt, history = str(messages[0].content), messages[1:]
+        
+        payload = {
+            "model_id": model_id,
+            "params": params,
+            "system_prompt": hashlib.sha256(system_prompt.encode()).hexdigest(),
+            "history": [
+                [message.type, " ".join(str(message.content).split()).casefold()]
+                for message in history
+            ],
+        }
+        raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Get a cached response text, counting hits and misses."""
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    async def set(self, key: str, value: str) -> None:
+        """Store a response text."""
+        await self.backend.set(key, value, self.ttl_seconds)
+    
+    def stats(self) -> dict:
+        """Get cache metrics."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            **self.backend.stats(),
+        }
+
+
+# Singleton instance shared by all agent services in this process
+agent_response_cache = ResponseCache(
+    backend=InMemoryResponseCacheBackend(max_entries=settings.agent_response_cache_max_entries),
+    ttl_seconds=settings.agent_response_cache_ttl_seconds,
+    enabled=settings.agent_response_cache_enabled,
+)
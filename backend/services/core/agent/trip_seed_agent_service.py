@@ -6,9 +6,10 @@ required trip information (num_days, trip_mode, budget_band) and optional fields
 """
 import json
 import re
-from typing import Optional
+from typing import AsyncIterator, List, Optional
+from langchain_core.messages import BaseMessage
 from pydantic import BaseModel, Field
-from services.core.agent.base_agent_service import BaseAgentService
+from services.core.agent.base_agent_service import AgentStreamChunk, BaseAgentService
 from services.core.agent.conversation_service import ConversationService
 from core.models.trips.trip_mode import TripMode
 from core.models.trips.budget_band import BudgetBand
@@ -16,6 +17,67 @@ from core.models.trips.companions import Companions
 from prompts.trip_seed_agent import get_trip_seed_agent_prompt
 
 
+# Common ways users describe each budget band, mapped to enum values
+BUDGET_BAND_MAPPINGS = {
+    "relaxed": "relaxed",
+    "budget": "relaxed",
+    "budget_friendly": "relaxed",
+    "budget-friendly": "relaxed",
+    "budget conscious": "relaxed",
+    "budget-conscious": "relaxed",
+    "cheap": "relaxed",
+    "affordable": "relaxed",
+    "economy": "relaxed",
+    "comfortable": "comfortable",
+    "mid-range": "comfortable",
+    "mid range": "comfortable",
+    "moderate": "comfortable",
+    "balanced": "comfortable",
+    "splurge": "splurge",
+    "premium": "splurge",
+    "luxury": "splurge",
+    "high-end": "splurge",
+    "high end": "splurge",
+    "expensive": "splurge",
+}
+
+# Common ways users describe each trip mode, mapped to enum values
+TRIP_MODE_MAPPINGS = {
+    "local_hub": "local_hub",
+    "local hub": "local_hub",
+    "localhub": "local_hub",
+    "hub": "local_hub",
+    "single location": "local_hub",
+    "one place": "local_hub",
+    "road_trip": "road_trip",
+    "roadtrip": "road_trip",
+    "road trip": "road_trip",
+    "traveling": "road_trip",
+    "multiple locations": "road_trip",
+}
+
+# Common ways users describe who's traveling, mapped to enum values
+COMPANIONS_MAPPINGS = {
+    "solo": "solo",
+    "alone": "solo",
+    "just me": "solo",
+    "by myself": "solo",
+    "couple": "couple",
+    "partner": "couple",
+    "with my partner": "couple",
+    "my partner": "couple",
+    "family": "family",
+    "with family": "family",
+    "my family": "family",
+    "friends": "friends",
+    "with friends": "friends",
+    "my friends": "friends",
+}
+
+# Recovers the user's message from the prompt built by _build_enhanced_prompt
+USER_MESSAGE_PATTERN = re.compile(r"User Message: (.*?)\n\nPlease respond", re.DOTALL)
+
+
 class TripSeedExtractedData(BaseModel):
     """Extracted trip seed data from user conversation."""
     num_days: Optional[int] = Field(None, description="Number of days for the trip")
@@ -92,30 +154,7 @@ class TripSeedAgentService(BaseAgentService[TripSeedAgentResponse]):
         value_lower = value.lower().strip()
         
         # Map common variations to enum values
-        budget_mappings = {
-            "relaxed": "relaxed",
-            "budget": "relaxed",
-            "budget_friendly": "relaxed",
-            "budget-friendly": "relaxed",
-            "budget conscious": "relaxed",
-            "budget-conscious": "relaxed",
-            "cheap": "relaxed",
-            "affordable": "relaxed",
-            "economy": "relaxed",
-            "comfortable": "comfortable",
-            "mid-range": "comfortable",
-            "mid range": "comfortable",
-            "moderate": "comfortable",
-            "balanced": "comfortable",
-            "splurge": "splurge",
-            "premium": "splurge",
-            "luxury": "splurge",
-            "high-end": "splurge",
-            "high end": "splurge",
-            "expensive": "splurge",
-        }
-        
-        normalized = budget_mappings.get(value_lower, value_lower)
+        normalized = BUDGET_BAND_MAPPINGS.get(value_lower, value_lower)
         
         # Validate it's a valid enum value, fallback to "comfortable" if not
         valid_values = {"relaxed", "comfortable", "splurge"}
@@ -132,21 +171,7 @@ class TripSeedAgentService(BaseAgentService[TripSeedAgentResponse]):
         value_lower = value.lower().strip()
         
         # Map common variations to enum values
-        mode_mappings = {
-            "local_hub": "local_hub",
-            "local hub": "local_hub",
-            "localhub": "local_hub",
-            "hub": "local_hub",
-            "single location": "local_hub",
-            "one place": "local_hub",
-            "road_trip": "road_trip",
-            "roadtrip": "road_trip",
-            "road trip": "road_trip",
-            "traveling": "road_trip",
-            "multiple locations": "road_trip",
-        }
-        
-        normalized = mode_mappings.get(value_lower, value_lower)
+        normalized = TRIP_MODE_MAPPINGS.get(value_lower, value_lower)
         
         # Validate it's a valid enum value, fallback to "local_hub" if not
         valid_values = {"local_hub", "road_trip"}
@@ -163,24 +188,7 @@ class TripSeedAgentService(BaseAgentService[TripSeedAgentResponse]):
         value_lower = value.lower().strip()
         
         # Map common variations to enum values
-        companions_mappings = {
-            "solo": "solo",
-            "alone": "solo",
-            "just me": "solo",
-            "by myself": "solo",
-            "couple": "couple",
-            "partner": "couple",
-            "with my partner": "couple",
-            "my partner": "couple",
-            "family": "family",
-            "with family": "family",
-            "my family": "family",
-            "friends": "friends",
-            "with friends": "friends",
-            "my friends": "friends",
-        }
-        
-        normalized = companions_mappings.get(value_lower, value_lower)
+        normalized = COMPANIONS_MAPPINGS.get(value_lower, value_lower)
         
         # Validate it's a valid enum value, fallback to "solo" if not
         valid_values = {"solo", "couple", "family", "friends"}
@@ -268,6 +276,44 @@ class TripSeedAgentService(BaseAgentService[TripSeedAgentResponse]):
             f"Could not parse response as TripSeedAgentResponse: {response_text[:200]}"
         )
     
+    def fake_response(self, messages: List[BaseMessage]) -> str:
+        """
+        Build a schema-valid reply for the local fake model.
+        
+        Fields are extracted from the user's message with the rule-based
+        extractor, so load tests exercise the same TripSeed updates as real
+        conversations.
+        """
+        # Imported here: the fast path module imports this one
+        from services.core.agent.trip_seed_fast_path import MISSING_FIELD_QUESTIONS, trip_seed_fast_path
+        
+        prompt = str(messages[-1].content) if messages else ""
+        match = USER_MESSAGE_PATTERN.search(prompt)
+        user_message = match.group(1) if match else prompt
+        
+        extracted = trip_seed_fast_path.extract(user_message) or TripSeedExtractedData()
+        missing = [
+            field for field in ["num_days", "trip_mode", "budget_band"]
+            if getattr(extracted, field) is None
+        ]
+        
+        if not missing:
+            response_text = "Wonderful, that's everything I need to start planning your Michigan trip!"
+        elif len(missing) < 3:
+            response_text = f"Great, I've noted that! {MISSING_FIELD_QUESTIONS[missing[0]]}"
+        else:
+            response_text = (
+                "That sounds like a lovely idea for a Michigan getaway! "
+                f"{MISSING_FIELD_QUESTIONS[missing[0]]}"
+            )
+        
+        return json.dumps({
+            "response_text": response_text,
+            "extracted_data": extracted.model_dump(mode="json", exclude_none=True),
+            "is_complete": not missing,
+            "missing_fields": missing,
+        })
+    
     async def process_with_trip_seed_state(
         self,
         user_message: str,
@@ -279,7 +325,7 @@ class TripSeedAgentService(BaseAgentService[TripSeedAgentResponse]):
         Process a user message with full TripSeed state context.
         
         This is the main method for the Trip Seed Agent. It:
-        1. Updates system prompt with current TripSeed state
+        1. Builds this call's system prompt from the current TripSeed state
         2. Loads conversation history
         3. Processes with LLM
         4. Validates completion status
@@ -294,29 +340,72 @@ class TripSeedAgentService(BaseAgentService[TripSeedAgentResponse]):
         Returns:
             TripSeedAgentResponse with conversational response and extracted data
         """
-        # Update system prompt with current state (dynamically injected)
-        self.system_prompt = get_trip_seed_agent_prompt(trip_seed_state=trip_seed_state)
-        
-        # Create enhanced prompt that includes user message
-        enhanced_prompt = f"""User Message: {user_message}
-
-Please respond with a JSON object containing:
-1. "response_text": Your warm, friendly conversational response
-2. "extracted_data": Any new trip information you extracted (only include fields that were mentioned)
-3. "is_complete": true if all required fields (num_days, trip_mode, budget_band) are now filled, false otherwise
-4. "missing_fields": List of required field names still needed (e.g., ["budget_band"])
-"""
-        
         # Process with conversation history
         # Pass original_user_message so it saves the actual user message, not the enhanced prompt
+        # The state goes into this call's system prompt; the agent instance is shared across requests
         response = await self.process(
-            prompt=enhanced_prompt,
+            prompt=self._build_enhanced_prompt(user_message),
             user_id=user_id,
             conversation_id=conversation_id,
             use_history=True,
             original_user_message=user_message,
+            system_prompt=get_trip_seed_agent_prompt(trip_seed_state=trip_seed_state),
         )
         
+        return self._apply_trip_seed_state(response, trip_seed_state)
+    
+    async def process_with_trip_seed_state_stream(
+        self,
+        user_message: str,
+        conversation_id: int,
+        trip_seed_state: dict,
+        user_id: Optional[int] = None,
+    ) -> AsyncIterator[AgentStreamChunk[TripSeedAgentResponse]]:
+        """
+        Streaming variant of `process_with_trip_seed_state`.
+        
+        Yields the raw JSON reply chunk by chunk as the model generates it; the
+        final chunk carries the parsed TripSeedAgentResponse with is_complete
+        and missing_fields validated against the actual state.
+        
+        Args:
+            user_message: The user's current message
+            conversation_id: ID of the conversation
+            trip_seed_state: Dict with current TripSeed field values (can include None for missing)
+            user_id: Optional user ID for validation
+            
+        Yields:
+            AgentStreamChunk objects
+        """
+        async for chunk in self.process_stream(
+            prompt=self._build_enhanced_prompt(user_message),
+            user_id=user_id,
+            conversation_id=conversation_id,
+            use_history=True,
+            original_user_message=user_message,
+            system_prompt=get_trip_seed_agent_prompt(trip_seed_state=trip_seed_state),
+        ):
+            if chunk.response is not None:
+                chunk.response = self._apply_trip_seed_state(chunk.response, trip_seed_state)
+            yield chunk
+    
+    def _build_enhanced_prompt(self, user_message: str) -> str:
+        """Wrap the user's message with the JSON reply instructions."""
+        return f"""User Message: {user_message}
+
+Please respond with a JSON object containing:
+1. "response_text": Your warm, friendly conversational response
+2. "extracted_data": Any new trip information you extracted (only include fields that were mentioned)
+3. "is_complete": true if all required fields (num_days, trip_mode, budget_band) are now filled, false otherwise
+4. "missing_fields": List of required field names still needed (e.g., ["budget_band"])
+"""
+    
+    def _apply_trip_seed_state(
+        self,
+        response: TripSeedAgentResponse,
+        trip_seed_state: dict,
+    ) -> TripSeedAgentResponse:
+        """Recompute is_complete and missing_fields from the actual state."""
         # Validate and update is_complete based on actual state
         response.is_complete = self._check_completion(
             trip_seed_state,
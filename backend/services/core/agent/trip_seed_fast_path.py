@@ -0,0 +1,291 @@
+"""
+Rule-based fast path for the Trip Seed Agent.
+
+Many turns are short answers such as "3 days, road trip, budget-friendly".
+TripSeedFastPath parses them with the same vocabularies the agent uses to
+normalize model output (plus number parsing for num_days). When a message
+fills every missing required field unambiguously, it answers with a
+templated reply and the model call is skipped; anything else (questions,
+negations, alternatives, long or conflicting messages) goes to the model.
+
+A message is only handled if it is made up entirely of recognised phrases
+and FILLER_WORDS. Any other word (a place such as "from Detroit", or details
+like "my 3 kids") may carry information the rules would silently drop, so
+such messages go to the model too.
+
+Later turns are answered too: the TripSeed records which required fields
+the user has actually given, and the rest are reported as missing even
+though the row holds placeholder values for them.
+"""
+import re
+from typing import Dict, Optional
+from core.config import settings
+from core.models.trips.budget_band import BudgetBand
+from core.models.trips.companions import Companions
+from core.models.trips.trip_mode import TripMode
+from services.core.agent.trip_seed_agent_service import (
+    BUDGET_BAND_MAPPINGS,
+    COMPANIONS_MAPPINGS,
+    TRIP_MODE_MAPPINGS,
+    TripSeedAgentResponse,
+    TripSeedExtractedData,
+)
+
+REQUIRED_FIELDS = ["num_days", "trip_mode", "budget_band"]
+
+# Longer messages usually carry more than the fields (places, wishes) and go to the model
+MAX_MESSAGE_LENGTH = 120
+
+MAX_NUM_DAYS = 30
+
+# Vocabulary entries too vague to act on without the model
+AMBIGUOUS_PHRASES = {"hub", "traveling"}
+
+# Questions, negations and alternatives need the model to interpret
+UNCERTAIN_PATTERN = re.compile(
+    r"\?|\b(?:not|no|don't|dont|never|instead|or|maybe|unless|but|what|which|how)\b|n't\b"
+)
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14,
+}
+
+# Words a simple answer may contain besides the recognised phrases. Place
+# prepositions other than "in" (needed for "a week in one place") are left out.
+FILLER_WORDS = {
+    "a", "an", "and", "the", "in", "with", "for", "trip", "please", "just",
+    "ok", "okay", "sure", "yes", "yeah", "sounds", "good", "great", "perfect",
+}
+
+WORD_PATTERN = re.compile(r"[\w'-]+")
+
+NUM_DAYS_PATTERN = re.compile(
+    r"\b(\d{1,2}|" + "|".join(NUMBER_WORDS) + r")[\s-]*days?\b"
+    r"|\b(a|one)[\s-]+week\b"
+)
+
+TRIP_MODE_LABELS = {
+    TripMode.LOCAL_HUB: "trip from a home base",
+    TripMode.ROAD_TRIP: "road trip",
+}
+
+BUDGET_BAND_LABELS = {
+    BudgetBand.RELAXED: "relaxed",
+    BudgetBand.COMFORTABLE: "comfortable",
+    BudgetBand.SPLURGE: "splurge",
+}
+
+# Follow-up question per missing field, used by the fallback reply
+MISSING_FIELD_QUESTIONS = {
+    "num_days": "How many days would you like your trip to be?",
+    "trip_mode": "Would you like a road trip, or to explore from one home base?",
+    "budget_band": "What budget are you thinking: relaxed, comfortable or splurge?",
+}
+
+COMPANIONS_LABELS = {
+    Companions.SOLO: " solo",
+    Companions.COUPLE: " for two",
+    Companions.FAMILY: " with the family",
+    Companions.FRIENDS: " with friends",
+}
+
+
+def _phrase_pattern(mappings: Dict[str, str]) -> re.Pattern:
+    """Match any vocabulary phrase as a whole word, longest phrases first."""
+    phrases = sorted(
+        (phrase for phrase in mappings if phrase not in AMBIGUOUS_PHRASES),
+        key=len,
+        reverse=True,
+    )
+    return re.compile(
+        r"(?<![\w-])(" + "|".join(re.escape(phrase) for phrase in phrases) + r")(?![\w-])"
+    )
+
+
+class TripSeedFastPath:
+    """Deterministic extractor and templated responder for simple turns."""
+    
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize the fast path.
+        
+        Args:
+            enabled: Whether `respond` may answer without the model
+        """
+        self.enabled = enabled
+        self._budget_pattern = _phrase_pattern(BUDGET_BAND_MAPPINGS)
+        self._mode_pattern = _phrase_pattern(TRIP_MODE_MAPPINGS)
+        self._companions_pattern = _phrase_pattern(COMPANIONS_MAPPINGS)
+        self.attempts = 0
+        self.hits = 0
+        self.fallbacks = 0
+    
+    def extract(self, message: str) -> Optional[TripSeedExtractedData]:
+        """
+        Extract trip seed fields from a message without the model.
+        
+        Args:
+            message: The user's message
+            
+        Returns:
+            Extracted data, or None if the message is ambiguous (a question,
+            a negation, conflicting values, words the rules don't recognise,
+            or too long to trust the rules)
+        """
+        text = " ".join(message.lower().split())
+        if not text or len(text) > MAX_MESSAGE_LENGTH or UNCERTAIN_PATTERN.search(text):
+            return None
+        
+        num_days = self._match_num_days(text)
+        budget_band = self._match_single(self._budget_pattern, BUDGET_BAND_MAPPINGS, text)
+        trip_mode = self._match_single(self._mode_pattern, TRIP_MODE_MAPPINGS, text)
+        companions = self._match_single(self._companions_pattern, COMPANIONS_MAPPINGS, text)
+        if False in (num_days, budget_band, trip_mode, companions):
+            return None
+        
+        residue = text
+        for pattern in (NUM_DAYS_PATTERN, self._budget_pattern, self._mode_pattern, self._companions_pattern):
+            residue = pattern.sub(" ", residue)
+        if any(word not in FILLER_WORDS for word in WORD_PATTERN.findall(residue)):
+            return None
+        
+        return TripSeedExtractedData(
+            num_days=num_days,
+            trip_mode=trip_mode,
+            budget_band=budget_band,
+            companions=companions,
+        )
+    
+    def respond(
+        self,
+        message: str,
+        trip_seed_state: dict,
+    ) -> Optional[TripSeedAgentResponse]:
+        """
+        Answer a turn without the model if the message completes the TripSeed.
+        
+        Args:
+            message: The user's message
+            trip_seed_state: Current TripSeed state (None or missing for unset fields)
+            
+        Returns:
+            A complete TripSeedAgentResponse, or None if the model is needed
+        """
+        if not self.enabled:
+            return None
+        
+        missing = [field for field in REQUIRED_FIELDS if trip_seed_state.get(field) is None]
+        if not missing:
+            # Nothing left to collect; the user is chatting and needs a real reply
+            return None
+        
+        self.attempts += 1
+        extracted = self.extract(message)
+        if extracted is None or any(getattr(extracted, field) is None for field in missing):
+            return None
+        
+        self.hits += 1
+        return TripSeedAgentResponse(
+            response_text=self._render_response(extracted, trip_seed_state),
+            extracted_data=extracted,
+            is_complete=True,
+            missing_fields=[],
+        )
+    
+    def fallback(
+        self,
+        message: str,
+        trip_seed_state: dict,
+    ) -> Optional[TripSeedAgentResponse]:
+        """
+        Answer a turn without the model while the model is unavailable.
+        
+        Unlike `respond`, a partial answer is accepted: whatever the rules can
+        extract is kept and the reply asks for the next missing field.
+        
+        Args:
+            message: The user's message
+            trip_seed_state: Current TripSeed state (None or missing for unset fields)
+            
+        Returns:
+            A TripSeedAgentResponse, or None if nothing could be extracted
+        """
+        extracted = self.extract(message)
+        if extracted is None or not extracted.model_dump(exclude_none=True):
+            return None
+        
+        missing = [
+            field for field in REQUIRED_FIELDS
+            if getattr(extracted, field) is None and trip_seed_state.get(field) is None
+        ]
+        if missing:
+            response_text = f"Got it, I've noted that. {MISSING_FIELD_QUESTIONS[missing[0]]}"
+        else:
+            response_text = self._render_response(extracted, trip_seed_state)
+        
+        self.fallbacks += 1
+        return TripSeedAgentResponse(
+            response_text=response_text,
+            extracted_data=extracted,
+            is_complete=not missing,
+            missing_fields=missing,
+        )
+    
+    def stats(self) -> dict:
+        """Get attempt, hit and fallback counts and the hit rate."""
+        return {
+            "enabled": self.enabled,
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.attempts if self.attempts else 0.0,
+            "fallbacks": self.fallbacks,
+        }
+    
+    def _match_num_days(self, text: str):
+        """Parse the number of days; None if absent, False if conflicting or out of range."""
+        values = set()
+        for match in NUM_DAYS_PATTERN.finditer(text):
+            if match.group(1):
+                number = match.group(1)
+                values.add(int(number) if number.isdigit() else NUMBER_WORDS[number])
+            else:
+                values.add(7)
+        
+        if not values:
+            return None
+        if len(values) > 1:
+            return False
+        num_days = values.pop()
+        return num_days if 1 <= num_days <= MAX_NUM_DAYS else False
+    
+    def _match_single(self, pattern: re.Pattern, mappings: Dict[str, str], text: str):
+        """Map vocabulary phrases to one enum value; None if absent, False if conflicting."""
+        values = {mappings[match.group(1)] for match in pattern.finditer(text)}
+        if not values:
+            return None
+        if len(values) > 1:
+            return False
+        return values.pop()
+    
+    def _render_response(
+        self,
+        extracted: TripSeedExtractedData,
+        trip_seed_state: dict,
+    ) -> str:
+        """Confirm the collected trip details in a friendly sentence."""
+        num_days = extracted.num_days or trip_seed_state.get("num_days")
+        trip_mode = extracted.trip_mode or TripMode(trip_seed_state["trip_mode"])
+        budget_band = extracted.budget_band or BudgetBand(trip_seed_state["budget_band"])
+        companions = COMPANIONS_LABELS[extracted.companions] if extracted.companions else ""
+        
+        return (
+            f"Perfect! A {num_days}-day {TRIP_MODE_LABELS[trip_mode]}{companions} "
+            f"on a {BUDGET_BAND_LABELS[budget_band]} budget. I have everything I need "
+            f"to start planning your Michigan adventure!"
+        )
+
+
+# Singleton instance shared by all TripSeedService instances (keeps process-wide hit rate)
+trip_seed_fast_path = TripSeedFastPath(enabled=settings.trip_seed_fast_path_enabled)
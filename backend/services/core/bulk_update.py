@@ -0,0 +1,90 @@
+"""
+Set-based multi-row updates for Tortoise models.
+
+`Model.bulk_update` in Tortoise 0.20 passes raw Python values into the
+generated SQL (enum members are rendered as bare identifiers) and does not
+touch `auto_now` fields. `bulk_update_rows` writes any number of rows with a
+single parameterized statement instead:
+
+    UPDATE table
+    SET col = CASE WHEN id = $1 THEN $2 ... ELSE col END, ...
+    WHERE id IN (...)
+
+Values go through the model's own field conversion, so enums, foreign key
+ids and datetimes are stored exactly as `save()` would store them.
+"""
+from typing import Any, Dict, List, Optional, Type
+from pypika import Case
+from pypika.functions import Cast
+from tortoise import timezone
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.models import Model
+
+
+async def bulk_update_rows(
+    model: Type[Model],
+    rows: Dict[int, Dict[str, Any]],
+    using_db: Optional[BaseDBAsyncClient] = None,
+) -> int:
+    """
+    Update several rows of a model in one UPDATE statement.
+    
+    Fields missing from a row keep their current value. If the model has an
+    `updated_at` field it is set to the current time on every updated row.
+    
+    Args:
+        model: Tortoise model class
+        rows: Mapping of primary key to {field name: new value}
+        using_db: Optional connection (e.g. from in_transaction)
+    
+    Returns:
+        Number of rows updated
+    """
+    if not rows:
+        return 0
+    
+    db = using_db or model._meta.db
+    executor = db.executor_class(model=model, db=db)
+    table = model._meta.basetable
+    pk_column = table[model._meta.db_pk_column]
+    dialect = db.schema_generator.DIALECT
+    
+    field_names: List[str] = []
+    for values in rows.values():
+        for field_name in values:
+            if field_name not in field_names:
+                field_names.append(field_name)
+    
+    query = db.query_class.update(table)
+    params: List[Any] = []
+    
+    def parameter(value: Any, field_name: str) -> Any:
+        term = executor.parameter(len(params))
+        params.append(value)
+        if dialect == "postgres":
+            # Untyped CASE parameters need an explicit type on Postgres
+            sql_type = model._meta.fields_map[field_name].get_for_dialect(dialect, "SQL_TYPE")
+            return Cast(term, sql_type)
+        return term
+    
+    for field_name in field_names:
+        column = table[model._meta.fields_db_projection[field_name]]
+        to_db_value = executor.column_map[field_name]
+        case = Case()
+        for pk, values in rows.items():
+            if field_name in values:
+                case = case.when(
+                    pk_column == parameter(pk, model._meta.pk_attr),
+                    parameter(to_db_value(values[field_name], None), field_name),
+                )
+        query = query.set(column, case.else_(column))
+    
+    if "updated_at" in model._meta.fields_db_projection and "updated_at" not in field_names:
+        query = query.set(
+            table[model._meta.fields_db_projection["updated_at"]],
+            parameter(timezone.now(), "updated_at"),
+        )
+    
+    query = query.where(pk_column.isin([parameter(pk, model._meta.pk_attr) for pk in rows]))
+    
+    return (await db.execute_query(str(query), params))[0]
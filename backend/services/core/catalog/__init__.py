@@ -0,0 +1,14 @@
+"""In-memory attraction catalog package."""
+from services.core.catalog.attraction_catalog import (
+    AttractionCatalog,
+    CatalogEntry,
+    attraction_catalog,
+)
+from services.core.catalog.spatial_index import SpatialIndex
+
+__all__ = [
+    "AttractionCatalog",
+    "CatalogEntry",
+    "attraction_catalog",
+    "SpatialIndex",
+]
@@ -0,0 +1,246 @@
+"""
+In-memory attraction catalog with vectorized vibe matching.
+
+The catalog loads attractions (with their cities), vibes and attraction/vibe
+strengths once and keeps them as a dense attraction x vibe NumPy matrix.
+Scoring "these weighted vibes, top-k" is then a single matrix-vector product
+followed by argpartition, instead of a per-request database fan-out. The
+same snapshot carries a spatial index for nearest-attraction queries.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from core.config import settings
+from core.models.places.attraction import Attraction
+from core.models.places.attraction_vibe import AttractionVibe
+from core.models.places.vibe import Vibe
+from services.core.catalog.spatial_index import SpatialIndex
+
+
+@dataclass
+class CatalogEntry:
+    """An attraction returned from a catalog query."""
+    attraction: Attraction
+    vibes: List[Tuple[Vibe, float]] = field(default_factory=list)  # (vibe, strength) pairs
+    score: Optional[float] = None  # Vibe match score (vibe queries)
+    distance_km: Optional[float] = None  # Distance from the query point (spatial queries)
+
+
+class _CatalogSnapshot:
+    """Immutable arrays built from a single catalog load."""
+    
+    def __init__(
+        self,
+        attractions: List[Attraction],
+        vibes: List[Vibe],
+        links: List[Tuple[int, int, float]],
+    ):
+        self.attractions = attractions
+        self.row_by_attraction_id = {a.id: row for row, a in enumerate(attractions)}
+        self.vibes_by_id = {v.id: v for v in vibes}
+        self.column_by_vibe_id = {v.id: col for col, v in enumerate(vibes)}
+        self.vibe_ids = [v.id for v in vibes]
+        
+        shape = (len(attractions), len(vibes))
+        self.strengths = np.zeros(shape, dtype=np.float32)
+        self.present = np.zeros(shape, dtype=bool)
+        
+        for attraction_id, vibe_id, strength in links:
+            row = self.row_by_attraction_id.get(attraction_id)
+            col = self.column_by_vibe_id.get(vibe_id)
+            if row is None or col is None:
+                continue
+            self.strengths[row, col] = float(strength)
+            self.present[row, col] = True
+        
+        self.spatial_index = SpatialIndex(
+            np.array([float(a.latitude) for a in attractions], dtype=np.float64),
+            np.array([float(a.longitude) for a in attractions], dtype=np.float64),
+        )
+        
+        self.loaded_at = time.monotonic()
+    
+    def row_vibes(self, row: int, columns: Optional[List[int]] = None) -> List[Tuple[Vibe, float]]:
+        """Get (vibe, strength) pairs for a row, optionally restricted to some columns."""
+        if columns is None:
+            columns = np.flatnonzero(self.present[row]).tolist()
+        return [
+            (self.vibes_by_id[self.vibe_ids[col]], float(self.strengths[row, col]))
+            for col in columns
+            if self.present[row, col]
+        ]
+
+
+class AttractionCatalog:
+    """
+    Process-wide, lazily loaded attraction catalog.
+    
+    Call `invalidate()` (or `await refresh()`) after editing attractions,
+    vibes or attraction vibes so the next query sees the change. Snapshots
+    also expire after ATTRACTION_CATALOG_TTL_SECONDS so edits made by other
+    processes (e.g. seed scripts) show up without a restart.
+    """
+    
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        """
+        Initialize an empty catalog.
+        
+        Args:
+            ttl_seconds: Snapshot lifetime in seconds (defaults to settings; 0 disables expiry)
+        """
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.attraction_catalog_ttl_seconds
+        )
+        self._snapshot: Optional[_CatalogSnapshot] = None
+        self._stale = True
+        self._lock = asyncio.Lock()
+        self.load_count = 0
+    
+    def _is_fresh(self) -> bool:
+        """Check whether the current snapshot can still be served."""
+        if self._snapshot is None or self._stale:
+            return False
+        if self.ttl_seconds and time.monotonic() - self._snapshot.loaded_at > self.ttl_seconds:
+            return False
+        return True
+    
+    async def _load(self) -> _CatalogSnapshot:
+        """Load the full catalog from the database (3 queries plus the city prefetch)."""
+        attractions = await Attraction.all().prefetch_related('city').order_by('id')
+        vibes = await Vibe.all().order_by('id')
+        links = await AttractionVibe.all().values_list('attraction_id', 'vibe_id', 'strength')
+        return _CatalogSnapshot(attractions, vibes, links)
+    
+    async def get_snapshot(self) -> _CatalogSnapshot:
+        """
+        Get the current snapshot, loading it first if missing or expired.
+        
+        Returns:
+            The loaded catalog snapshot
+        """
+        if self._is_fresh():
+            return self._snapshot
+        
+        async with self._lock:
+            # Another coroutine may have reloaded while we waited for the lock
+            if not self._is_fresh():
+                self._snapshot = await self._load()
+                self._stale = False
+                self.load_count += 1
+            return self._snapshot
+    
+    async def refresh(self) -> None:
+        """Reload the catalog immediately."""
+        self.invalidate()
+        await self.get_snapshot()
+    
+    def invalidate(self) -> None:
+        """Mark the catalog stale so the next query reloads it."""
+        self._stale = True
+    
+    async def top_k(
+        self,
+        vibe_weights: Dict[int, float],
+        k: Optional[int] = None,
+    ) -> List[CatalogEntry]:
+        """
+        Score attractions by weighted vibes and return the best matches.
+        
+        An attraction is a candidate if it has at least one of the requested
+        vibes. Its score is the sum of attraction vibe strength times the
+        requested weight over the requested vibes.
+        
+        Args:
+            vibe_weights: Mapping of vibe ID to weight
+            k: Optional number of results to return (all candidates if None)
+        
+        Returns:
+            List of CatalogEntry objects, best match first
+        """
+        snapshot = await self.get_snapshot()
+        
+        columns = [snapshot.column_by_vibe_id[v] for v in vibe_weights if v in snapshot.column_by_vibe_id]
+        if not columns or not snapshot.attractions:
+            return []
+        
+        weights = np.zeros(len(snapshot.vibe_ids), dtype=np.float32)
+        for vibe_id, weight in vibe_weights.items():
+            col = snapshot.column_by_vibe_id.get(vibe_id)
+            if col is not None:
+                weights[col] = weight
+        
+        scores = snapshot.strengths @ weights
+        candidates = np.flatnonzero(snapshot.present[:, columns].any(axis=1))
+        if candidates.size == 0:
+            return []
+        
+        candidate_scores = scores[candidates]
+        if k and k < candidates.size:
+            # Narrow to the candidates scoring at least the k-th best score,
+            # keeping every candidate tied with it
+            kth_score = -np.partition(-candidate_scores, k - 1)[k - 1]
+            pool = np.flatnonzero(candidate_scores >= kth_score)
+        else:
+            pool = np.arange(candidates.size)
+        # Best score first, ties in catalog (id) order, as the database query ordered them
+        top = pool[np.lexsort((candidates[pool], -candidate_scores[pool]))][:k or None]
+        
+        results = []
+        for idx in top:
+            row = candidates[idx]
+            results.append(
+                CatalogEntry(
+                    attraction=snapshot.attractions[row],
+                    vibes=snapshot.row_vibes(row, columns),
+                    score=float(candidate_scores[idx]),
+                )
+            )
+        
+        return results
+    
+    async def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        radius_km: Optional[float] = None,
+    ) -> List[CatalogEntry]:
+        """
+        Find the attractions nearest to a point.
+        
+        Args:
+            latitude: Query latitude in degrees
+            longitude: Query longitude in degrees
+            k: Maximum number of results
+            radius_km: Optional maximum distance in kilometres
+            
+        Returns:
+            List of CatalogEntry objects (with all vibes), nearest first
+        """
+        snapshot = await self.get_snapshot()
+        
+        return [
+            CatalogEntry(
+                attraction=snapshot.attractions[row],
+                vibes=snapshot.row_vibes(row),
+                distance_km=distance_km,
+            )
+            for row, distance_km in snapshot.spatial_index.nearest(latitude, longitude, k, radius_km)
+        ]
+    
+    def stats(self) -> dict:
+        """Get catalog metrics."""
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "attractions": len(snapshot.attractions) if snapshot else 0,
+            "vibes": len(snapshot.vibe_ids) if snapshot else 0,
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 1) if snapshot else None,
+            "load_count": self.load_count,
+        }
+
+
+# Singleton instance shared by all requests in this process
+attraction_catalog = AttractionCatalog()
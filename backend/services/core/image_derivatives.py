@@ -0,0 +1,217 @@
+"""
+Thumbnail and medium-size derivatives of uploaded trip photos.
+
+Decoding and resizing a phone photo takes tens to hundreds of milliseconds of
+CPU, so it runs in a process pool and never on the event loop. Each size is
+a JPEG whose longest edge is at most the configured size (never upscaled),
+with the EXIF orientation applied and transparency flattened onto white.
+
+Pillow is needed to render derivatives. Without it (or with
+IMAGE_DERIVATIVES_ENABLED=false) the pipeline reports itself unavailable and
+uploads simply store the original.
+"""
+import asyncio
+import importlib.util
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from core.config import settings
+
+# Every derivative is encoded as JPEG
+DERIVATIVE_CONTENT_TYPE = "image/jpeg"
+DERIVATIVE_EXTENSION = "jpg"
+
+# Upload types Pillow decodes without extra plugins
+SUPPORTED_CONTENT_TYPES = {
+    "image/jpeg",
+    "image/jpg",
+    "image/png",
+    "image/webp",
+    "image/gif",
+    "image/bmp",
+    "image/tiff",
+}
+
+# EXIF orientations that swap width and height
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+@dataclass
+class RenderedVariant:
+    """One encoded derivative."""
+    content: bytes
+    width: int
+    height: int
+
+
+@dataclass
+class RenderedDerivatives:
+    """Original dimensions (as displayed) and the encoded derivatives by size name."""
+    width: int
+    height: int
+    variants: Dict[str, RenderedVariant] = field(default_factory=dict)
+
+
+def render_derivatives(content: bytes, max_edges: Dict[str, int], quality: int) -> RenderedDerivatives:
+    """
+    Decode an image and encode one JPEG per size.
+    
+    Runs in a worker process, so it must stay a picklable top-level function.
+    
+    Args:
+        content: Original image file content
+        max_edges: Longest edge in pixels by size name
+        quality: JPEG quality (1-95)
+        
+    Returns:
+        RenderedDerivatives for the image
+    """
+    from PIL import Image as PILImage, ImageOps
+    
+    with PILImage.open(io.BytesIO(content)) as source:
+        width, height = source.size
+        if source.getexif().get(0x0112) in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        
+        # Let JPEG decode at a reduced scale that still covers the largest size
+        largest = max(max_edges.values())
+        source.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(source)
+        
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = PILImage.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        
+        result = RenderedDerivatives(width=width, height=height)
+        # Largest first, so every smaller size is resized from the previous one
+        for name, max_edge in sorted(max_edges.items(), key=lambda item: -item[1]):
+            image = image.copy()
+            image.thumbnail((max_edge, max_edge), PILImage.Resampling.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, format="JPEG", quality=quality, optimize=True, progressive=True)
+            result.variants[name] = RenderedVariant(
+                content=output.getvalue(),
+                width=image.width,
+                height=image.height,
+            )
+        
+        return result
+
+
+class ImageDerivativePipeline:
+    """Renders image derivatives in a shared process pool."""
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_edges: Optional[Dict[str, int]] = None,
+        max_source_bytes: Optional[int] = None,
+        quality: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        """
+        Initialize the pipeline; worker processes start on first use.
+        
+        Args:
+            max_workers: Worker processes (defaults to IMAGE_DERIVATIVE_WORKERS)
+            max_edges: Longest edge in pixels by size name
+                (defaults to the IMAGE_*_MAX_EDGE settings)
+            max_source_bytes: Largest original rendered; larger uploads only
+                store the original (defaults to IMAGE_DERIVATIVE_MAX_SOURCE_BYTES)
+            quality: JPEG quality (defaults to IMAGE_DERIVATIVE_JPEG_QUALITY)
+            enabled: Render derivatives at all (defaults to IMAGE_DERIVATIVES_ENABLED)
+        """
+        self.max_workers = max(max_workers or settings.image_derivative_workers, 1)
+        self.max_edges = max_edges or {
+            "medium": settings.image_medium_max_edge,
+            "thumbnail": settings.image_thumbnail_max_edge,
+        }
+        self.max_source_bytes = max_source_bytes or settings.image_derivative_max_source_bytes
+        self.quality = quality or settings.image_derivative_jpeg_quality
+        self.enabled = settings.image_derivatives_enabled if enabled is None else enabled
+        self.pillow_installed = importlib.util.find_spec("PIL") is not None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.rendered = 0
+        self.failed = 0
+        self.skipped = 0
+    
+    @property
+    def available(self) -> bool:
+        """Whether derivatives can be rendered."""
+        return self.enabled and self.pillow_installed
+    
+    def accepts(self, content_type: str) -> bool:
+        """Whether uploads of this content type get derivatives."""
+        return self.available and content_type.lower() in SUPPORTED_CONTENT_TYPES
+    
+    async def render(self, content: Optional[bytes]) -> Optional[RenderedDerivatives]:
+        """
+        Render the derivatives of an image in the process pool.
+        
+        Args:
+            content: Original image file content (None if it was too large to keep)
+            
+        Returns:
+            RenderedDerivatives, or None if the image was skipped or could not be decoded
+        """
+        if not self.available or not content or len(content) > self.max_source_bytes:
+            self.skipped += 1
+            return None
+        
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._get_executor(),
+                render_derivatives,
+                content,
+                self.max_edges,
+                self.quality,
+            )
+        except Exception as e:
+            print(f"Image derivatives failed: {type(e).__name__}: {e}")
+            self.failed += 1
+            return None
+        
+        self.rendered += 1
+        return result
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers don't inherit the event loop or open connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+    
+    def close(self) -> None:
+        """
+        Stop the worker processes.
+        
+        Call this on application shutdown.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def stats(self) -> dict:
+        """Get pipeline metrics."""
+        return {
+            "available": self.available,
+            "pillow_installed": self.pillow_installed,
+            "workers": self.max_workers,
+            "max_edges": self.max_edges,
+            "rendered": self.rendered,
+            "failed": self.failed,
+            "skipped": self.skipped,
+        }
+
+
+# Singleton instance shared by all requests in this process
+image_derivative_pipeline = ImageDerivativePipeline()
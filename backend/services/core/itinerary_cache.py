@@ -0,0 +1,133 @@
+"""
+Read-through cache for assembled trip itineraries.
+
+Entries hold the serialized TripDetailsResponse for a trip. Every itinerary
+mutation calls `invalidate(trip_id)`, which drops the trip's entry and
+records the invalidation, so a read that raced with a write can never
+repopulate the cache with stale data: readers take a version token before
+loading and `set` rejects a token older than the trip's last invalidation.
+
+Both the entries and the invalidation records are bounded LRUs. When an
+invalidation record is evicted, every token older than it is rejected
+(a stale-safe floor), so forgetting a trip never lets a stale load in.
+
+The cache is per process; with several workers each keeps its own copy and
+sees only its own invalidations.
+"""
+from collections import OrderedDict
+from typing import Optional
+from core.config import settings
+from dtos.trip_dto import TripDetailsResponse
+
+
+class ItineraryCache:
+    """Bounded LRU cache of serialized TripDetailsResponse objects."""
+    
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_entries: Maximum number of cached trips, and of remembered
+                invalidations (defaults to settings)
+        """
+        self.max_entries = max_entries if max_entries is not None else settings.itinerary_cache_max_entries
+        self._entries: "OrderedDict[int, str]" = OrderedDict()
+        # Clock value at each trip's last invalidation
+        self._invalidated: "OrderedDict[int, int]" = OrderedDict()
+        self._clock = 0
+        # Tokens older than this are rejected for every trip
+        self._floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def version(self, trip_id: int) -> int:
+        """
+        Get a version token to pass to `set` for an itinerary loaded from now on.
+        
+        Args:
+            trip_id: ID of the trip
+            
+        Returns:
+            Version token
+        """
+        return self._clock
+    
+    def get(self, trip_id: int) -> Optional[TripDetailsResponse]:
+        """
+        Get the cached itinerary for a trip.
+        
+        Args:
+            trip_id: ID of the trip
+            
+        Returns:
+            A fresh TripDetailsResponse copy, or None on a miss
+        """
+        raw = self._entries.get(trip_id)
+        if raw is None:
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(trip_id)
+        self.hits += 1
+        return TripDetailsResponse.model_validate_json(raw)
+    
+    def set(self, trip_id: int, details: TripDetailsResponse, version: int) -> None:
+        """
+        Store an itinerary loaded at a given version.
+        
+        Args:
+            trip_id: ID of the trip
+            details: Itinerary to cache
+            version: Token returned by `version()` before the itinerary was loaded
+        """
+        if self.max_entries <= 0 or version < self._floor or version < self._invalidated.get(trip_id, 0):
+            # The trip changed while it was being loaded; don't cache stale data
+            return
+        
+        self._entries[trip_id] = details.model_dump_json()
+        self._entries.move_to_end(trip_id)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, trip_id: int) -> None:
+        """Drop a trip's cached itinerary and reject loads that started before now."""
+        self._clock += 1
+        self._entries.pop(trip_id, None)
+        self._invalidated[trip_id] = self._clock
+        self._invalidated.move_to_end(trip_id)
+        self.invalidations += 1
+        
+        while len(self._invalidated) > max(self.max_entries, 1):
+            _, invalidated_at = self._invalidated.popitem(last=False)
+            self._floor = max(self._floor, invalidated_at)
+    
+    def clear(self) -> None:
+        """Drop every cached itinerary."""
+        self._clock += 1
+        self._entries.clear()
+        self._invalidated.clear()
+        self._floor = self._clock
+        self.invalidations += 1
+    
+    def stats(self) -> dict:
+        """Get cache metrics."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "tracked_invalidations": len(self._invalidated),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Singleton instance shared by all requests in this process
+itinerary_cache = ItineraryCache()
@@ -0,0 +1,84 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Listings are ordered newest first by (timestamp, id). A cursor encodes the
+(timestamp, id) of the last item of a page; the next page is every row that
+sorts strictly after it:
+
+    timestamp < cursor.timestamp OR (timestamp = cursor.timestamp AND id < cursor.id)
+
+which a composite (timestamp, id) index serves without scanning skipped rows,
+unlike OFFSET. Cursors are opaque to clients (URL-safe base64 JSON).
+"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple, TypeVar
+from tortoise.expressions import Q
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+
+MODEL = TypeVar("MODEL", bound=Model)
+
+
+def encode_cursor(timestamp: datetime, id: int) -> str:
+    """Encode the (timestamp, id) of a row as an opaque cursor."""
+    payload = json.dumps({"t": timestamp.isoformat(), "id": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+async def fetch_page(
+    query: QuerySet[MODEL],
+    timestamp_field: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[MODEL], Optional[str]]:
+    """
+    Fetch one page of a query ordered by (timestamp_field, id) descending.
+    
+    Args:
+        query: Filtered queryset to paginate
+        timestamp_field: Name of the timestamp field to order by (e.g. "created_at")
+        limit: Maximum number of rows to return (all remaining rows if None)
+        cursor: Cursor returned with the previous page (first page if None)
+    
+    Returns:
+        Tuple of (rows, cursor for the next page or None if this is the last page)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor:
+        after_timestamp, after_id = decode_cursor(cursor)
+        query = query.filter(
+            Q(**{f"{timestamp_field}__lt": after_timestamp})
+            | Q(**{timestamp_field: after_timestamp, "id__lt": after_id})
+        )
+    
+    query = query.order_by(f"-{timestamp_field}", "-id")
+    if limit is None:
+        return await query, None
+    
+    # Fetch one extra row to know whether another page exists
+    rows = await query.limit(limit + 1)
+    if len(rows) <= limit:
+        return rows, None
+    
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, timestamp_field), last.id)
@@ -0,0 +1,142 @@
+"""
+Expiry-aware cache of presigned image URLs.
+
+Presigned URLs are signed locally (no S3 request), but listing a trip day
+still used to sign and save every image on every call. The cache keeps each
+key's URL until it is within `refresh_margin_seconds` of expiring, and also
+reuses the URL already stored on the Image row while it has time left, so a
+listing only signs (and persists) URLs that are about to expire.
+
+The expiry is read from the URL itself: `Expires` for query string signing
+(SigV2) or `X-Amz-Date` plus `X-Amz-Expires` for SigV4.
+"""
+import calendar
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from core.config import settings
+
+# Signs a URL for a key, valid for the given number of seconds
+Signer = Callable[[str, int], str]
+
+
+def presigned_url_expiry(url: Optional[str]) -> Optional[float]:
+    """
+    Get the expiry time of a presigned URL.
+    
+    Args:
+        url: Presigned URL
+        
+    Returns:
+        Expiry as a Unix timestamp, or None if the URL carries no expiry
+    """
+    if not url:
+        return None
+    
+    query = parse_qs(urlsplit(url).query)
+    try:
+        if "Expires" in query:
+            return float(query["Expires"][0])
+        if "X-Amz-Date" in query and "X-Amz-Expires" in query:
+            signed_at = time.strptime(query["X-Amz-Date"][0], "%Y%m%dT%H%M%SZ")
+            return calendar.timegm(signed_at) + float(query["X-Amz-Expires"][0])
+    except ValueError:
+        return None
+    return None
+
+
+class PresignedUrlCache:
+    """Bounded LRU cache of presigned URLs, refreshed shortly before they expire."""
+    
+    def __init__(
+        self,
+        expiration_seconds: Optional[int] = None,
+        refresh_margin_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            expiration_seconds: Lifetime of newly signed URLs (defaults to settings)
+            refresh_margin_seconds: Re-sign URLs with less time left than this
+                (defaults to settings)
+            max_entries: Maximum number of cached keys (defaults to settings)
+            clock: Wall clock returning Unix time
+        """
+        self.expiration_seconds = expiration_seconds or settings.presigned_url_expiration_seconds
+        self.refresh_margin_seconds = (
+            refresh_margin_seconds if refresh_margin_seconds is not None
+            else settings.presigned_url_refresh_margin_seconds
+        )
+        self.max_entries = max_entries if max_entries is not None else settings.presigned_url_cache_max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.hits = 0
+        self.stored_reused = 0
+        self.signed = 0
+        self.evictions = 0
+    
+    def get_url(self, s3_key: str, sign: Signer, stored_url: Optional[str] = None) -> str:
+        """
+        Get a URL for a key with more than the refresh margin left.
+        
+        Args:
+            s3_key: S3 key/path of the file
+            sign: Signs a new URL when neither the cache nor `stored_url` will do
+            stored_url: URL persisted for the key, reused while it is fresh
+            
+        Returns:
+            Presigned URL (compare with `stored_url` to see whether it changed)
+        """
+        refresh_before = self.clock() + self.refresh_margin_seconds
+        
+        entry = self._entries.get(s3_key)
+        if entry is not None and entry[1] > refresh_before:
+            self._entries.move_to_end(s3_key)
+            self.hits += 1
+            return entry[0]
+        
+        stored_expiry = presigned_url_expiry(stored_url)
+        if stored_expiry is not None and stored_expiry > refresh_before:
+            self.stored_reused += 1
+            self._store(s3_key, stored_url, stored_expiry)
+            return stored_url
+        
+        url = sign(s3_key, self.expiration_seconds)
+        self.signed += 1
+        expiry = presigned_url_expiry(url)
+        self._store(s3_key, url, expiry if expiry is not None else self.clock() + self.expiration_seconds)
+        return url
+    
+    def invalidate(self, s3_key: str) -> None:
+        """Drop a key's cached URL (e.g. after the file was deleted)."""
+        self._entries.pop(s3_key, None)
+    
+    def _store(self, s3_key: str, url: str, expiry: float) -> None:
+        if self.max_entries <= 0:
+            return
+        
+        self._entries[s3_key] = (url, expiry)
+        self._entries.move_to_end(s3_key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def stats(self) -> dict:
+        """Get cache metrics."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stored_reused": self.stored_reused,
+            "signed": self.signed,
+            "evictions": self.evictions,
+        }
+
+
+# Singleton instance shared by all requests in this process
+presigned_url_cache = PresignedUrlCache()
@@ -1,18 +1,63 @@
 """S3-compatible storage implementation for IBM Cloud Object Storage."""
+import asyncio
+import re
 import uuid
-from typing import BinaryIO
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, BinaryIO, Dict, List, Optional, Set
+from urllib.parse import quote
 import aioboto3
+from aiobotocore.config import AioConfig
+from botocore.auth import S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
 from botocore.exceptions import ClientError, BotoCoreError
 from core.config import settings
-from services.core.storage_interface import StorageInterface
-from services.core.storage_exceptions import StorageError, ImageNotFoundError, StorageConfigurationError
+from services.core.storage_interface import StorageInterface, ImageStream
+from services.core.storage_exceptions import (
+    StorageError,
+    ImageNotFoundError,
+    InvalidRangeError,
+    StorageConfigurationError,
+)
+from services.core.stream_utils import read_chunk
+
+# Smallest part S3 accepts in a multipart upload (except for the last part)
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+# Bytes read from S3 per chunk when streaming an image out
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# A single byte range ("bytes=0-499", "bytes=500-" or "bytes=-500"); others are ignored
+SINGLE_BYTE_RANGE_PATTERN = re.compile(r"^bytes=(\d+-\d*|-\d+)$")
 
 
 class S3Storage(StorageInterface):
-    """S3-compatible storage implementation using aioboto3."""
+    """
+    S3-compatible storage implementation using aioboto3.
     
-    def __init__(self):
-        """Initialize S3 storage client."""
+    Operations share one long-lived S3 client, so its connection pool, TLS
+    sessions and resolved credentials are reused instead of being set up on
+    every call. Call `open()` on application startup and `close()` on
+    shutdown; the client is also opened lazily on first use.
+    """
+    
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        part_size: Optional[int] = None,
+        max_in_flight_parts: Optional[int] = None,
+    ):
+        """
+        Initialize S3 storage client.
+        
+        Args:
+            max_connections: Size of the client's connection pool
+                (defaults to S3_MAX_CONNECTIONS from settings)
+            part_size: Upload part size in bytes, at least 5 MiB
+                (defaults to S3_MULTIPART_PART_SIZE from settings)
+            max_in_flight_parts: Parts of one upload sent concurrently
+                (defaults to S3_MULTIPART_MAX_IN_FLIGHT from settings)
+        """
         if not all([
             settings.s3_endpoint,
             settings.s3_access_key,
@@ -31,8 +76,63 @@ class S3Storage(StorageInterface):
         self.use_ssl = settings.s3_use_ssl
         self.region = settings.s3_region
         
+        self.max_connections = max_connections or settings.s3_max_connections
+        self.part_size = max(part_size or settings.s3_multipart_part_size, MIN_MULTIPART_PART_SIZE)
+        self.max_in_flight_parts = max(max_in_flight_parts or settings.s3_multipart_max_in_flight, 1)
+        
+        # Static credentials for signing presigned URLs locally
+        self.credentials = Credentials(self.access_key, self.secret_key)
+        
         # Create session for async operations
         self.session = aioboto3.Session()
+        self._client = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._client_lock = asyncio.Lock()
+    
+    async def open(self) -> None:
+        """
+        Open the shared S3 client.
+        
+        Call this on application startup.
+        """
+        async with self._client_lock:
+            if self._client is not None:
+                return
+            
+            exit_stack = AsyncExitStack()
+            self._client = await exit_stack.enter_async_context(
+                self.session.client(
+                    's3',
+                    endpoint_url=self.endpoint_url,
+                    aws_access_key_id=self.access_key,
+                    aws_secret_access_key=self.secret_key,
+                    use_ssl=self.use_ssl,
+                    region_name=self.region,
+                    config=AioConfig(max_pool_connections=self.max_connections),
+                )
+            )
+            self._exit_stack = exit_stack
+    
+    async def close(self) -> None:
+        """
+        Close the shared S3 client and its connection pool.
+        
+        Call this on application shutdown.
+        """
+        async with self._client_lock:
+            if self._exit_stack is None:
+                return
+            
+            exit_stack = self._exit_stack
+            self._client = None
+            self._exit_stack = None
+            await exit_stack.aclose()
+    
+    async def _get_client(self):
+        """Get the shared S3 client, opening it on first use."""
+        if self._client is None:
+            await self.open()
+        return self._client
     
     def _build_s3_key(
         self,
@@ -59,6 +159,22 @@ class S3Storage(StorageInterface):
         
         return f"{user_id}/{trip_id}/{trip_day_id}/{unique_filename}"
     
+    def _build_variant_key(self, s3_key: str, size: str, extension: str) -> str:
+        """
+        Build the S3 key of a derivative from its original's key.
+        
+        Args:
+            s3_key: Key built by `_build_s3_key` for the original
+            size: Size variant name
+            extension: File extension of the derivative
+            
+        Returns:
+            S3 key path: {user_id}/{trip_id}/{trip_day_id}/{unique_name}_{size}.{extension}
+        """
+        prefix, _, name = s3_key.rpartition('/')
+        stem = name.split('.')[0]
+        return f"{prefix}/{stem}_{size}.{extension}"
+    
     async def save_image(
         self,
         user_id: int,
@@ -71,6 +187,12 @@ class S3Storage(StorageInterface):
         """
         Save an image to S3 storage.
         
+        The file is streamed from its current position in parts of
+        `part_size` bytes. A file that fits in one part is sent with a single
+        PUT; larger files use a multipart upload with at most
+        `max_in_flight_parts` parts in flight, so an upload holds at most
+        (max_in_flight_parts + 1) * part_size bytes whatever the file size.
+        
         Args:
             user_id: User ID
             trip_id: Trip ID
@@ -88,33 +210,173 @@ class S3Storage(StorageInterface):
         s3_key = self._build_s3_key(user_id, trip_id, trip_day_id, filename)
         
         try:
-            async with self.session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key,
-                use_ssl=self.use_ssl,
-                region_name=self.region,
-            ) as s3:
-                # Read file content
-                file_content.seek(0)
-                file_bytes = await file_content.read()
-                
-                # Upload to S3
+            s3 = await self._get_client()
+            first_part = await self._read_part(file_content)
+            
+            if len(first_part) < self.part_size:
+                # Small file: one request
                 await s3.put_object(
                     Bucket=self.bucket_name,
                     Key=s3_key,
-                    Body=file_bytes,
+                    Body=first_part,
                     ContentType=content_type,
                 )
-                
-                return s3_key
-                
+            else:
+                await self._upload_multipart(s3, s3_key, content_type, first_part, file_content)
+            
+            return s3_key
+            
         except (ClientError, BotoCoreError) as e:
             raise StorageError(f"Failed to save image to S3: {str(e)}") from e
         except Exception as e:
             raise StorageError(f"Unexpected error saving image: {str(e)}") from e
     
+    async def save_image_variant(
+        self,
+        user_id: int,
+        trip_id: int,
+        trip_day_id: int,
+        s3_key: str,
+        size: str,
+        content: bytes,
+        content_type: str,
+        extension: str,
+    ) -> str:
+        """
+        Save a derivative of an image in S3 storage, next to the original.
+        
+        Args:
+            user_id: User ID (for validation)
+            trip_id: Trip ID (for validation)
+            trip_day_id: Trip day ID (for validation)
+            s3_key: S3 key/path of the original image
+            size: Size variant name
+            content: Encoded derivative
+            content_type: MIME type of the derivative
+            extension: File extension of the derivative
+            
+        Returns:
+            S3 key where the derivative was saved
+            
+        Raises:
+            StorageError: If save operation fails
+        """
+        # Validate that s3_key matches the expected structure
+        expected_prefix = f"{user_id}/{trip_id}/{trip_day_id}/"
+        if not s3_key.startswith(expected_prefix):
+            raise StorageError(
+                f"S3 key {s3_key} does not match expected structure "
+                f"for user {user_id}, trip {trip_id}, trip_day {trip_day_id}"
+            )
+        
+        variant_key = self._build_variant_key(s3_key, size, extension)
+        
+        try:
+            s3 = await self._get_client()
+            await s3.put_object(
+                Bucket=self.bucket_name,
+                Key=variant_key,
+                Body=content,
+                ContentType=content_type,
+            )
+            return variant_key
+            
+        except (ClientError, BotoCoreError) as e:
+            raise StorageError(f"Failed to save image variant to S3: {str(e)}") from e
+        except Exception as e:
+            raise StorageError(f"Unexpected error saving image variant: {str(e)}") from e
+    
+    async def _read_part(self, file_content: BinaryIO) -> bytes:
+        """Read the next part; shorter than part_size only at the end of the stream."""
+        part = await read_chunk(file_content, self.part_size)
+        if not part or len(part) == self.part_size:
+            return part
+        
+        # Streams may return short reads before the end
+        chunks = [part]
+        size = len(part)
+        while size < self.part_size:
+            chunk = await read_chunk(file_content, self.part_size - size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        return b"".join(chunks)
+    
+    async def _upload_multipart(
+        self,
+        s3,
+        s3_key: str,
+        content_type: str,
+        first_part: bytes,
+        file_content: BinaryIO,
+    ) -> None:
+        """
+        Upload a stream as a multipart upload with bounded concurrent parts.
+        
+        The next part is only read once a part slot is free. On failure the
+        upload is aborted so S3 drops the parts already stored.
+        """
+        upload = await s3.create_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            ContentType=content_type,
+        )
+        upload_id = upload['UploadId']
+        slots = asyncio.Semaphore(self.max_in_flight_parts)
+        in_flight: Set[asyncio.Task] = set()
+        parts: List[Dict] = []
+        
+        async def upload_part(part_number: int, body: bytes) -> None:
+            try:
+                response = await s3.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+            finally:
+                slots.release()
+        
+        try:
+            part_number, body = 1, first_part
+            while body:
+                await slots.acquire()
+                # Stop reading as soon as a part has failed
+                for task in [task for task in in_flight if task.done()]:
+                    in_flight.discard(task)
+                    task.result()
+                
+                in_flight.add(asyncio.create_task(upload_part(part_number, body)))
+                part_number += 1
+                body = await self._read_part(file_content)
+            
+            await asyncio.gather(*in_flight)
+            in_flight.clear()
+            
+            parts.sort(key=lambda part: part['PartNumber'])
+            await s3.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts},
+            )
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            try:
+                await s3.abort_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                )
+            except Exception:
+                pass  # The original error matters more
+            raise
+    
     async def get_image(
         self,
         user_id: int,
@@ -147,23 +409,16 @@ class S3Storage(StorageInterface):
             )
         
         try:
-            async with self.session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key,
-                use_ssl=self.use_ssl,
-                region_name=self.region,
-            ) as s3:
-                response = await s3.get_object(
-                    Bucket=self.bucket_name,
-                    Key=s3_key,
-                )
-                
-                # Read the entire file content
-                file_content = await response['Body'].read()
-                return file_content
-                
+            s3 = await self._get_client()
+            response = await s3.get_object(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+            )
+            
+            # Read the entire file content
+            file_content = await response['Body'].read()
+            return file_content
+            
         except ClientError as e:
             error_code = e.response.get('Error', {}).get('Code', '')
             if error_code == 'NoSuchKey':
@@ -172,6 +427,92 @@ class S3Storage(StorageInterface):
         except (BotoCoreError, Exception) as e:
             raise StorageError(f"Unexpected error retrieving image: {str(e)}") from e
     
+    async def open_image_stream(
+        self,
+        user_id: int,
+        trip_id: int,
+        trip_day_id: int,
+        s3_key: str,
+        byte_range: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> ImageStream:
+        """
+        Open an image in S3 storage for streaming.
+        
+        The range and the ETag check are passed to S3, so a partial read only
+        transfers the requested bytes and a matching ETag transfers none. The
+        body is read in STREAM_CHUNK_SIZE chunks straight from the response.
+        
+        Args:
+            user_id: User ID (for validation)
+            trip_id: Trip ID (for validation)
+            trip_day_id: Trip day ID (for validation)
+            s3_key: S3 key/path of the file
+            byte_range: HTTP Range header value
+            if_none_match: HTTP If-None-Match header value
+            
+        Returns:
+            ImageStream for the image
+            
+        Raises:
+            ImageNotFoundError: If image doesn't exist
+            InvalidRangeError: If the range lies outside the image
+            StorageError: If retrieval fails
+        """
+        # Validate that s3_key matches the expected structure
+        expected_prefix = f"{user_id}/{trip_id}/{trip_day_id}/"
+        if not s3_key.startswith(expected_prefix):
+            raise StorageError(
+                f"S3 key {s3_key} does not match expected structure "
+                f"for user {user_id}, trip {trip_id}, trip_day {trip_day_id}"
+            )
+        
+        params = {'Bucket': self.bucket_name, 'Key': s3_key}
+        if byte_range and SINGLE_BYTE_RANGE_PATTERN.match(byte_range.strip()):
+            params['Range'] = byte_range.strip()
+        if if_none_match:
+            params['IfNoneMatch'] = if_none_match
+        
+        try:
+            s3 = await self._get_client()
+            response = await s3.get_object(**params)
+            
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', '')
+            status_code = e.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+            if status_code == 304 or error_code in ('304', 'NotModified'):
+                headers = e.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+                return ImageStream(
+                    content_type=headers.get('content-type', ''),
+                    etag=headers.get('etag', if_none_match),
+                    not_modified=True,
+                )
+            if error_code == 'NoSuchKey':
+                raise ImageNotFoundError(f"Image not found: {s3_key}") from e
+            if error_code == 'InvalidRange':
+                raise InvalidRangeError(f"Range {byte_range} not satisfiable for {s3_key}") from e
+            raise StorageError(f"Failed to retrieve image from S3: {str(e)}") from e
+        except (BotoCoreError, Exception) as e:
+            raise StorageError(f"Unexpected error retrieving image: {str(e)}") from e
+        
+        return ImageStream(
+            content_type=response.get('ContentType', ''),
+            etag=response.get('ETag'),
+            body=self._iter_body(response['Body']),
+            content_length=response.get('ContentLength', 0),
+            content_range=response.get('ContentRange'),
+            last_modified=response.get('LastModified'),
+        )
+    
+    async def _iter_body(self, body) -> AsyncIterator[bytes]:
+        """Yield an S3 response body in chunks, releasing the connection at the end."""
+        try:
+            async for chunk in body.iter_chunks(STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            # Also runs when the client disconnects and the generator is closed early
+            body.close()
+    
     async def delete_image(
         self,
         user_id: int,
@@ -201,19 +542,12 @@ class S3Storage(StorageInterface):
             )
         
         try:
-            async with self.session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key,
-                use_ssl=self.use_ssl,
-                region_name=self.region,
-            ) as s3:
-                await s3.delete_object(
-                    Bucket=self.bucket_name,
-                    Key=s3_key,
-                )
-                
+            s3 = await self._get_client()
+            await s3.delete_object(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+            )
+            
         except ClientError as e:
             error_code = e.response.get('Error', {}).get('Code', '')
             if error_code == 'NoSuchKey':
@@ -222,13 +556,18 @@ class S3Storage(StorageInterface):
         except (BotoCoreError, Exception) as e:
             raise StorageError(f"Unexpected error deleting image: {str(e)}") from e
     
-    async def get_presigned_url(
+    def sign_presigned_url(
         self,
         s3_key: str,
         expiration: int = 3600,
     ) -> str:
         """
-        Generate a presigned URL for accessing an image.
+        Sign a presigned GET URL locally.
+        
+        Produces the same path-style, SigV4 query string signed URL as the
+        client's generate_presigned_url, without going through the client.
+        SigV4 is used in every region, since regions launched after 2014
+        don't accept SigV2 signatures.
         
         Args:
             s3_key: S3 key/path of the file
@@ -241,25 +580,32 @@ class S3Storage(StorageInterface):
             StorageError: If URL generation fails
         """
         try:
-            async with self.session.client(
-                's3',
-                endpoint_url=self.endpoint_url,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key,
-                use_ssl=self.use_ssl,
-                region_name=self.region,
-            ) as s3:
-                url = await s3.generate_presigned_url(
-                    'get_object',
-                    Params={
-                        'Bucket': self.bucket_name,
-                        'Key': s3_key,
-                    },
-                    ExpiresIn=expiration,
-                )
-                
-                return url
-                
-        except (ClientError, BotoCoreError, Exception) as e:
+            request = AWSRequest(
+                method='GET',
+                url=f"{self.endpoint_url.rstrip('/')}/{self.bucket_name}/{quote(s3_key, safe='/~')}",
+            )
+            S3SigV4QueryAuth(self.credentials, 's3', self.region, expires=expiration).add_auth(request)
+            return request.url
+            
+        except (BotoCoreError, Exception) as e:
             raise StorageError(f"Failed to generate presigned URL: {str(e)}") from e
-
+    
+    async def get_presigned_url(
+        self,
+        s3_key: str,
+        expiration: int = 3600,
+    ) -> str:
+        """
+        Generate a presigned URL for accessing an image.
+        
+        Args:
+            s3_key: S3 key/path of the file
+            expiration: URL expiration time in seconds (default: 1 hour)
+            
+        Returns:
+            Presigned URL string
+            
+        Raises:
+            StorageError: If URL generation fails
+        """
+        return self.sign_presigned_url(s3_key, expiration)
@@ -11,6 +11,11 @@ class ImageNotFoundError(StorageError):
     pass
 
 
+class InvalidRangeError(StorageError):
+    """Raised when a requested byte range cannot be satisfied."""
+    pass
+
+
 class StorageConfigurationError(StorageError):
     """Raised when storage configuration is invalid."""
     pass
@@ -1,6 +1,20 @@
 """Abstract interface for storage operations."""
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, Optional
+
+
+@dataclass
+class ImageStream:
+    """An image opened for streaming, or the answer to a conditional read that matched."""
+    content_type: str
+    etag: Optional[str] = None
+    body: Optional[AsyncIterator[bytes]] = None  # None when not_modified
+    content_length: int = 0  # Bytes the body yields
+    content_range: Optional[str] = None  # "bytes start-end/total" for a range read
+    last_modified: Optional[datetime] = None
+    not_modified: bool = False  # If-None-Match matched the current ETag
 
 
 class StorageInterface(ABC):
@@ -24,7 +38,8 @@ class StorageInterface(ABC):
             trip_id: Trip ID
             trip_day_id: Trip day ID
             filename: Original filename
-            file_content: File content as binary stream
+            file_content: File content as binary stream (sync or async `read(size)`),
+                read from its current position to the end
             content_type: MIME type of the file
             
         Returns:
@@ -35,6 +50,39 @@ class StorageInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    async def save_image_variant(
+        self,
+        user_id: int,
+        trip_id: int,
+        trip_day_id: int,
+        s3_key: str,
+        size: str,
+        content: bytes,
+        content_type: str,
+        extension: str,
+    ) -> str:
+        """
+        Save a derivative (e.g. a thumbnail) of a stored image next to it.
+        
+        Args:
+            user_id: User ID
+            trip_id: Trip ID
+            trip_day_id: Trip day ID
+            s3_key: S3 key/path of the original image
+            size: Size variant name, used in the derivative's key
+            content: Encoded derivative
+            content_type: MIME type of the derivative
+            extension: File extension of the derivative
+            
+        Returns:
+            S3 key/path where the derivative was saved
+            
+        Raises:
+            StorageError: If save operation fails
+        """
+        pass
+    
     @abstractmethod
     async def get_image(
         self,
@@ -61,6 +109,40 @@ class StorageInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    async def open_image_stream(
+        self,
+        user_id: int,
+        trip_id: int,
+        trip_day_id: int,
+        s3_key: str,
+        byte_range: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> ImageStream:
+        """
+        Open an image for streaming without loading it into memory.
+        
+        Args:
+            user_id: User ID
+            trip_id: Trip ID
+            trip_day_id: Trip day ID
+            s3_key: S3 key/path of the file
+            byte_range: HTTP Range header value, e.g. "bytes=0-1023"
+                (ignored unless it is a single byte range)
+            if_none_match: HTTP If-None-Match header value; when it matches the
+                current ETag no body is opened and `not_modified` is set
+            
+        Returns:
+            ImageStream whose body yields the content chunk by chunk and
+            releases the connection when exhausted or closed
+            
+        Raises:
+            ImageNotFoundError: If image doesn't exist
+            InvalidRangeError: If the range lies outside the image
+            StorageError: If retrieval fails
+        """
+        pass
+    
     @abstractmethod
     async def delete_image(
         self,
@@ -84,6 +166,27 @@ class StorageInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    def sign_presigned_url(
+        self,
+        s3_key: str,
+        expiration: int = 3600,
+    ) -> str:
+        """
+        Sign a presigned URL locally, without any request to the storage service.
+        
+        Args:
+            s3_key: S3 key/path of the file
+            expiration: URL expiration time in seconds (default: 1 hour)
+            
+        Returns:
+            Presigned URL string
+            
+        Raises:
+            StorageError: If URL generation fails
+        """
+        pass
+    
     @abstractmethod
     async def get_presigned_url(
         self,
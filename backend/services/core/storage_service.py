@@ -1,22 +1,41 @@
 """Storage service that orchestrates storage operations and database metadata."""
-from typing import BinaryIO, Optional
-from core.models.image import Image
-from services.core.storage_interface import StorageInterface
+import asyncio
+from typing import BinaryIO, Dict, Optional
+from core.models.image import Image, ImageSize
+from services.core.bulk_update import bulk_update_rows
+from services.core.image_derivatives import (
+    DERIVATIVE_CONTENT_TYPE,
+    DERIVATIVE_EXTENSION,
+    ImageDerivativePipeline,
+    image_derivative_pipeline,
+)
+from services.core.presigned_url_cache import PresignedUrlCache, presigned_url_cache
+from services.core.storage_interface import StorageInterface, ImageStream
 from services.core.storage_exceptions import StorageError, ImageNotFoundError
+from services.core.stream_utils import CountingReader
 from dtos.storage_dto import ImageMetadataResponse, ImageUploadResponse, ImageListResponse
 
 
 class StorageService:
     """Service for handling image storage operations with database metadata."""
     
-    def __init__(self, storage_backend: StorageInterface):
+    def __init__(
+        self,
+        storage_backend: StorageInterface,
+        url_cache: Optional[PresignedUrlCache] = None,
+        derivatives: Optional[ImageDerivativePipeline] = None,
+    ):
         """
         Initialize storage service with a storage backend.
         
         Args:
             storage_backend: Implementation of StorageInterface (e.g., S3Storage)
+            url_cache: Presigned URL cache (defaults to the shared instance)
+            derivatives: Derivative pipeline (defaults to the shared instance)
         """
         self.storage = storage_backend
+        self.url_cache = url_cache or presigned_url_cache
+        self.derivatives = derivatives or image_derivative_pipeline
     
     async def upload_image(
         self,
@@ -30,6 +49,12 @@ class StorageService:
         """
         Upload an image and save metadata to database.
         
+        The file is streamed to storage from its current position. Images the
+        derivative pipeline accepts are also kept in memory up to its size
+        limit, so the thumbnail and medium sizes can be rendered (in the
+        process pool) and stored without downloading the original again. A
+        failed derivative never fails the upload.
+        
         Args:
             user_id: User ID
             trip_id: Trip ID
@@ -44,23 +69,24 @@ class StorageService:
         Raises:
             StorageError: If upload or database operation fails
         """
-        # Get file size
-        file_content.seek(0, 2)  # Seek to end
-        file_size = file_content.tell()
-        file_content.seek(0)  # Reset to beginning
-        
-        # Save to storage
+        # Stream to storage, counting the size on the way (no seeking through the file)
+        keep_bytes = self.derivatives.max_source_bytes if self.derivatives.accepts(content_type) else 0
+        reader = CountingReader(file_content, keep_bytes=keep_bytes)
         s3_key = await self.storage.save_image(
             user_id=user_id,
             trip_id=trip_id,
             trip_day_id=trip_day_id,
             filename=filename,
-            file_content=file_content,
+            file_content=reader,
             content_type=content_type,
         )
+        file_size = reader.bytes_read
+        derivative_fields = await self._save_derivatives(
+            user_id, trip_id, trip_day_id, s3_key, reader.content
+        )
         
-        # Generate presigned URL
-        url = await self.storage.get_presigned_url(s3_key)
+        # Sign the presigned URL locally and cache it for later listings
+        url = self.url_cache.get_url(s3_key, self.storage.sign_presigned_url)
         
         # Save metadata to database
         try:
@@ -73,6 +99,7 @@ class StorageService:
                 url=url,
                 file_size=file_size,
                 content_type=content_type,
+                **derivative_fields,
             )
             
             return ImageUploadResponse(
@@ -85,18 +112,111 @@ class StorageService:
                 url=image.url,
                 file_size=image.file_size,
                 content_type=image.content_type,
+                width=image.width,
+                height=image.height,
+                sizes=self._available_sizes(image),
                 created_at=image.created_at.isoformat(),
             )
             
         except Exception as e:
-            # If database save fails, try to clean up the uploaded file
-            try:
-                await self.storage.delete_image(user_id, trip_id, trip_day_id, s3_key)
-            except Exception:
-                pass  # Ignore cleanup errors
+            # If database save fails, try to clean up the uploaded files
+            keys = [s3_key] + [
+                value for name, value in derivative_fields.items() if name.endswith("_s3_key")
+            ]
+            for key in keys:
+                try:
+                    await self.storage.delete_image(user_id, trip_id, trip_day_id, key)
+                except Exception:
+                    pass  # Ignore cleanup errors
             
             raise StorageError(f"Failed to save image metadata to database: {str(e)}") from e
     
+    async def _save_derivatives(
+        self,
+        user_id: int,
+        trip_id: int,
+        trip_day_id: int,
+        s3_key: str,
+        content: Optional[bytes],
+    ) -> Dict[str, object]:
+        """
+        Render and store the derivatives of an uploaded image.
+        
+        Returns:
+            Image fields to set: dimensions and the keys of the stored sizes
+            (empty if nothing could be rendered)
+        """
+        rendered = await self.derivatives.render(content)
+        if rendered is None:
+            return {}
+        
+        sizes = [ImageSize(name) for name in rendered.variants]
+        results = await asyncio.gather(
+            *(
+                self.storage.save_image_variant(
+                    user_id=user_id,
+                    trip_id=trip_id,
+                    trip_day_id=trip_day_id,
+                    s3_key=s3_key,
+                    size=size.value,
+                    content=rendered.variants[size.value].content,
+                    content_type=DERIVATIVE_CONTENT_TYPE,
+                    extension=DERIVATIVE_EXTENSION,
+                )
+                for size in sizes
+            ),
+            return_exceptions=True,
+        )
+        
+        fields: Dict[str, object] = {"width": rendered.width, "height": rendered.height}
+        for size, result in zip(sizes, results):
+            if isinstance(result, Exception):
+                print(f"Failed to store {size.value} derivative of {s3_key}: {result}")
+            else:
+                fields[f"{size.value}_s3_key"] = result
+        return fields
+    
+    def _available_sizes(self, image: Image) -> list[str]:
+        """Get the sizes an image can be served in."""
+        return [size.value for size in ImageSize if image.variant_s3_key(size)]
+    
+    def _variant_url(self, image: Image, size: ImageSize) -> tuple[str, ImageSize]:
+        """
+        Get a presigned URL for a size variant of an image.
+        
+        Falls back to the original when the variant was not generated. Only
+        the original's URL is stored on the row; variant URLs live in the
+        presigned URL cache.
+        
+        Returns:
+            Tuple of (url, size actually served)
+        """
+        variant_key = image.variant_s3_key(size)
+        if size == ImageSize.ORIGINAL or not variant_key:
+            url = self.url_cache.get_url(image.s3_key, self.storage.sign_presigned_url, image.url)
+            return url, ImageSize.ORIGINAL
+        return self.url_cache.get_url(variant_key, self.storage.sign_presigned_url), size
+    
+    def _metadata_response(self, image: Image, url: str, size: ImageSize) -> ImageMetadataResponse:
+        """Build the metadata response for an image served at a given size."""
+        return ImageMetadataResponse(
+            id=image.id,
+            user_id=image.user_id,
+            trip_id=image.trip_id,
+            trip_day_id=image.trip_day_id,
+            filename=image.filename,
+            s3_key=image.variant_s3_key(size),
+            url=url,
+            file_size=image.file_size,
+            content_type=image.content_type if size == ImageSize.ORIGINAL else DERIVATIVE_CONTENT_TYPE,
+            size=size.value,
+            width=image.width,
+            height=image.height,
+            sizes=self._available_sizes(image),
+            created_at=image.created_at.isoformat(),
+            updated_at=image.updated_at.isoformat(),
+        )
+    
     async def get_image(
         self,
         user_id: int,
@@ -144,6 +264,67 @@ class StorageService:
         
         return image_bytes, image.content_type
     
+    async def open_image_stream(
+        self,
+        user_id: int,
+        trip_id: int,
+        trip_day_id: int,
+        image_id: int,
+        byte_range: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        size: ImageSize = ImageSize.ORIGINAL,
+    ) -> ImageStream:
+        """
+        Open an image file for streaming, honouring Range and If-None-Match.
+        
+        Unlike get_image the content is never held in memory as a whole.
+        
+        Args:
+            user_id: User ID
+            trip_id: Trip ID
+            trip_day_id: Trip day ID
+            image_id: Image ID from database
+            byte_range: HTTP Range header value
+            if_none_match: HTTP If-None-Match header value
+            size: Size variant to stream (the original if it was not generated)
+            
+        Returns:
+            ImageStream for the image
+            
+        Raises:
+            ImageNotFoundError: If image doesn't exist
+            InvalidRangeError: If the range lies outside the image
+            StorageError: If retrieval fails
+        """
+        image = await Image.get_or_none(
+            id=image_id,
+            user_id=user_id,
+            trip_id=trip_id,
+            trip_day_id=trip_day_id,
+        )
+        
+        if not image:
+            raise ImageNotFoundError(
+                f"Image {image_id} not found for user {user_id}, "
+                f"trip {trip_id}, trip_day {trip_day_id}"
+            )
+        
+        variant_key = image.variant_s3_key(size)
+        stream = await self.storage.open_image_stream(
+            user_id=user_id,
+            trip_id=trip_id,
+            trip_day_id=trip_day_id,
+            s3_key=variant_key or image.s3_key,
+            byte_range=byte_range,
+            if_none_match=if_none_match,
+        )
+        # The stored content type is what the image was uploaded with
+        if variant_key and size != ImageSize.ORIGINAL:
+            stream.content_type = DERIVATIVE_CONTENT_TYPE
+        else:
+            stream.content_type = image.content_type
+        return stream
+    
     async def get_image_metadata(
         self,
         user_id: int,
@@ -179,41 +360,35 @@ class StorageService:
                 f"trip {trip_id}, trip_day {trip_day_id}"
             )
         
-        # Regenerate URL if needed (presigned URLs expire)
-        url = await self.storage.get_presigned_url(image.s3_key)
+        # Re-sign the URL only if it is close to expiring
+        url = self.url_cache.get_url(image.s3_key, self.storage.sign_presigned_url, image.url)
         
         # Update URL in database if it changed
         if image.url != url:
             image.url = url
             await image.save()
         
-        return ImageMetadataResponse(
-            id=image.id,
-            user_id=image.user_id,
-            trip_id=image.trip_id,
-            trip_day_id=image.trip_day_id,
-            filename=image.filename,
-            s3_key=image.s3_key,
-            url=image.url,
-            file_size=image.file_size,
-            content_type=image.content_type,
-            created_at=image.created_at.isoformat(),
-            updated_at=image.updated_at.isoformat(),
-        )
+        return self._metadata_response(image, url, ImageSize.ORIGINAL)
     
     async def list_images(
         self,
         user_id: int,
         trip_id: int,
         trip_day_id: int,
+        size: ImageSize = ImageSize.ORIGINAL,
     ) -> ImageListResponse:
         """
         List all images for a specific trip day.
         
+        URLs come from the presigned URL cache or the stored rows; only URLs
+        close to expiring are re-signed, and those are saved in one update.
+        
         Args:
             user_id: User ID
             trip_id: Trip ID
             trip_day_id: Trip day ID
+            size: Size variant the URLs point to; images without that variant
+                fall back to the original
             
         Returns:
             ImageListResponse with list of images
@@ -224,31 +399,19 @@ class StorageService:
             trip_day_id=trip_day_id,
         ).order_by('-created_at')
         
-        # Regenerate URLs for all images
+        # Re-sign only URLs close to expiring (locally, no storage requests)
+        refreshed_urls = {}
         image_responses = []
         for image in images:
-            url = await self.storage.get_presigned_url(image.s3_key)
-            
-            # Update URL in database if it changed
-            if image.url != url:
+            url, served_size = self._variant_url(image, size)
+            if served_size == ImageSize.ORIGINAL and image.url != url:
                 image.url = url
-                await image.save()
+                refreshed_urls[image.id] = {"url": url}
             
-            image_responses.append(
-                ImageMetadataResponse(
-                    id=image.id,
-                    user_id=image.user_id,
-                    trip_id=image.trip_id,
-                    trip_day_id=image.trip_day_id,
-                    filename=image.filename,
-                    s3_key=image.s3_key,
-                    url=image.url,
-                    file_size=image.file_size,
-                    content_type=image.content_type,
-                    created_at=image.created_at.isoformat(),
-                    updated_at=image.updated_at.isoformat(),
-                )
-            )
+            image_responses.append(self._metadata_response(image, url, served_size))
+        
+        # Persist the refreshed URLs in one statement
+        await bulk_update_rows(Image, refreshed_urls)
         
         return ImageListResponse(
             images=image_responses,
@@ -299,6 +462,19 @@ class StorageService:
             s3_key=s3_key,
         )
         
+        # Derivatives are best effort; a leftover one is unreachable without the row
+        variant_keys = [
+            image.variant_s3_key(size) for size in ImageSize
+            if size != ImageSize.ORIGINAL and image.variant_s3_key(size)
+        ]
+        for variant_key in variant_keys:
+            try:
+                await self.storage.delete_image(user_id, trip_id, trip_day_id, variant_key)
+            except StorageError:
+                pass
+        
         # Delete from database
         await image.delete()
+        for key in [s3_key] + variant_keys:
+            self.url_cache.invalidate(key)
 
@@ -0,0 +1,54 @@
+"""Helpers for reading upload streams chunk by chunk."""
+import inspect
+from typing import BinaryIO, List, Optional
+
+
+async def read_chunk(stream: BinaryIO, size: int) -> bytes:
+    """
+    Read up to `size` bytes from a sync (file) or async (UploadFile) stream.
+    
+    Args:
+        stream: Stream to read from
+        size: Maximum number of bytes to read
+        
+    Returns:
+        The bytes read (empty at the end of the stream)
+    """
+    chunk = stream.read(size)
+    if inspect.isawaitable(chunk):
+        chunk = await chunk
+    return chunk or b""
+
+
+class CountingReader:
+    """Async stream wrapper that counts (and optionally keeps) the bytes read through it."""
+    
+    def __init__(self, stream: BinaryIO, keep_bytes: int = 0):
+        """
+        Wrap a stream.
+        
+        Args:
+            stream: Sync or async stream to read from
+            keep_bytes: Keep the content read as long as it is at most this
+                many bytes (0 keeps nothing)
+        """
+        self.stream = stream
+        self.bytes_read = 0
+        self.keep_bytes = keep_bytes
+        self._kept: Optional[List[bytes]] = [] if keep_bytes > 0 else None
+    
+    async def read(self, size: int = -1) -> bytes:
+        """Read up to `size` bytes (everything left if negative)."""
+        chunk = await read_chunk(self.stream, size)
+        self.bytes_read += len(chunk)
+        if self._kept is not None:
+            if self.bytes_read > self.keep_bytes:
+                self._kept = None  # Too large to keep; drop what was kept so far
+            elif chunk:
+                self._kept.append(chunk)
+        return chunk
+    
+    @property
+    def content(self) -> Optional[bytes]:
+        """Everything read so far, or None if it was not kept."""
+        return b"".join(self._kept) if self._kept is not None else None
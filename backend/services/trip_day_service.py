@@ -4,15 +4,23 @@ Service for managing trip days.
 This service handles CRUD operations for TripDays.
 """
 from typing import List, Optional
+from tortoise.transactions import in_transaction
+from core.identity_map import IdentityMap
 from core.models.trips.trip import Trip
 from core.models.trips.trip_day import TripDay
 from core.models.places.city import City
 from dtos.trip_day_dto import (
     TripDayResponse,
     CreateTripDayRequest,
+    CreateTripDaysRequest,
     UpdateTripDayRequest,
 )
-from dtos.trip_stop_dto import TripStopResponse
+from services.trip_itinerary_loader import (
+    load_trip_days,
+    build_trip_day_response,
+    get_trip_details_for_user,
+    invalidate_trip_itinerary,
+)
 
 
 async def get_alpena_city_id() -> Optional[int]:
@@ -33,6 +41,15 @@ async def get_alpena_city_id() -> Optional[int]:
 class TripDayService:
     """Service for managing trip days."""
     
+    def __init__(self, identity_map: Optional[IdentityMap] = None):
+        """
+        Initialize the Trip Day Service.
+        
+        Args:
+            identity_map: Request-scoped identity map (a private one is created if omitted)
+        """
+        self.identity_map = identity_map or IdentityMap()
+    
     async def get_trip_days(
         self,
         user_id: int,
@@ -51,59 +68,9 @@ class TripDayService:
         Raises:
             ValueError: If trip not found or doesn't belong to user
         """
-        # Verify trip belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
-        if not trip:
-            raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
-        
-        # Get all days for this trip with their stops
-        days = await TripDay.filter(trip_id=trip_id).prefetch_related(
-            'base_city',
-            'stops__attraction'
-        ).order_by('day_index')
-        
-        # Build day responses with nested stops
-        day_responses = []
-        for day in days:
-            # Get stops for this day
-            from core.models.trips.trip_stop import TripStop
-            stops = await TripStop.filter(trip_day_id=day.id).prefetch_related(
-                'attraction'
-            ).order_by('order_index')
-            
-            # Build stop responses
-            stop_responses = []
-            for stop in stops:
-                stop_responses.append(
-                    TripStopResponse(
-                        id=stop.id,
-                        trip_day_id=stop.trip_day_id,
-                        attraction_id=stop.attraction_id,
-                        attraction_name=stop.attraction.name if stop.attraction else None,
-                        attraction_type=stop.attraction.type if stop.attraction else None,
-                        label=stop.label,
-                        slot=stop.slot.value,
-                        order_index=stop.order_index,
-                        created_at=stop.created_at.isoformat(),
-                        updated_at=stop.updated_at.isoformat(),
-                    )
-                )
-            
-            day_responses.append(
-                TripDayResponse(
-                    id=day.id,
-                    trip_id=day.trip_id,
-                    day_index=day.day_index,
-                    base_city_id=day.base_city_id,
-                    base_city_name=day.base_city.name if day.base_city else None,
-                    notes=day.notes,
-                    stops=stop_responses,
-                    created_at=day.created_at.isoformat(),
-                    updated_at=day.updated_at.isoformat(),
-                )
-            )
-        
-        return day_responses
+        # Verifies ownership and serves the days from the itinerary cache
+        details = await get_trip_details_for_user(user_id, trip_id, self.identity_map)
+        return details.days
     
     async def create_trip_day(
         self,
@@ -126,7 +93,7 @@ class TripDayService:
             ValueError: If trip not found, doesn't belong to user, or day_index already exists
         """
         # Verify trip belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+        trip = await self.identity_map.get_trip(trip_id, user_id)
         if not trip:
             raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
         
@@ -148,7 +115,7 @@ class TripDayService:
                 base_city_id = alpena_id
         
         if base_city_id:
-            city = await City.filter(id=base_city_id).first()
+            city = await self.identity_map.get_city(base_city_id)
             if not city:
                 raise ValueError(f"City {base_city_id} not found")
         
@@ -160,21 +127,100 @@ class TripDayService:
             notes=request.notes,
         )
         
+        invalidate_trip_itinerary(trip_id)
+        
         # Reload with relations
         await day.fetch_related('base_city')
         
         # Return response (no stops yet)
-        return TripDayResponse(
-            id=day.id,
-            trip_id=day.trip_id,
-            day_index=day.day_index,
-            base_city_id=day.base_city_id,
-            base_city_name=day.base_city.name if day.base_city else None,
-            notes=day.notes,
-            stops=[],  # New day has no stops yet
-            created_at=day.created_at.isoformat(),
-            updated_at=day.updated_at.isoformat(),
-        )
+        return build_trip_day_response(day, stops=[])
+    
+    async def create_trip_days(
+        self,
+        user_id: int,
+        trip_id: int,
+        request: CreateTripDaysRequest,
+    ) -> List[TripDayResponse]:
+        """
+        Create several days for a trip in one transaction.
+        
+        Ownership, existing day indexes and cities are checked once for the
+        whole batch, and the days are inserted with a single bulk insert.
+        The trip row is locked while existing indexes are checked, so
+        concurrent batches for the same trip can't both insert a day_index.
+        Days without a base_city_id default to Alpena, like create_trip_day.
+        
+        Args:
+            user_id: ID of the user
+            trip_id: ID of the trip
+            request: CreateTripDaysRequest with the days to create
+            
+        Returns:
+            List of TripDayResponse objects for the new days, ordered by day_index
+            
+        Raises:
+            ValueError: If trip not found, doesn't belong to user, a day_index is
+                repeated or already exists, or a city is not found
+        """
+        if not request.days:
+            return []
+        
+        # Verify trip belongs to user
+        trip = await self.identity_map.get_trip(trip_id, user_id)
+        if not trip:
+            raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
+        
+        # Check day indexes against each other
+        day_indexes = [day.day_index for day in request.days]
+        if len(set(day_indexes)) != len(day_indexes):
+            raise ValueError("Each day_index may only appear once in a batch")
+        
+        # Auto-lookup Alpena once for every day without a city
+        default_city_id = None
+        if any(not day.base_city_id for day in request.days):
+            default_city_id = await get_alpena_city_id()
+        
+        # Verify all requested cities in one query
+        city_ids = {day.base_city_id for day in request.days if day.base_city_id}
+        if city_ids:
+            found_ids = set(await City.filter(id__in=city_ids).values_list('id', flat=True))
+            missing_ids = city_ids - found_ids
+            if missing_ids:
+                raise ValueError(f"City {min(missing_ids)} not found")
+        
+        async with in_transaction() as connection:
+            # Serialize batches for this trip, then check against the existing days
+            await Trip.filter(id=trip_id).select_for_update().using_db(connection).first()
+            existing_indexes = await TripDay.filter(
+                trip_id=trip_id,
+                day_index__in=day_indexes
+            ).using_db(connection).values_list('day_index', flat=True)
+            if existing_indexes:
+                raise ValueError(f"Day {min(existing_indexes)} already exists for trip {trip_id}")
+            
+            await TripDay.bulk_create(
+                [
+                    TripDay(
+                        trip_id=trip_id,
+                        day_index=day.day_index,
+                        base_city_id=day.base_city_id or default_city_id,
+                        notes=day.notes,
+                    )
+                    for day in request.days
+                ],
+                using_db=connection,
+            )
+            
+            # Bulk inserts don't return primary keys on every backend, so reload
+            # just the new rows by index; new days have no stops yet
+            created_days = await TripDay.filter(
+                trip_id=trip_id,
+                day_index__in=day_indexes
+            ).using_db(connection).prefetch_related('base_city').order_by('day_index')
+        
+        invalidate_trip_itinerary(trip_id)
+        
+        return [build_trip_day_response(day, []) for day in created_days]
     
     async def update_trip_day(
         self,
@@ -199,12 +245,12 @@ class TripDayService:
             ValueError: If trip/day not found, doesn't belong to user, or city not found
         """
         # Verify trip belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+        trip = await self.identity_map.get_trip(trip_id, user_id)
         if not trip:
             raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
         
         # Get the day and verify it belongs to the trip
-        day = await TripDay.filter(id=day_id, trip_id=trip_id).first()
+        day = await self.identity_map.get_trip_day(day_id, trip_id)
         if not day:
             raise ValueError(f"Day {day_id} not found or doesn't belong to trip {trip_id}")
         
@@ -212,7 +258,7 @@ class TripDayService:
         if request.base_city_id is not None:
             base_city_id = request.base_city_id
             if base_city_id:
-                city = await City.filter(id=base_city_id).first()
+                city = await self.identity_map.get_city(base_city_id)
                 if not city:
                     raise ValueError(f"City {base_city_id} not found")
             day.base_city_id = base_city_id
@@ -227,44 +273,11 @@ class TripDayService:
             day.notes = request.notes
         
         await day.save()
-        await day.fetch_related('base_city', 'stops__attraction')
-        
-        # Get stops for this day
-        from core.models.trips.trip_stop import TripStop
-        stops = await TripStop.filter(trip_day_id=day.id).prefetch_related(
-            'attraction'
-        ).order_by('order_index')
+        invalidate_trip_itinerary(trip_id)
         
-        # Build stop responses
-        stop_responses = []
-        for stop in stops:
-            stop_responses.append(
-                TripStopResponse(
-                    id=stop.id,
-                    trip_day_id=stop.trip_day_id,
-                    attraction_id=stop.attraction_id,
-                    attraction_name=stop.attraction.name if stop.attraction else None,
-                    attraction_type=stop.attraction.type if stop.attraction else None,
-                    label=stop.label,
-                    slot=stop.slot.value,
-                    order_index=stop.order_index,
-                    created_at=stop.created_at.isoformat(),
-                    updated_at=stop.updated_at.isoformat(),
-                )
-            )
-        
-        # Return response
-        return TripDayResponse(
-            id=day.id,
-            trip_id=day.trip_id,
-            day_index=day.day_index,
-            base_city_id=day.base_city_id,
-            base_city_name=day.base_city.name if day.base_city else None,
-            notes=day.notes,
-            stops=stop_responses,
-            created_at=day.created_at.isoformat(),
-            updated_at=day.updated_at.isoformat(),
-        )
+        # Reload the day with its stops through the shared loader
+        day_responses = await load_trip_days(trip_id, day_ids=[day.id])
+        return day_responses[0]
     
     async def delete_trip_day(
         self,
@@ -284,15 +297,17 @@ class TripDayService:
             ValueError: If trip/day not found or doesn't belong to user
         """
         # Verify trip belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+        trip = await self.identity_map.get_trip(trip_id, user_id)
         if not trip:
             raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
         
         # Get the day and verify it belongs to the trip
-        day = await TripDay.filter(id=day_id, trip_id=trip_id).first()
+        day = await self.identity_map.get_trip_day(day_id, trip_id)
         if not day:
             raise ValueError(f"Day {day_id} not found or doesn't belong to trip {trip_id}")
         
         # Delete the day (stops will be deleted via CASCADE)
         await day.delete()
+        self.identity_map.trip_days.forget(day_id)
+        invalidate_trip_itinerary(trip_id)
 
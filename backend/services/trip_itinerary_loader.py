@@ -0,0 +1,169 @@
+"""
+Loader for assembling trip itineraries.
+
+Fetches a trip's days, base cities, stops and attractions in a fixed number
+of queries (independent of how many days or stops the trip has) and builds
+the nested DTOs in memory. Shared by TripService, TripDayService and
+TripStopService so every itinerary view is assembled the same way.
+
+Read paths go through `get_trip_details_for_user`, which serves assembled
+itineraries from the itinerary cache; mutations must call
+`invalidate_trip_itinerary` once they have been written.
+"""
+from typing import Dict, List, Optional
+from core.identity_map import IdentityMap
+from core.models.trips.trip import Trip
+from core.models.trips.trip_day import TripDay
+from core.models.trips.trip_stop import TripStop
+from dtos.trip_dto import TripDetailsResponse
+from dtos.trip_day_dto import TripDayResponse
+from dtos.trip_stop_dto import TripStopResponse
+from services.core.itinerary_cache import itinerary_cache
+
+
+def build_trip_stop_response(stop: TripStop) -> TripStopResponse:
+    """Build a TripStopResponse from a stop with its attraction loaded."""
+    return TripStopResponse(
+        id=stop.id,
+        trip_day_id=stop.trip_day_id,
+        attraction_id=stop.attraction_id,
+        attraction_name=stop.attraction.name if stop.attraction else None,
+        attraction_type=stop.attraction.type if stop.attraction else None,
+        label=stop.label,
+        slot=stop.slot.value,
+        order_index=stop.order_index,
+        created_at=stop.created_at.isoformat(),
+        updated_at=stop.updated_at.isoformat(),
+    )
+
+
+def build_trip_day_response(
+    day: TripDay,
+    stops: List[TripStopResponse],
+) -> TripDayResponse:
+    """Build a TripDayResponse from a day with its base city loaded."""
+    return TripDayResponse(
+        id=day.id,
+        trip_id=day.trip_id,
+        day_index=day.day_index,
+        base_city_id=day.base_city_id,
+        base_city_name=day.base_city.name if day.base_city else None,
+        notes=day.notes,
+        stops=stops,
+        created_at=day.created_at.isoformat(),
+        updated_at=day.updated_at.isoformat(),
+    )
+
+
+async def load_trip_days(
+    trip_id: int,
+    day_ids: Optional[List[int]] = None,
+) -> List[TripDayResponse]:
+    """
+    Load days of a trip with their nested stops.
+    
+    Runs four queries at most (days, base cities, stops, attractions)
+    regardless of the number of days and stops.
+    
+    Args:
+        trip_id: ID of the trip
+        day_ids: Optional subset of day IDs to load (all days if None)
+    
+    Returns:
+        List of TripDayResponse objects ordered by day_index, stops ordered by order_index
+    """
+    days_query = TripDay.filter(trip_id=trip_id)
+    if day_ids is not None:
+        days_query = days_query.filter(id__in=day_ids)
+    days = await days_query.prefetch_related('base_city').order_by('day_index')
+    
+    if not days:
+        return []
+    
+    stops = await TripStop.filter(
+        trip_day_id__in=[day.id for day in days]
+    ).prefetch_related('attraction').order_by('order_index', 'id')
+    
+    # Group stops by day in memory (already in order_index order)
+    stops_by_day: Dict[int, List[TripStopResponse]] = {}
+    for stop in stops:
+        stops_by_day.setdefault(stop.trip_day_id, []).append(build_trip_stop_response(stop))
+    
+    return [
+        build_trip_day_response(day, stops_by_day.get(day.id, []))
+        for day in days
+    ]
+
+
+async def load_trip_details(trip: Trip) -> TripDetailsResponse:
+    """
+    Load the full itinerary for a trip.
+    
+    Args:
+        trip: Trip object (ownership already verified by the caller)
+    
+    Returns:
+        TripDetailsResponse with nested days and stops
+    """
+    day_responses = await load_trip_days(trip.id)
+    
+    return TripDetailsResponse(
+        id=trip.id,
+        name=trip.name,
+        user_id=trip.user_id,
+        start_location_text=trip.start_location_text,
+        start_latitude=float(trip.start_latitude) if trip.start_latitude else None,
+        start_longitude=float(trip.start_longitude) if trip.start_longitude else None,
+        num_days=trip.num_days,
+        trip_mode=trip.trip_mode.value,
+        budget_band=trip.budget_band.value,
+        companions=trip.companions.value if trip.companions else None,
+        status=trip.status.value,
+        cover_image_url=trip.cover_image_url,
+        days=day_responses,
+        created_at=trip.created_at.isoformat(),
+        updated_at=trip.updated_at.isoformat(),
+    )
+
+
+async def get_trip_details_for_user(
+    user_id: int,
+    trip_id: int,
+    identity_map: Optional[IdentityMap] = None,
+) -> TripDetailsResponse:
+    """
+    Get a trip's itinerary through the itinerary cache.
+    
+    Args:
+        user_id: ID of the user (to verify trip ownership)
+        trip_id: ID of the trip
+        identity_map: Optional request-scoped identity map for the ownership check
+        
+    Returns:
+        TripDetailsResponse with nested days and stops
+        
+    Raises:
+        ValueError: If trip not found or doesn't belong to user
+    """
+    cached = itinerary_cache.get(trip_id)
+    if cached and cached.user_id == user_id:
+        return cached
+    
+    # Read the version before loading so a concurrent write wins
+    version = itinerary_cache.version(trip_id)
+    
+    if identity_map:
+        trip = await identity_map.get_trip(trip_id, user_id)
+    else:
+        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+    if not trip:
+        raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
+    
+    details = await load_trip_details(trip)
+    itinerary_cache.set(trip_id, details, version)
+    return details
+
+
+def invalidate_trip_itinerary(trip_id: int) -> None:
+    """Invalidate the cached itinerary of a trip after it was modified."""
+    itinerary_cache.invalidate(trip_id)
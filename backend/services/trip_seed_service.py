@@ -6,14 +6,18 @@ This service handles the orchestration between:
 - TripSeed state management
 - Agent interaction
 """
-from typing import Optional, Any
+from typing import Any, AsyncIterator, Optional, Tuple, Union
 from pydantic import BaseModel, field_validator
+from core.models.conversation import Conversation
 from core.models.trips.trip_seed import TripSeed
 from core.models.trips.trip_seed_status import TripSeedStatus
 from core.models.trips.trip_mode import TripMode
 from core.models.trips.budget_band import BudgetBand
 from core.models.trips.companions import Companions
 from services.core.agent.conversation_service import ConversationService
+from services.core.agent.json_stream import JsonStringFieldStreamer
+from services.core.agent.llm_exceptions import LLMUnavailableError
+from services.core.agent.trip_seed_fast_path import TripSeedFastPath, trip_seed_fast_path
 from services.core.agent.trip_seed_agent_service import (
     TripSeedAgentService,
     TripSeedAgentResponse,
@@ -40,6 +44,7 @@ class TripSeedService:
         self,
         conversation_service: ConversationService,
         agent_service: TripSeedAgentService,
+        fast_path: Optional[TripSeedFastPath] = None,
     ):
         """
         Initialize the Trip Seed Service.
@@ -47,9 +52,11 @@ class TripSeedService:
         Args:
             conversation_service: Service for managing conversations
             agent_service: Trip Seed Agent service
+            fast_path: Optional rule-based responder (defaults to the shared instance)
         """
         self.conversation_service = conversation_service
         self.agent_service = agent_service
+        self.fast_path = fast_path or trip_seed_fast_path
     
     async def process_message(
         self,
@@ -77,6 +84,171 @@ class TripSeedService:
         Returns:
             ProcessMessageResponse with agent response, conversation_id, and trip_seed
         """
+        conversation, trip_seed, trip_seed_state = await self._prepare_message(
+            user_id=user_id,
+            conversation_id=conversation_id,
+        )
+        
+        # Answer simple turns without the model, otherwise process with agent
+        agent_response = await self._try_fast_path(conversation.id, message, trip_seed_state)
+        if agent_response is None:
+            try:
+                agent_response = await self.agent_service.process_with_trip_seed_state(
+                    user_message=message,
+                    conversation_id=conversation.id,
+                    trip_seed_state=trip_seed_state,
+                    user_id=user_id,
+                )
+            except LLMUnavailableError:
+                # The model is failing; keep what the rules can extract instead
+                agent_response = await self._try_fallback(conversation.id, message, trip_seed_state)
+                if agent_response is None:
+                    raise
+        
+        return await self._apply_agent_response(
+            conversation_id=conversation.id,
+            trip_seed=trip_seed,
+            trip_seed_state=trip_seed_state,
+            agent_response=agent_response,
+        )
+    
+    async def process_message_stream(
+        self,
+        user_id: int,
+        message: str,
+        conversation_id: Optional[int] = None,
+    ) -> AsyncIterator[Union[str, ProcessMessageResponse]]:
+        """
+        Streaming variant of `process_message`.
+        
+        The conversation is resolved before this method returns, so an unknown
+        conversation raises immediately. The returned iterator yields pieces of
+        the agent's response_text as the model generates them, then a final
+        ProcessMessageResponse once the TripSeed has been updated with the
+        extracted data.
+        
+        Args:
+            user_id: ID of the user
+            message: User's message
+            conversation_id: Optional conversation ID (creates new if None)
+            
+        Returns:
+            Async iterator of response_text pieces followed by a ProcessMessageResponse
+            
+        Raises:
+            ValueError: If conversation not found or doesn't belong to user
+        """
+        conversation, trip_seed, trip_seed_state = await self._prepare_message(
+            user_id=user_id,
+            conversation_id=conversation_id,
+        )
+        
+        async def stream() -> AsyncIterator[Union[str, ProcessMessageResponse]]:
+            agent_response = await self._try_fast_path(conversation.id, message, trip_seed_state)
+            if agent_response is not None:
+                yield agent_response.response_text
+            else:
+                streamer = JsonStringFieldStreamer("response_text")
+                try:
+                    async for chunk in self.agent_service.process_with_trip_seed_state_stream(
+                        user_message=message,
+                        conversation_id=conversation.id,
+                        trip_seed_state=trip_seed_state,
+                        user_id=user_id,
+                    ):
+                        if chunk.text:
+                            text = streamer.feed(chunk.text)
+                            if text:
+                                yield text
+                        if chunk.response is not None:
+                            agent_response = chunk.response
+                except LLMUnavailableError:
+                    # Raised before the model produced any text
+                    agent_response = await self._try_fallback(conversation.id, message, trip_seed_state)
+                    if agent_response is None:
+                        raise
+                    yield agent_response.response_text
+            
+            yield await self._apply_agent_response(
+                conversation_id=conversation.id,
+                trip_seed=trip_seed,
+                trip_seed_state=trip_seed_state,
+                agent_response=agent_response,
+            )
+        
+        return stream()
+    
+    async def _try_fast_path(
+        self,
+        conversation_id: int,
+        message: str,
+        trip_seed_state: dict,
+    ) -> Optional[TripSeedAgentResponse]:
+        """
+        Answer the turn with the rule-based fast path if it completes the TripSeed.
+        
+        The turn is saved to the conversation history like an agent turn.
+        
+        Returns:
+            TripSeedAgentResponse, or None if the agent must handle the message
+        """
+        agent_response = self.fast_path.respond(message, trip_seed_state)
+        if agent_response is None:
+            return None
+        
+        await self._save_turn(conversation_id, message, agent_response)
+        return agent_response
+    
+    async def _try_fallback(
+        self,
+        conversation_id: int,
+        message: str,
+        trip_seed_state: dict,
+    ) -> Optional[TripSeedAgentResponse]:
+        """
+        Answer the turn with the rule-based extractor while the model is unavailable.
+        
+        The turn is saved to the conversation history like an agent turn.
+        
+        Returns:
+            TripSeedAgentResponse, or None if nothing could be extracted
+        """
+        agent_response = self.fast_path.fallback(message, trip_seed_state)
+        if agent_response is None:
+            return None
+        
+        await self._save_turn(conversation_id, message, agent_response)
+        return agent_response
+    
+    async def _save_turn(
+        self,
+        conversation_id: int,
+        message: str,
+        agent_response: TripSeedAgentResponse,
+    ) -> None:
+        """Save a turn answered without the model to the conversation history."""
+        await self.conversation_service.add_messages(
+            conversation_id=conversation_id,
+            messages=[
+                ("user", message),
+                ("assistant", agent_response.response_text),
+            ],
+        )
+    
+    async def _prepare_message(
+        self,
+        user_id: int,
+        conversation_id: Optional[int],
+    ) -> Tuple[Conversation, Optional[TripSeed], dict]:
+        """
+        Resolve the conversation, its DRAFT TripSeed and the current state.
+        
+        Returns:
+            Tuple of (conversation, DRAFT TripSeed or None, TripSeed state dict)
+            
+        Raises:
+            ValueError: If conversation not found or doesn't belong to user
+        """
         # Get or create conversation
         if conversation_id:
             conversation = await self.conversation_service.get_conversation(
@@ -104,14 +276,21 @@ class TripSeedService:
         else:
             trip_seed_state = {}
         
-        # Process with agent
-        agent_response = await self.agent_service.process_with_trip_seed_state(
-            user_message=message,
-            conversation_id=conversation.id,
-            trip_seed_state=trip_seed_state,
-            user_id=user_id,
-        )
+        return conversation, trip_seed, trip_seed_state
+    
+    async def _apply_agent_response(
+        self,
+        conversation_id: int,
+        trip_seed: Optional[TripSeed],
+        trip_seed_state: dict,
+        agent_response: TripSeedAgentResponse,
+    ) -> ProcessMessageResponse:
+        """
+        Create or update the TripSeed from the agent's extracted data.
         
+        Returns:
+            ProcessMessageResponse with agent response, conversation_id, and trip_seed
+        """
         # Get or create TripSeed with initial extracted data
         if not trip_seed:
             # Create TripSeed with extracted data (or defaults if none)
@@ -125,7 +304,7 @@ class TripSeedService:
                 "budget_band": budget_band.value if budget_band else None,
             }
             trip_seed = await self._get_or_create_trip_seed(
-                conversation.id,
+                conversation_id,
                 initial_data=initial_data
             )
         
@@ -161,7 +340,7 @@ class TripSeedService:
         
         return ProcessMessageResponse(
             agent_response=agent_response,
-            conversation_id=conversation.id,
+            conversation_id=conversation_id,
             trip_seed=trip_seed,
         )
     
@@ -173,8 +352,9 @@ class TripSeedService:
         """
         Get existing DRAFT TripSeed or create a new one.
         
-        TripSeed requires num_days, trip_mode, and budget_band, so we only
-        create it after we have at least some data from the agent.
+        TripSeed requires num_days, trip_mode, and budget_band, so fields the
+        agent hasn't extracted yet get placeholder values. Only the extracted
+        ones are recorded in provided_fields.
         
         Args:
             conversation_id: ID of the conversation
@@ -210,6 +390,10 @@ class TripSeedService:
             num_days=num_days or 1,
             trip_mode=trip_mode or TripMode.LOCAL_HUB,
             budget_band=budget_band or BudgetBand.COMFORTABLE,
+            provided_fields=[
+                field for field in ["num_days", "trip_mode", "budget_band"]
+                if initial_data and initial_data.get(field)
+            ],
             status=TripSeedStatus.DRAFT
         )
         
@@ -225,18 +409,13 @@ class TripSeedService:
         Returns:
             Dict with TripSeed field values (None for missing/unset)
         """
-        # Check if values are "real" or just defaults
-        # We consider 0 or 1 as potentially unset for num_days
-        # For enums, we check if they're the defaults
-        
-        num_days = trip_seed.num_days
-        # If num_days is 0 or 1 and we don't have other data, consider it unset
-        # This is a heuristic - in practice, the agent will set real values
+        # Required fields the user hasn't given yet only hold placeholders
+        provided = set(trip_seed.provided_fields or [])
         
         return {
-            "num_days": num_days if num_days is not None and num_days > 0 else None,
-            "trip_mode": trip_seed.trip_mode.value if trip_seed.trip_mode else None,
-            "budget_band": trip_seed.budget_band.value if trip_seed.budget_band else None,
+            "num_days": trip_seed.num_days if "num_days" in provided else None,
+            "trip_mode": trip_seed.trip_mode.value if "trip_mode" in provided else None,
+            "budget_band": trip_seed.budget_band.value if "budget_band" in provided else None,
             "start_location_text": trip_seed.start_location_text,
             "start_latitude": float(trip_seed.start_latitude) if trip_seed.start_latitude else None,
             "start_longitude": float(trip_seed.start_longitude) if trip_seed.start_longitude else None,
@@ -259,17 +438,16 @@ class TripSeedService:
             extracted_data: TripSeedExtractedData from agent
             current_state: Current state dict (for merging logic)
         """
-        # Update num_days if extracted
-        if extracted_data.num_days is not None:
-            trip_seed.num_days = extracted_data.num_days
-        
-        # Update trip_mode if extracted
-        if extracted_data.trip_mode is not None:
-            trip_seed.trip_mode = extracted_data.trip_mode
-        
-        # Update budget_band if extracted
-        if extracted_data.budget_band is not None:
-            trip_seed.budget_band = extracted_data.budget_band
+        # Update the required fields if extracted and record them as provided
+        provided_fields = list(trip_seed.provided_fields or [])
+        for field in ["num_days", "trip_mode", "budget_band"]:
+            value = getattr(extracted_data, field)
+            if value is None:
+                continue
+            setattr(trip_seed, field, value)
+            if field not in provided_fields:
+                provided_fields.append(field)
+        trip_seed.provided_fields = provided_fields
         
         # Update start_location_text if extracted
         if extracted_data.start_location_text is not None:
@@ -4,10 +4,12 @@ Service for managing trips and active trip seeds.
 This service handles:
 - Fetching completed trips for a user
 - Fetching active trip seeds (in-progress conversations)
-- Creating trips from trip seeds
+- Creating trips (with their vibes and days) from trip seeds
 - Getting trip details with days and stops
 """
-from typing import List
+from typing import List, Optional
+from tortoise.transactions import in_transaction
+from core.identity_map import IdentityMap
 from core.models.trips.trip import Trip
 from core.models.trips.trip_seed import TripSeed
 from core.models.trips.trip_seed_status import TripSeedStatus
@@ -23,49 +25,82 @@ from dtos.trip_dto import (
     CreateTripRequest,
     TripDetailsResponse,
 )
+from services.core.pagination import fetch_page
 from services.trip_seed_service import TripSeedService
+from services.trip_day_service import get_alpena_city_id
+from services.trip_itinerary_loader import get_trip_details_for_user, invalidate_trip_itinerary
 
 
 class TripService:
     """Service for managing trips and active trip seeds."""
     
-    def __init__(self, trip_seed_service: TripSeedService):
+    def __init__(
+        self,
+        trip_seed_service: TripSeedService,
+        identity_map: Optional[IdentityMap] = None,
+    ):
         """
         Initialize the Trip Service.
         
         Args:
             trip_seed_service: Trip seed service for state conversion
+            identity_map: Request-scoped identity map (a private one is created if omitted)
         """
         self.trip_seed_service = trip_seed_service
+        self.identity_map = identity_map or IdentityMap()
     
     async def get_user_trips_and_active_seeds(
         self,
         user_id: int,
+        limit: Optional[int] = None,
+        trips_cursor: Optional[str] = None,
+        seeds_cursor: Optional[str] = None,
     ) -> TripsListResponse:
         """
-        Get all trips and active trip seeds for a user.
+        Get trips and active trip seeds for a user.
         
         Returns:
-        - Completed trips (saved trips)
-        - Active trip seeds (DRAFT or COMPLETE status conversations)
+        - Completed trips (saved trips), newest first by (created_at, id)
+        - Active trip seeds (DRAFT or COMPLETE status conversations), most
+          recently updated first by (updated_at, id)
+        
+        Both lists are keyset paginated independently: pass the
+        next_trips_cursor / next_seeds_cursor of a response to get the
+        following page of that list.
         
         Args:
             user_id: ID of the user
+            limit: Optional maximum number of trips and of seeds per page (everything if None)
+            trips_cursor: Cursor for the next page of trips
+            seeds_cursor: Cursor for the next page of active trip seeds
             
         Returns:
-            TripsListResponse with trips and active trip seeds
+            TripsListResponse with trips, active trip seeds and next-page cursors
+            
+        Raises:
+            ValueError: If a cursor is malformed
         """
-        # Get all completed trips for the user
-        trips = await Trip.filter(user_id=user_id).order_by('-created_at')
+        # Get a page of completed trips for the user
+        trips, next_trips_cursor = await fetch_page(
+            Trip.filter(user_id=user_id),
+            'created_at',
+            limit=limit,
+            cursor=trips_cursor,
+        )
         
         # Get all active trip seeds (DRAFT or COMPLETE) for the user
         # Active trip seeds are those with conversations belonging to the user
         # Use a join query to get trip seeds with their conversations
-        active_trip_seeds_raw = await TripSeed.filter(
-            conversation__user_id=user_id,
-            conversation__agent_name="trip_seed_agent",
-            status__in=[TripSeedStatus.DRAFT, TripSeedStatus.COMPLETE]
-        ).prefetch_related('conversation').order_by('-updated_at')
+        active_trip_seeds_raw, next_seeds_cursor = await fetch_page(
+            TripSeed.filter(
+                conversation__user_id=user_id,
+                conversation__agent_name="trip_seed_agent",
+                status__in=[TripSeedStatus.DRAFT, TripSeedStatus.COMPLETE]
+            ).prefetch_related('conversation'),
+            'updated_at',
+            limit=limit,
+            cursor=seeds_cursor,
+        )
         
         active_trip_seeds = []
         for trip_seed in active_trip_seeds_raw:
@@ -116,6 +151,8 @@ class TripService:
             active_trip_seeds=active_trip_seeds,
             total_trips=len(trip_responses),
             total_active=len(active_trip_seeds),
+            next_trips_cursor=next_trips_cursor,
+            next_seeds_cursor=next_seeds_cursor,
         )
     
     async def create_trip_from_seed(
@@ -149,33 +186,54 @@ class TripService:
         if trip_seed.status != TripSeedStatus.COMPLETE:
             raise ValueError(f"Trip seed {request.trip_seed_id} must be COMPLETE to create a trip. Current status: {trip_seed.status.value}")
         
-        # Create the Trip from TripSeed data with PLANNED status
-        trip = await Trip.create(
-            user_id=user_id,
-            name=request.name,
-            start_location_text=trip_seed.start_location_text,
-            start_latitude=trip_seed.start_latitude,
-            start_longitude=trip_seed.start_longitude,
-            num_days=trip_seed.num_days,
-            trip_mode=trip_seed.trip_mode,
-            budget_band=trip_seed.budget_band,
-            companions=trip_seed.companions,
-            status=TripStatus.PLANNED,
-        )
-        
-        # Copy vibes from TripSeed to Trip
         trip_seed_vibes = await TripSeedVibe.filter(trip_seed_id=trip_seed.id).all()
-        for trip_seed_vibe in trip_seed_vibes:
-            await TripVibe.create(
-                trip_id=trip.id,
-                vibe_id=trip_seed_vibe.vibe_id,
-                strength=trip_seed_vibe.strength,
+        alpena_id = await get_alpena_city_id()
+        
+        # Create the trip, its vibes and one day per num_days atomically
+        async with in_transaction() as connection:
+            # Create the Trip from TripSeed data with PLANNED status
+            trip = await Trip.create(
+                user_id=user_id,
+                name=request.name,
+                start_location_text=trip_seed.start_location_text,
+                start_latitude=trip_seed.start_latitude,
+                start_longitude=trip_seed.start_longitude,
+                num_days=trip_seed.num_days,
+                trip_mode=trip_seed.trip_mode,
+                budget_band=trip_seed.budget_band,
+                companions=trip_seed.companions,
+                status=TripStatus.PLANNED,
+                using_db=connection,
             )
-        
-        # Update TripSeed status to FINALIZED and link to trip
-        trip_seed.status = TripSeedStatus.FINALIZED
-        trip_seed.trip_id = trip.id
-        await trip_seed.save()
+            
+            # Copy vibes from TripSeed to Trip
+            if trip_seed_vibes:
+                await TripVibe.bulk_create(
+                    [
+                        TripVibe(
+                            trip_id=trip.id,
+                            vibe_id=trip_seed_vibe.vibe_id,
+                            strength=trip_seed_vibe.strength,
+                        )
+                        for trip_seed_vibe in trip_seed_vibes
+                    ],
+                    using_db=connection,
+                )
+            
+            # Create the empty days, based in Alpena by default
+            if trip.num_days:
+                await TripDay.bulk_create(
+                    [
+                        TripDay(trip_id=trip.id, day_index=day_index, base_city_id=alpena_id)
+                        for day_index in range(1, trip.num_days + 1)
+                    ],
+                    using_db=connection,
+                )
+            
+            # Update TripSeed status to FINALIZED and link to trip
+            trip_seed.status = TripSeedStatus.FINALIZED
+            trip_seed.trip_id = trip.id
+            await trip_seed.save(using_db=connection)
         
         # Return TripResponse
         return TripResponse(
@@ -213,82 +271,9 @@ class TripService:
         Raises:
             ValueError: If trip not found or doesn't belong to user
         """
-        # Import here to avoid circular dependency
-        from dtos.trip_day_dto import TripDayResponse
-        from dtos.trip_stop_dto import TripStopResponse
-        from core.models.trips.trip_day import TripDay
-        from core.models.trips.trip_stop import TripStop
-        
-        # Get trip and verify it belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
-        
-        if not trip:
-            raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
-        
-        # Get all days for this trip with their stops
-        days = await TripDay.filter(trip_id=trip_id).prefetch_related(
-            'base_city',
-            'stops__attraction'
-        ).order_by('day_index')
-        
-        # Build day responses with nested stops
-        day_responses = []
-        for day in days:
-            # Get stops for this day
-            stops = await TripStop.filter(trip_day_id=day.id).prefetch_related(
-                'attraction'
-            ).order_by('order_index')
-            
-            # Build stop responses
-            stop_responses = []
-            for stop in stops:
-                stop_responses.append(
-                    TripStopResponse(
-                        id=stop.id,
-                        trip_day_id=stop.trip_day_id,
-                        attraction_id=stop.attraction_id,
-                        attraction_name=stop.attraction.name if stop.attraction else None,
-                        attraction_type=stop.attraction.type if stop.attraction else None,
-                        label=stop.label,
-                        slot=stop.slot.value,
-                        order_index=stop.order_index,
-                        created_at=stop.created_at.isoformat(),
-                        updated_at=stop.updated_at.isoformat(),
-                    )
-                )
-            
-            day_responses.append(
-                TripDayResponse(
-                    id=day.id,
-                    trip_id=day.trip_id,
-                    day_index=day.day_index,
-                    base_city_id=day.base_city_id,
-                    base_city_name=day.base_city.name if day.base_city else None,
-                    notes=day.notes,
-                    stops=stop_responses,
-                    created_at=day.created_at.isoformat(),
-                    updated_at=day.updated_at.isoformat(),
-                )
-            )
-        
-        # Return trip details response
-        return TripDetailsResponse(
-            id=trip.id,
-            name=trip.name,
-            user_id=trip.user_id,
-            start_location_text=trip.start_location_text,
-            start_latitude=float(trip.start_latitude) if trip.start_latitude else None,
-            start_longitude=float(trip.start_longitude) if trip.start_longitude else None,
-            num_days=trip.num_days,
-            trip_mode=trip.trip_mode.value,
-            budget_band=trip.budget_band.value,
-            companions=trip.companions.value if trip.companions else None,
-            status=trip.status.value,
-            cover_image_url=trip.cover_image_url,
-            days=day_responses,
-            created_at=trip.created_at.isoformat(),
-            updated_at=trip.updated_at.isoformat(),
-        )
+        # Served from the itinerary cache; misses load days, stops and
+        # attractions in a fixed number of queries
+        return await get_trip_details_for_user(user_id, trip_id, self.identity_map)
     
     async def finalize_trip(
         self,
@@ -316,7 +301,7 @@ class TripService:
         from core.models.trips.trip_stop import TripStop
         
         # Get trip and verify it belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+        trip = await self.identity_map.get_trip(trip_id, user_id)
         if not trip:
             raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
         
@@ -378,13 +363,14 @@ class TripService:
             ValueError: If trip not found or doesn't belong to user
         """
         # Get trip and verify it belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+        trip = await self.identity_map.get_trip(trip_id, user_id)
         if not trip:
             raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
         
         # Update status to COMPLETED
         trip.status = TripStatus.COMPLETED
         await trip.save()
+        invalidate_trip_itinerary(trip_id)
         
         # Return updated trip response
         return TripResponse(
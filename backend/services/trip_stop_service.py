@@ -1,9 +1,12 @@
 """
 Service for managing trip stops.
 
-This service handles CRUD operations for TripStops.
+This service handles CRUD operations for TripStops and batch itinerary edits.
 """
-from typing import List
+from typing import Any, Dict, List, Optional, Set, Tuple
+from tortoise import timezone
+from tortoise.transactions import in_transaction
+from core.identity_map import IdentityMap
 from core.models.trips.trip import Trip
 from core.models.trips.trip_day import TripDay
 from core.models.trips.trip_stop import TripStop
@@ -14,12 +17,40 @@ from dtos.trip_stop_dto import (
     CreateTripStopRequest,
     UpdateTripStopRequest,
     ReorderStopsRequest,
+    BatchStopOperationsRequest,
 )
+from dtos.trip_day_dto import TripDayResponse
+from services.core.bulk_update import bulk_update_rows
+from services.trip_itinerary_loader import (
+    load_trip_days,
+    build_trip_stop_response,
+    get_trip_details_for_user,
+    invalidate_trip_itinerary,
+)
+
+STOP_OPERATIONS = ("create", "update", "delete", "move")
+
+
+def _parse_slot(slot: Optional[str]) -> TripStopSlot:
+    """Parse a slot name, raising ValueError for unknown slots."""
+    try:
+        return TripStopSlot(slot)
+    except ValueError:
+        raise ValueError(f"Invalid slot: {slot}. Must be one of: morning, afternoon, evening, flex")
 
 
 class TripStopService:
     """Service for managing trip stops."""
     
+    def __init__(self, identity_map: Optional[IdentityMap] = None):
+        """
+        Initialize the Trip Stop Service.
+        
+        Args:
+            identity_map: Request-scoped identity map (a private one is created if omitted)
+        """
+        self.identity_map = identity_map or IdentityMap()
+    
     async def get_trip_stops(
         self,
         user_id: int,
@@ -40,40 +71,15 @@ class TripStopService:
         Raises:
             ValueError: If trip/day not found or doesn't belong to user
         """
-        # Verify trip belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
-        if not trip:
-            raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
+        # Verifies trip ownership and serves the itinerary from the cache
+        details = await get_trip_details_for_user(user_id, trip_id, self.identity_map)
         
         # Verify day belongs to trip
-        day = await TripDay.filter(id=day_id, trip_id=trip_id).first()
+        day = next((d for d in details.days if d.id == day_id), None)
         if not day:
             raise ValueError(f"Day {day_id} not found or doesn't belong to trip {trip_id}")
         
-        # Get all stops for this day
-        stops = await TripStop.filter(trip_day_id=day_id).prefetch_related(
-            'attraction'
-        ).order_by('order_index')
-        
-        # Build stop responses
-        stop_responses = []
-        for stop in stops:
-            stop_responses.append(
-                TripStopResponse(
-                    id=stop.id,
-                    trip_day_id=stop.trip_day_id,
-                    attraction_id=stop.attraction_id,
-                    attraction_name=stop.attraction.name if stop.attraction else None,
-                    attraction_type=stop.attraction.type if stop.attraction else None,
-                    label=stop.label,
-                    slot=stop.slot.value,
-                    order_index=stop.order_index,
-                    created_at=stop.created_at.isoformat(),
-                    updated_at=stop.updated_at.isoformat(),
-                )
-            )
-        
-        return stop_responses
+        return day.stops
     
     async def create_trip_stop(
         self,
@@ -98,12 +104,12 @@ class TripStopService:
             ValueError: If trip/day not found, doesn't belong to user, or validation fails
         """
         # Verify trip belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+        trip = await self.identity_map.get_trip(trip_id, user_id)
         if not trip:
             raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
         
         # Verify day belongs to trip
-        day = await TripDay.filter(id=day_id, trip_id=trip_id).first()
+        day = await self.identity_map.get_trip_day(day_id, trip_id)
         if not day:
             raise ValueError(f"Day {day_id} not found or doesn't belong to trip {trip_id}")
         
@@ -113,15 +119,12 @@ class TripStopService:
         
         # Verify attraction_id if provided
         if request.attraction_id:
-            attraction = await Attraction.filter(id=request.attraction_id).first()
+            attraction = await self.identity_map.get_attraction(request.attraction_id)
             if not attraction:
                 raise ValueError(f"Attraction {request.attraction_id} not found")
         
         # Validate slot
-        try:
-            slot = TripStopSlot(request.slot)
-        except ValueError:
-            raise ValueError(f"Invalid slot: {request.slot}. Must be one of: morning, afternoon, evening, flex")
+        slot = _parse_slot(request.slot)
         
         # Check for duplicate attraction in the same day
         if request.attraction_id:
@@ -141,6 +144,8 @@ class TripStopService:
             order_index=request.order_index,
         )
         
+        invalidate_trip_itinerary(trip_id)
+        
         # Reload with relations
         await stop.fetch_related('attraction')
         
@@ -183,12 +188,12 @@ class TripStopService:
             ValueError: If trip/day/stop not found, doesn't belong to user, or validation fails
         """
         # Verify trip belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+        trip = await self.identity_map.get_trip(trip_id, user_id)
         if not trip:
             raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
         
         # Verify day belongs to trip
-        day = await TripDay.filter(id=day_id, trip_id=trip_id).first()
+        day = await self.identity_map.get_trip_day(day_id, trip_id)
         if not day:
             raise ValueError(f"Day {day_id} not found or doesn't belong to trip {trip_id}")
         
@@ -200,7 +205,7 @@ class TripStopService:
         # Update attraction_id if provided
         if request.attraction_id is not None:
             if request.attraction_id:
-                attraction = await Attraction.filter(id=request.attraction_id).first()
+                attraction = await self.identity_map.get_attraction(request.attraction_id)
                 if not attraction:
                     raise ValueError(f"Attraction {request.attraction_id} not found")
             stop.attraction_id = request.attraction_id
@@ -211,11 +216,7 @@ class TripStopService:
         
         # Update slot if provided
         if request.slot is not None:
-            try:
-                slot = TripStopSlot(request.slot)
-            except ValueError:
-                raise ValueError(f"Invalid slot: {request.slot}. Must be one of: morning, afternoon, evening, flex")
-            stop.slot = slot
+            stop.slot = _parse_slot(request.slot)
         
         # Update order_index if provided
         if request.order_index is not None:
@@ -226,6 +227,7 @@ class TripStopService:
             raise ValueError("Either attraction_id or label must be provided")
         
         await stop.save()
+        invalidate_trip_itinerary(trip_id)
         await stop.fetch_related('attraction')
         
         # Return response
@@ -262,12 +264,12 @@ class TripStopService:
             ValueError: If trip/day/stop not found or doesn't belong to user
         """
         # Verify trip belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+        trip = await self.identity_map.get_trip(trip_id, user_id)
         if not trip:
             raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
         
         # Verify day belongs to trip
-        day = await TripDay.filter(id=day_id, trip_id=trip_id).first()
+        day = await self.identity_map.get_trip_day(day_id, trip_id)
         if not day:
             raise ValueError(f"Day {day_id} not found or doesn't belong to trip {trip_id}")
         
@@ -278,6 +280,7 @@ class TripStopService:
         
         # Delete the stop
         await stop.delete()
+        invalidate_trip_itinerary(trip_id)
     
     async def reorder_stops(
         self,
@@ -289,6 +292,10 @@ class TripStopService:
         """
         Reorder stops within a day.
         
+        The stops are locked, checked for order_index conflicts and updated
+        with a single UPDATE in one transaction, so the cost doesn't grow
+        with the number of stops moved.
+        
         Args:
             user_id: ID of the user
             trip_id: ID of the trip
@@ -299,57 +306,210 @@ class TripStopService:
             List of TripStopResponse objects in new order
             
         Raises:
-            ValueError: If trip/day not found, doesn't belong to user, or validation fails
+            ValueError: If trip/day not found, doesn't belong to user, stops would
+                share an order_index, or validation fails
         """
         # Verify trip belongs to user
-        trip = await Trip.filter(id=trip_id, user_id=user_id).first()
+        trip = await self.identity_map.get_trip(trip_id, user_id)
         if not trip:
             raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
         
         # Verify day belongs to trip
-        day = await TripDay.filter(id=day_id, trip_id=trip_id).first()
+        day = await self.identity_map.get_trip_day(day_id, trip_id)
         if not day:
             raise ValueError(f"Day {day_id} not found or doesn't belong to trip {trip_id}")
         
-        # Validate that all stop_ids belong to this day
-        stop_ids = [item.stop_id for item in request.stop_orders]
-        existing_stops = await TripStop.filter(
-            id__in=stop_ids,
-            trip_day_id=day_id
-        ).all()
+        stop_map = {item.stop_id: item.order_index for item in request.stop_orders}
+        if len(stop_map) != len(request.stop_orders):
+            raise ValueError("Each stop may only appear once in a reorder request")
+        
+        async with in_transaction() as connection:
+            # Lock the day's stops so concurrent edits can't interleave with the check
+            stops = await TripStop.filter(trip_day_id=day_id).select_for_update().using_db(
+                connection
+            ).prefetch_related('attraction')
+            
+            # Validate that all stop_ids belong to this day
+            stops_by_id = {stop.id: stop for stop in stops}
+            if any(stop_id not in stops_by_id for stop_id in stop_map):
+                raise ValueError("One or more stop IDs do not belong to this day")
+            
+            # Check the resulting order for order_index conflicts
+            stop_ids_by_order: Dict[int, List[int]] = {}
+            for stop in stops:
+                stop_ids_by_order.setdefault(stop_map.get(stop.id, stop.order_index), []).append(stop.id)
+            for order_index, stop_ids in stop_ids_by_order.items():
+                if len(stop_ids) > 1 and any(stop_id in stop_map for stop_id in stop_ids):
+                    raise ValueError(f"Stops {', '.join(map(str, stop_ids))} would share order_index {order_index}")
+            
+            # Update order_index for every moved stop in a single statement
+            now = timezone.now()
+            moved = {
+                stop_id: {'order_index': order_index, 'updated_at': now}
+                for stop_id, order_index in stop_map.items()
+                if stops_by_id[stop_id].order_index != order_index
+            }
+            await bulk_update_rows(TripStop, moved, using_db=connection)
+        
+        invalidate_trip_itinerary(trip_id)
+        
+        # Apply the new order to the loaded stops instead of re-querying
+        for stop_id, values in moved.items():
+            stops_by_id[stop_id].order_index = values['order_index']
+            stops_by_id[stop_id].updated_at = now
+        
+        return [
+            build_trip_stop_response(stop)
+            for stop in sorted(stops, key=lambda stop: (stop.order_index, stop.id))
+        ]
+    
+    async def apply_stop_operations(
+        self,
+        user_id: int,
+        trip_id: int,
+        request: BatchStopOperationsRequest,
+    ) -> List[TripDayResponse]:
+        """
+        Apply a batch of stop operations across the days of a trip.
         
-        if len(existing_stops) != len(stop_ids):
-            raise ValueError("One or more stop IDs do not belong to this day")
+        Operations are applied in order to an in-memory copy of the trip's
+        stops, so later operations see the effect of earlier ones. The trip
+        row and its stops are locked and read inside one transaction, the
+        whole batch is validated on that copy, and then saved with one bulk
+        statement per kind of change. Updates only write the columns the
+        batch changed.
         
-        # Update order_index for each stop
-        stop_map = {item.stop_id: item.order_index for item in request.stop_orders}
-        for stop in existing_stops:
-            if stop.id in stop_map:
-                stop.order_index = stop_map[stop.id]
-                await stop.save()
-        
-        # Reload all stops with relations and return in new order
-        stops = await TripStop.filter(trip_day_id=day_id).prefetch_related(
-            'attraction'
-        ).order_by('order_index')
-        
-        # Build stop responses
-        stop_responses = []
-        for stop in stops:
-            stop_responses.append(
-                TripStopResponse(
-                    id=stop.id,
-                    trip_day_id=stop.trip_day_id,
-                    attraction_id=stop.attraction_id,
-                    attraction_name=stop.attraction.name if stop.attraction else None,
-                    attraction_type=stop.attraction.type if stop.attraction else None,
-                    label=stop.label,
-                    slot=stop.slot.value,
-                    order_index=stop.order_index,
-                    created_at=stop.created_at.isoformat(),
-                    updated_at=stop.updated_at.isoformat(),
-                )
+        Supported operations:
+        - create: day_id, slot, order_index and attraction_id or label
+        - update: stop_id plus any of attraction_id, label, slot, order_index
+        - move: stop_id, day_id and optionally order_index
+        - delete: stop_id
+        
+        Args:
+            user_id: ID of the user
+            trip_id: ID of the trip
+            request: BatchStopOperationsRequest with the operations to apply
+            
+        Returns:
+            List of TripDayResponse objects for every day the batch touched
+            
+        Raises:
+            ValueError: If trip/day/stop/attraction not found, doesn't belong to user, or validation fails
+        """
+        if not request.operations:
+            return []
+        
+        # Verify trip belongs to user (once for the whole batch)
+        trip = await self.identity_map.get_trip(trip_id, user_id)
+        if not trip:
+            raise ValueError(f"Trip {trip_id} not found or doesn't belong to user")
+        
+        # Verify every referenced attraction in one query
+        attraction_ids = {operation.attraction_id for operation in request.operations if operation.attraction_id}
+        if attraction_ids:
+            found_ids = set(await Attraction.filter(id__in=attraction_ids).values_list('id', flat=True))
+            missing_ids = attraction_ids - found_ids
+            if missing_ids:
+                raise ValueError(f"Attraction {min(missing_ids)} not found")
+        
+        async with in_transaction() as connection:
+            # Lock the trip so concurrent batches (and day creation) queue behind this one
+            await Trip.filter(id=trip_id).select_for_update().using_db(connection).first()
+            
+            # Load the trip's days and stops once, locking the stops against
+            # single-stop edits and reorders until the batch is written
+            day_ids = set(
+                await TripDay.filter(trip_id=trip_id).using_db(connection).values_list('id', flat=True)
             )
+            stops: Dict[int, TripStop] = {
+                stop.id: stop
+                for stop in await TripStop.filter(trip_day_id__in=day_ids).select_for_update().using_db(connection)
+            } if day_ids else {}
+            
+            def verify_day(day_id: Optional[int]) -> int:
+                if day_id not in day_ids:
+                    raise ValueError(f"Day {day_id} not found or doesn't belong to trip {trip_id}")
+                return day_id
+            
+            created_stops: List[TripStop] = []
+            changes: Dict[int, Dict[str, Any]] = {}
+            deleted_ids: Set[int] = set()
+            touched_day_ids: Set[int] = set()
+            
+            def change(stop: TripStop, field_name: str, value: Any) -> None:
+                setattr(stop, field_name, value)
+                changes.setdefault(stop.id, {})[field_name] = value
+            
+            for operation in request.operations:
+                if operation.op not in STOP_OPERATIONS:
+                    raise ValueError(
+                        f"Invalid operation: {operation.op}. Must be one of: {', '.join(STOP_OPERATIONS)}"
+                    )
+                
+                if operation.op == "create":
+                    day_id = verify_day(operation.day_id)
+                    if not operation.attraction_id and not operation.label:
+                        raise ValueError("Either attraction_id or label must be provided")
+                    if operation.order_index is None:
+                        raise ValueError("order_index is required to create a stop")
+                    created_stops.append(
+                        TripStop(
+                            trip_day_id=day_id,
+                            attraction_id=operation.attraction_id,
+                            label=operation.label,
+                            slot=_parse_slot(operation.slot),
+                            order_index=operation.order_index,
+                        )
+                    )
+                    touched_day_ids.add(day_id)
+                    continue
+                
+                stop = stops.get(operation.stop_id)
+                if not stop or stop.id in deleted_ids:
+                    raise ValueError(f"Stop {operation.stop_id} not found or doesn't belong to trip {trip_id}")
+                touched_day_ids.add(stop.trip_day_id)
+                
+                if operation.op == "delete":
+                    deleted_ids.add(stop.id)
+                    changes.pop(stop.id, None)
+                    continue
+                
+                if operation.op == "move":
+                    change(stop, 'trip_day_id', verify_day(operation.day_id))
+                    touched_day_ids.add(stop.trip_day_id)
+                else:
+                    if operation.attraction_id is not None:
+                        change(stop, 'attraction_id', operation.attraction_id or None)
+                    if operation.label is not None:
+                        change(stop, 'label', operation.label)
+                    if operation.slot is not None:
+                        change(stop, 'slot', _parse_slot(operation.slot))
+                    if not stop.attraction_id and not stop.label:
+                        raise ValueError("Either attraction_id or label must be provided")
+                
+                if operation.order_index is not None:
+                    change(stop, 'order_index', operation.order_index)
+            
+            # An attraction may only appear once per day; only stops this batch
+            # created or changed can introduce a duplicate
+            stops_by_attraction: Dict[Tuple[int, int], List[TripStop]] = {}
+            remaining_stops = [stop for stop in stops.values() if stop.id not in deleted_ids] + created_stops
+            for stop in remaining_stops:
+                if stop.attraction_id:
+                    stops_by_attraction.setdefault((stop.trip_day_id, stop.attraction_id), []).append(stop)
+            for same_attraction in stops_by_attraction.values():
+                if len(same_attraction) > 1 and any(
+                    stop.id is None or stop.id in changes for stop in same_attraction
+                ):
+                    raise ValueError("This activity is already added to this day")
+            
+            if deleted_ids:
+                await TripStop.filter(id__in=deleted_ids).using_db(connection).delete()
+            await bulk_update_rows(TripStop, changes, using_db=connection)
+            if created_stops:
+                await TripStop.bulk_create(created_stops, using_db=connection)
         
-        return stop_responses
-
+        invalidate_trip_itinerary(trip_id)
+        
+        # Return every touched day (including days that are now empty)
+        return await load_trip_days(trip_id, day_ids=sorted(touched_day_ids))
@@ -5,8 +5,12 @@ Note: Database operations are mocked in tests to avoid storing data.
 Only IBM WatsonX API calls are real.
 """
 import pytest
+import pytest_asyncio
 import os
+from decimal import Decimal
+from types import SimpleNamespace
 from dotenv import load_dotenv
+from tortoise import Tortoise
 
 # Load environment variables from .env file
 load_dotenv()
@@ -104,3 +108,67 @@ def watsonx_credentials():
         "url": url,
     }
 
+
+@pytest_asyncio.fixture
+async def memory_db():
+    """
+    In-memory SQLite database with the full schema, for service tests.
+    
+    Each test gets a fresh database; the shared itinerary cache is cleared
+    because ids restart at 1.
+    """
+    from services.core.itinerary_cache import itinerary_cache
+    
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["core.models"]})
+    await Tortoise.generate_schemas()
+    itinerary_cache.clear()
+    
+    yield
+    
+    await Tortoise.close_connections()
+
+
+@pytest_asyncio.fixture
+async def seeded_trip(memory_db):
+    """
+    A trip with two days; day 1 has three stops (order 0, 1, 2).
+    
+    Also creates another user's trip with one day and one stop.
+    """
+    from core.models import User, City, Attraction, Trip, TripDay, TripStop
+    from core.models.trips import TripMode, BudgetBand, TripStopSlot
+    
+    user = await User.create(email="owner@example.com", password_hash="x", full_name="Owner")
+    other_user = await User.create(email="other@example.com", password_hash="x", full_name="Other")
+    city = await City.create(name="Alpena", slug="alpena", latitude=Decimal("45.0617"), longitude=Decimal("-83.4327"))
+    attractions = [
+        await Attraction.create(city=city, name=f"Attraction {i}", type="park",
+                                latitude=Decimal("45.06"), longitude=Decimal("-83.43"))
+        for i in range(4)
+    ]
+    
+    trip = await Trip.create(user=user, name="Lakes", num_days=2,
+                             trip_mode=TripMode.ROAD_TRIP, budget_band=BudgetBand.COMFORTABLE)
+    days = [await TripDay.create(trip=trip, day_index=i, base_city=city) for i in (1, 2)]
+    stops = [
+        await TripStop.create(trip_day=days[0], attraction=attractions[i], slot=TripStopSlot.MORNING, order_index=i)
+        for i in range(3)
+    ]
+    
+    other_trip = await Trip.create(user=other_user, name="Other", num_days=1,
+                                   trip_mode=TripMode.LOCAL_HUB, budget_band=BudgetBand.RELAXED)
+    other_day = await TripDay.create(trip=other_trip, day_index=1, base_city=city)
+    other_stop = await TripStop.create(trip_day=other_day, label="Elsewhere", slot=TripStopSlot.FLEX, order_index=0)
+    
+    return SimpleNamespace(
+        user=user,
+        other_user=other_user,
+        city=city,
+        attractions=attractions,
+        trip=trip,
+        days=days,
+        stops=stops,
+        other_trip=other_trip,
+        other_day=other_day,
+        other_stop=other_stop,
+    )
@@ -0,0 +1,87 @@
+"""
+Unit tests for the in-memory attraction catalog.
+
+The catalog snapshot is built from plain objects, so no database is needed.
+"""
+import pytest
+from types import SimpleNamespace
+from services.core.catalog.attraction_catalog import AttractionCatalog, _CatalogSnapshot
+
+
+def build_catalog() -> AttractionCatalog:
+    """Build a catalog with three attractions and two vibes."""
+    attractions = [
+        SimpleNamespace(id=1, name="Alpena", latitude=45.0617, longitude=-83.4327),
+        SimpleNamespace(id=2, name="Rogers City", latitude=45.4214, longitude=-83.8183),
+        SimpleNamespace(id=3, name="Detroit", latitude=42.3314, longitude=-83.0458),
+    ]
+    vibes = [SimpleNamespace(id=10, code="lakeside"), SimpleNamespace(id=20, code="foodie")]
+    links = [
+        (1, 10, 0.9),
+        (2, 10, 0.2),
+        (2, 20, 1.0),
+        # Attraction 3 has no vibes and must never be returned
+    ]
+    
+    catalog = AttractionCatalog(ttl_seconds=0)
+    catalog._snapshot = _CatalogSnapshot(attractions, vibes, links)
+    catalog._stale = False
+    return catalog
+
+
+@pytest.mark.asyncio
+async def test_top_k_scores_by_weighted_vibes():
+    """Scores are strength x weight summed over requested vibes, best first."""
+    catalog = build_catalog()
+    
+    entries = await catalog.top_k({10: 1.0, 20: 0.5})
+    
+    assert [e.attraction.id for e in entries] == [1, 2]
+    assert entries[0].score == pytest.approx(0.9)
+    assert entries[1].score == pytest.approx(0.2 + 0.5)
+    assert [(v.id, s) for v, s in entries[1].vibes] == [(10, pytest.approx(0.2)), (20, pytest.approx(1.0))]
+
+
+@pytest.mark.asyncio
+async def test_top_k_limits_and_filters_candidates():
+    """Only attractions with a requested vibe are candidates, and k is honoured."""
+    catalog = build_catalog()
+    
+    entries = await catalog.top_k({20: 1.0}, k=1)
+    
+    assert [e.attraction.id for e in entries] == [2]
+    assert await catalog.top_k({999: 1.0}) == []
+
+
+@pytest.mark.asyncio
+async def test_top_k_breaks_ties_by_id():
+    """Equal scores keep id order, including at the k boundary."""
+    attractions = [
+        SimpleNamespace(id=i, name=f"Attraction {i}", latitude=45.0, longitude=-83.0)
+        for i in range(1, 41)
+    ]
+    vibes = [SimpleNamespace(id=10, code="lakeside")]
+    # Integer strengths 1-3, so most scores are tied
+    links = [(i, 10, float(1 + (i * 7) % 3)) for i in range(1, 41)]
+    catalog = AttractionCatalog(ttl_seconds=0)
+    catalog._snapshot = _CatalogSnapshot(attractions, vibes, links)
+    catalog._stale = False
+    expected = [i for _, i in sorted((-strength, i) for i, _, strength in links)]
+    
+    for k in (None, 1, 5, 13, 14, 20, 39):
+        entries = await catalog.top_k({10: 1.0}, k=k)
+        assert [e.attraction.id for e in entries] == expected[:k]
+
+
+@pytest.mark.asyncio
+async def test_nearest_orders_by_distance_and_honours_radius():
+    """Spatial queries return the closest attractions first, within the radius."""
+    catalog = build_catalog()
+    
+    entries = await catalog.nearest(45.06, -83.43, k=3)
+    assert [e.attraction.id for e in entries] == [1, 2, 3]
+    assert entries[0].distance_km < 1
+    assert 40 < entries[1].distance_km < 60
+    
+    entries = await catalog.nearest(45.06, -83.43, k=3, radius_km=100)
+    assert [e.attraction.id for e in entries] == [1, 2]
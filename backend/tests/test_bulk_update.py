@@ -0,0 +1,55 @@
+"""
+Tests for set-based multi-row updates, on an in-memory SQLite database.
+"""
+import asyncio
+import pytest
+from tortoise import connections
+from core.models import TripStop
+from core.models.trips import TripStopSlot
+from services.core.bulk_update import bulk_update_rows
+
+
+@pytest.mark.asyncio
+async def test_updates_enums_nulls_and_keeps_missing_fields(seeded_trip):
+    """Each row gets its own values; fields a row doesn't name are left alone."""
+    first, second, third = seeded_trip.stops
+    
+    updated = await bulk_update_rows(
+        TripStop,
+        {
+            first.id: {"slot": TripStopSlot.EVENING, "order_index": 5},
+            second.id: {"attraction_id": None, "label": "Picnic"},
+        },
+    )
+    
+    assert updated == 2
+    first_row, second_row, third_row = [await TripStop.get(id=stop.id) for stop in (first, second, third)]
+    assert (first_row.slot, first_row.order_index) == (TripStopSlot.EVENING, 5)
+    assert first_row.attraction_id == first.attraction_id
+    assert (second_row.attraction_id, second_row.label) == (None, "Picnic")
+    assert (second_row.slot, second_row.order_index) == (TripStopSlot.MORNING, 1)
+    assert third_row.order_index == 2
+
+
+@pytest.mark.asyncio
+async def test_bumps_updated_at_on_updated_rows_only(seeded_trip):
+    """updated_at is set on every updated row, like save() would."""
+    first, second, _ = seeded_trip.stops
+    await asyncio.sleep(0.01)
+    
+    await bulk_update_rows(TripStop, {first.id: {"order_index": 7}})
+    
+    assert (await TripStop.get(id=first.id)).updated_at > first.updated_at
+    assert (await TripStop.get(id=second.id)).updated_at == second.updated_at
+
+
+@pytest.mark.asyncio
+async def test_empty_rows_run_no_query(seeded_trip, monkeypatch):
+    """Nothing to update means no statement at all."""
+    connection = connections.get("default")
+    
+    async def fail(*args, **kwargs):
+        raise AssertionError("no query expected")
+    
+    monkeypatch.setattr(connection, "execute_query", fail)
+    assert await bulk_update_rows(TripStop, {}) == 0
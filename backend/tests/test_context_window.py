@@ -0,0 +1,105 @@
+"""
+Unit tests for the truncated transcript tail of older conversation turns.
+"""
+from types import SimpleNamespace
+import pytest
+from core.models.conversation import Conversation
+from services.core.agent.context_window import ContextWindowManager, estimate_tokens
+from services.core.agent.conversation_service import ConversationService
+
+
+def make_message(role, content):
+    return SimpleNamespace(role=role, content=content)
+
+
+def test_transcript_tail_truncates_lines_and_keeps_newest_within_budget():
+    """Long messages are cut and the oldest lines are dropped once over budget."""
+    manager = ContextWindowManager(conversation_service=None, summary_token_budget=20)
+    
+    tail = manager.fold_transcript_tail(None, [
+        make_message("user", "I want  a\n3-day trip"),
+        make_message("assistant", "Great!"),
+    ])
+    assert tail == "User: I want a 3-day trip\nAssistant: Great!"
+    
+    tail = manager.fold_transcript_tail(tail, [
+        make_message("user", "Make it a road trip from Detroit"),
+        make_message("assistant", "x" * 500),
+    ])
+    lines = tail.split("\n")
+    assert lines[-1].startswith("Assistant: xxx") and lines[-1].endswith("...")
+    assert "User: I want a 3-day trip" not in lines
+    assert len(lines) == 1 or estimate_tokens(tail) <= 20
+
+
+async def add_turns(service: ConversationService, conversation_id: int, turns: range, length: int = 20) -> None:
+    for turn in turns:
+        await service.add_messages(conversation_id, [
+            ("user", f"question {turn} ".ljust(length, "q")),
+            ("assistant", f"answer {turn} ".ljust(length, "a")),
+        ])
+
+
+@pytest.mark.asyncio
+async def test_window_stays_bounded_as_the_conversation_grows(memory_db):
+    """Only the last max_turns turns are sent; older messages are folded exactly once."""
+    service = ConversationService()
+    manager = ContextWindowManager(service, max_turns=3, token_budget=10_000, summary_token_budget=2_000)
+    conversation = await service.create_conversation(user_id=1)
+    
+    for turn in range(12):
+        await add_turns(service, conversation.id, range(turn, turn + 1))
+        context = await manager.get_context(conversation.id)
+        stored = await Conversation.get(id=conversation.id)
+        
+        message_count = 2 * (turn + 1)
+        assert len(context.messages) == min(message_count, 6)
+        assert [msg.sequence_index for msg in context.messages] == list(
+            range(message_count - len(context.messages), message_count)
+        )
+        assert stored.summary_message_count == context.messages[0].sequence_index
+        assert stored.summary == context.summary
+    
+    lines = context.summary.split("\n")
+    assert len(lines) == 18
+    assert lines[0].startswith("User: question 0") and lines[-1].startswith("Assistant: answer 8")
+
+
+@pytest.mark.asyncio
+async def test_token_budget_leaves_room_for_the_prompt(memory_db):
+    """Reserved tokens and the tail's budget shrink the verbatim window."""
+    service = ConversationService()
+    # Each message is ~100 tokens; 300 tokens are left for history with nothing reserved
+    manager = ContextWindowManager(service, max_turns=6, token_budget=400, summary_token_budget=100)
+    conversation = await service.create_conversation(user_id=1)
+    await add_turns(service, conversation.id, range(4), length=400)
+    
+    context = await manager.get_context(conversation.id, reserved_tokens=100)
+    assert [msg.sequence_index for msg in context.messages] == [6, 7]
+    assert (await Conversation.get(id=conversation.id)).summary_message_count == 6
+    
+    # A smaller prompt doesn't unfold messages already folded
+    context = await manager.get_context(conversation.id, reserved_tokens=0)
+    assert [msg.sequence_index for msg in context.messages] == [6, 7]
+    
+    # A single message larger than the budget is still sent
+    context = await manager.get_context(conversation.id, reserved_tokens=1_000)
+    assert [msg.sequence_index for msg in context.messages] == [7]
+    assert (await Conversation.get(id=conversation.id)).summary_message_count == 7
+
+
+@pytest.mark.asyncio
+async def test_recent_messages_already_folded(memory_db):
+    """When every recent message is folded only the tail is returned, unchanged."""
+    service = ConversationService()
+    manager = ContextWindowManager(service, max_turns=2, token_budget=10_000, summary_token_budget=2_000)
+    conversation = await service.create_conversation(user_id=1)
+    await add_turns(service, conversation.id, range(3))
+    await service.update_summary(conversation.id, summary="User: everything so far", summary_message_count=6)
+    
+    context = await manager.get_context(conversation.id)
+    
+    assert context.summary == "User: everything so far" and context.messages == []
+    stored = await Conversation.get(id=conversation.id)
+    assert (stored.summary, stored.summary_message_count) == ("User: everything so far", 6)
+    assert (await manager.get_context(999)).messages == []
@@ -0,0 +1,54 @@
+"""
+Tests for conversation message storage, on an in-memory SQLite database.
+"""
+import asyncio
+import pytest
+from core.models.conversation import Conversation, Message
+from services.core.agent.conversation_service import ConversationService
+
+
+@pytest.mark.asyncio
+async def test_concurrent_turns_get_contiguous_unique_indexes(memory_db):
+    """Turns saved concurrently never share or skip sequence indexes."""
+    service = ConversationService()
+    conversation = await service.create_conversation(user_id=1, agent_name="trip_seed_agent")
+    
+    await asyncio.gather(*(
+        service.add_messages(conversation.id, [("user", f"question {turn}"), ("assistant", f"answer {turn}")])
+        for turn in range(10)
+    ))
+    
+    messages = await Message.filter(conversation_id=conversation.id).order_by("sequence_index")
+    assert [message.sequence_index for message in messages] == list(range(20))
+    # Each turn's two messages are adjacent and in order
+    for user_message, assistant_message in zip(messages[::2], messages[1::2]):
+        assert (user_message.role, assistant_message.role) == ("user", "assistant")
+        assert user_message.content.split()[-1] == assistant_message.content.split()[-1]
+    assert (await Conversation.get(id=conversation.id)).message_count == 20
+
+
+@pytest.mark.asyncio
+async def test_add_message_continues_after_a_batch(memory_db):
+    """Single messages take the next index after a saved turn."""
+    service = ConversationService()
+    conversation = await service.create_conversation(user_id=1)
+    
+    await service.add_messages(conversation.id, [("user", "hi"), ("assistant", "hello")])
+    message = await service.add_message(conversation.id, "user", "3 days")
+    await service.add_messages(conversation.id, [])
+    
+    assert message.sequence_index == 2
+    assert (await Conversation.get(id=conversation.id)).message_count == 3
+
+
+@pytest.mark.asyncio
+async def test_unknown_conversation_raises(memory_db):
+    """Adding messages to a missing conversation raises ValueError and writes nothing."""
+    service = ConversationService()
+    
+    with pytest.raises(ValueError, match="Conversation 999 not found"):
+        await service.add_messages(999, [("user", "hi"), ("assistant", "hello")])
+    with pytest.raises(ValueError, match="Conversation 999 not found"):
+        await service.add_message(999, "user", "hi")
+    
+    assert await Message.all().count() == 0
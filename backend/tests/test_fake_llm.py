@@ -0,0 +1,85 @@
+"""
+Unit tests for the local fake chat model backend.
+"""
+import asyncio
+import httpx
+import pytest
+from langchain_core.messages import HumanMessage
+from infrastructure.fake_llm import FakeLLMBackend, FakeLLMProfile
+from infrastructure.llm import chat_model_provider
+from services.core.agent.base_agent_service import BaseAgentService
+from services.core.agent.example_agent_service import ExampleAgentService
+from services.core.agent.trip_seed_agent_service import TripSeedAgentService
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """Fast fake backend in place of WatsonX."""
+    monkeypatch.setattr(chat_model_provider, "backend", "fake")
+    monkeypatch.setattr(
+        chat_model_provider,
+        "_fake_backend",
+        FakeLLMBackend(FakeLLMProfile(latency_median_ms=1, chunk_chars=10, chunk_delay_ms=0, seed=1)),
+    )
+
+
+@pytest.fixture
+def fake_agent(fake_backend):
+    """Trip seed agent on the fake backend, without WatsonX credentials."""
+    return TripSeedAgentService(api_key="", project_id="", url="")
+
+
+def test_fake_replies_parse_as_trip_seed_responses(fake_agent):
+    """Replies are valid TripSeedAgentResponse JSON with the message's fields extracted."""
+    prompt = fake_agent._build_enhanced_prompt("4 days, road trip with friends")
+    message = asyncio.run(fake_agent.chat_model.ainvoke([HumanMessage(content=prompt)]))
+    
+    response = fake_agent.parse_response(message.content)
+    
+    assert response.extracted_data.num_days == 4
+    assert response.extracted_data.trip_mode.value == "road_trip"
+    assert response.missing_fields == ["budget_band"]
+
+
+def test_fake_streams_in_chunks(fake_agent):
+    """Streaming yields fixed-size chunks that join into the full reply."""
+    prompt = fake_agent._build_enhanced_prompt("hello")
+    
+    async def collect():
+        return [chunk.content async for chunk in fake_agent.chat_model.astream([HumanMessage(content=prompt)])]
+    
+    chunks = asyncio.run(collect())
+    
+    assert len(chunks) > 1 and all(len(chunk) <= 10 for chunk in chunks)
+    assert fake_agent.parse_response("".join(chunks)).response_text
+
+
+def test_fake_injects_transient_errors():
+    """With error_rate=1 every call fails with an HTTP 503."""
+    backend = FakeLLMBackend(FakeLLMProfile(latency_median_ms=1, error_rate=1.0))
+    chat_model = backend.chat_model(lambda messages: "{}")
+    
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        asyncio.run(chat_model.ainvoke([HumanMessage(content="hi")]))
+    
+    assert error.value.response.status_code == 503
+    assert backend.stats()["errors"] == 1
+
+
+def test_example_agent_runs_on_the_fake_backend(fake_backend):
+    """The example agent's fake replies parse as its response model."""
+    agent = ExampleAgentService(api_key="", project_id="", url="")
+    
+    message = asyncio.run(agent.chat_model.ainvoke([HumanMessage(content="What is Alpena known for?")]))
+    
+    assert agent.parse_response(message.content).answer.endswith("What is Alpena known for?")
+
+
+def test_agent_without_fake_response_is_rejected_at_construction(fake_backend):
+    """An agent that can't answer on the fake backend fails when built, not per request."""
+    class NoFakeAgentService(BaseAgentService[dict]):
+        def parse_response(self, response_text: str) -> dict:
+            return {}
+    
+    with pytest.raises(ValueError, match="NoFakeAgentService does not support LLM_BACKEND=fake"):
+        NoFakeAgentService(api_key="", project_id="", url="")
@@ -0,0 +1,91 @@
+"""
+Unit tests for the request-scoped identity map, with Model.filter mocked out.
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from core.identity_map import IdentityMap, ModelLoader
+from core.models.trips.trip import Trip
+
+
+class FakeFilter:
+    """Stands in for Model.filter, recording the primary keys of every query."""
+    
+    def __init__(self, rows=(), error=None):
+        self.rows = {row.pk: row for row in rows}
+        self.error = error
+        self.calls = []
+    
+    def __call__(self, pk__in):
+        self.calls.append(sorted(pk__in))
+        return self._run(pk__in)
+    
+    async def _run(self, pk__in):
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        return [self.rows[pk] for pk in pk__in if pk in self.rows]
+
+
+def trip(pk: int, user_id: int = 1) -> SimpleNamespace:
+    return SimpleNamespace(pk=pk, id=pk, user_id=user_id)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_query(monkeypatch):
+    """Lookups started together are batched and repeated lookups are cached."""
+    fake_filter = FakeFilter([trip(1), trip(2)])
+    monkeypatch.setattr(Trip, "filter", fake_filter)
+    loader = ModelLoader(Trip)
+    
+    first, second, again = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+    
+    assert (first.pk, second.pk) == (1, 2)
+    assert again is first
+    assert fake_filter.calls == [[1, 2]]
+    assert await loader.load(2) is second
+    assert loader.query_count == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_pk_resolves_to_none(monkeypatch):
+    """A key without a row resolves to None and stays cached."""
+    fake_filter = FakeFilter([trip(1)])
+    monkeypatch.setattr(Trip, "filter", fake_filter)
+    loader = ModelLoader(Trip)
+    
+    found, missing = await asyncio.gather(loader.load(1), loader.load(99))
+    
+    assert found.pk == 1
+    assert missing is None
+    assert await loader.load(99) is None
+    assert fake_filter.calls == [[1, 99]]
+
+
+@pytest.mark.asyncio
+async def test_query_error_reaches_every_waiter(monkeypatch):
+    """A failed query fails every caller of the batch and isn't cached."""
+    monkeypatch.setattr(Trip, "filter", FakeFilter(error=RuntimeError("database down")))
+    loader = ModelLoader(Trip)
+    
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), return_exceptions=True)
+    
+    assert [type(result) for result in results] == [RuntimeError] * 3
+    assert all(str(result) == "database down" for result in results)
+    
+    fake_filter = FakeFilter([trip(1)])
+    monkeypatch.setattr(Trip, "filter", fake_filter)
+    assert (await loader.load(1)).pk == 1
+    assert fake_filter.calls == [[1]]
+
+
+@pytest.mark.asyncio
+async def test_get_trip_rejects_other_users_trip(monkeypatch):
+    """get_trip only returns trips owned by the user, from a single query."""
+    fake_filter = FakeFilter([trip(1, user_id=7)])
+    monkeypatch.setattr(Trip, "filter", fake_filter)
+    identity_map = IdentityMap()
+    
+    assert await identity_map.get_trip(1, user_id=8) is None
+    assert (await identity_map.get_trip(1, user_id=7)).pk == 1
+    assert identity_map.stats()["trips"] == 1
@@ -0,0 +1,57 @@
+"""
+Unit tests for image derivative rendering.
+"""
+import asyncio
+import io
+import pytest
+from services.core.image_derivatives import ImageDerivativePipeline, render_derivatives
+
+PILImage = pytest.importorskip("PIL.Image")
+
+MAX_EDGES = {"medium": 1280, "thumbnail": 320}
+
+
+def encode(image, format: str) -> bytes:
+    output = io.BytesIO()
+    image.save(output, format=format)
+    return output.getvalue()
+
+
+def test_sizes_keep_aspect_ratio_and_never_upscale():
+    """Each size fits its longest edge; small images keep their size."""
+    rendered = render_derivatives(encode(PILImage.new("RGB", (4000, 3000)), "JPEG"), MAX_EDGES, 80)
+    
+    assert (rendered.width, rendered.height) == (4000, 3000)
+    assert (rendered.variants["medium"].width, rendered.variants["medium"].height) == (1280, 960)
+    assert (rendered.variants["thumbnail"].width, rendered.variants["thumbnail"].height) == (320, 240)
+    
+    small = render_derivatives(encode(PILImage.new("RGB", (200, 100)), "JPEG"), MAX_EDGES, 80)
+    assert (small.variants["thumbnail"].width, small.variants["thumbnail"].height) == (200, 100)
+
+
+def test_exif_orientation_and_transparency_are_applied():
+    """Rotated photos come out upright and transparent images become JPEGs."""
+    photo = PILImage.new("RGB", (400, 200))
+    exif = photo.getexif()
+    exif[0x0112] = 6  # Rotated 90 degrees
+    output = io.BytesIO()
+    photo.save(output, format="JPEG", exif=exif)
+    
+    rotated = render_derivatives(output.getvalue(), MAX_EDGES, 80)
+    assert (rotated.width, rotated.height) == (200, 400)
+    assert (rotated.variants["thumbnail"].width, rotated.variants["thumbnail"].height) == (160, 320)
+    
+    png = render_derivatives(encode(PILImage.new("RGBA", (50, 50), (0, 0, 255, 0)), "PNG"), MAX_EDGES, 80)
+    assert PILImage.open(io.BytesIO(png.variants["thumbnail"].content)).format == "JPEG"
+
+
+def test_pipeline_skips_unsupported_and_undecodable_uploads():
+    """Only image types are accepted, and a broken file yields no derivatives."""
+    pipeline = ImageDerivativePipeline(max_workers=1, max_edges=MAX_EDGES, enabled=True)
+    try:
+        assert pipeline.accepts("image/jpeg")
+        assert not pipeline.accepts("application/pdf")
+        assert asyncio.run(pipeline.render(b"not an image")) is None
+        assert pipeline.stats()["failed"] == 1
+    finally:
+        pipeline.close()
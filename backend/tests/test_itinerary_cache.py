@@ -0,0 +1,72 @@
+"""
+Unit tests for the itinerary cache.
+"""
+from dtos.trip_dto import TripDetailsResponse
+from services.core.itinerary_cache import ItineraryCache
+
+
+def details(trip_id: int, name: str = "Trip") -> TripDetailsResponse:
+    return TripDetailsResponse(
+        id=trip_id,
+        name=name,
+        user_id=1,
+        num_days=2,
+        trip_mode="road_trip",
+        budget_band="comfortable",
+        status="planned",
+        days=[],
+        created_at="2026-01-01T00:00:00",
+        updated_at="2026-01-01T00:00:00",
+    )
+
+
+def test_hit_and_miss():
+    """A stored itinerary is returned as a copy; unknown trips miss."""
+    cache = ItineraryCache(max_entries=10)
+    
+    assert cache.get(1) is None
+    cache.set(1, details(1, "Lakes"), cache.version(1))
+    
+    cached = cache.get(1)
+    assert cached.name == "Lakes"
+    cached.name = "Changed"
+    assert cache.get(1).name == "Lakes"
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 1)
+
+
+def test_invalidation_drops_entry_and_rejects_stale_set():
+    """A load that started before an invalidation is not cached."""
+    cache = ItineraryCache(max_entries=10)
+    cache.set(1, details(1), cache.version(1))
+    
+    stale_version = cache.version(1)
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    
+    cache.set(1, details(1, "Stale"), stale_version)
+    assert cache.get(1) is None
+    
+    cache.set(1, details(1, "Fresh"), cache.version(1))
+    assert cache.get(1).name == "Fresh"
+
+
+def test_eviction_keeps_entries_and_invalidations_bounded():
+    """Least recently used entries are evicted and invalidation records stay bounded."""
+    cache = ItineraryCache(max_entries=2)
+    for trip_id in (1, 2):
+        cache.set(trip_id, details(trip_id), cache.version(trip_id))
+    cache.get(1)
+    cache.set(3, details(3), cache.version(3))
+    
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    assert cache.stats()["evictions"] == 1
+    
+    stale_version = cache.version(4)
+    for trip_id in range(4, 100):
+        cache.invalidate(trip_id)
+    assert cache.stats()["tracked_invalidations"] == 2
+    
+    # Trip 4's record was forgotten, but its stale load is still rejected
+    cache.set(4, details(4), stale_version)
+    assert cache.get(4) is None
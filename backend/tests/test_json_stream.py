@@ -0,0 +1,41 @@
+"""
+Unit tests for incremental extraction of response_text from streamed JSON.
+"""
+import json
+import pytest
+from services.core.agent.json_stream import JsonStringFieldStreamer
+
+
+REPLY = {
+    "response_text": 'Sounds "great"!\nA 3-day trip \\ café 🚗',
+    "extracted_data": {"num_days": 3},
+    "is_complete": False,
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 64])
+@pytest.mark.parametrize("raw", [
+    json.dumps(REPLY),
+    json.dumps(REPLY, ensure_ascii=False, indent=2),
+    "```json\n" + json.dumps(REPLY) + "\n```",
+])
+def test_streams_decoded_field_for_any_chunking(raw, chunk_size):
+    """Escapes split across chunks decode to the same text as json.loads."""
+    streamer = JsonStringFieldStreamer("response_text")
+    
+    text = "".join(
+        streamer.feed(raw[i:i + chunk_size]) for i in range(0, len(raw), chunk_size)
+    )
+    
+    assert text == REPLY["response_text"]
+    assert streamer.done
+
+
+def test_returns_nothing_until_field_starts_and_after_it_ends():
+    """Text before the field and after its closing quote is ignored."""
+    streamer = JsonStringFieldStreamer("response_text")
+    
+    assert streamer.feed('{"extracted_data": {"note": "x"}, ') == ""
+    assert streamer.feed('"response_text": "Hel') == "Hel"
+    assert streamer.feed('lo", "is_complete": true}') == "lo"
+    assert streamer.feed('"more"') == ""
@@ -0,0 +1,54 @@
+"""
+Unit tests for the LLM call dispatcher.
+"""
+import asyncio
+import pytest
+from services.core.agent.llm_dispatcher import LLMDispatcher, Priority
+from services.core.agent.llm_exceptions import LLMQueueFullError
+
+
+def test_waiting_calls_are_served_by_priority_then_round_robin_per_user():
+    """A burst from one user doesn't starve others; background calls go last."""
+    async def scenario():
+        dispatcher = LLMDispatcher(max_concurrency=1, max_queue_size=10)
+        served = []
+        
+        async def call(user_id, tag, priority=Priority.INTERACTIVE):
+            async with dispatcher.slot(user_id, priority):
+                served.append(tag)
+                await asyncio.sleep(0)
+        
+        await dispatcher.acquire(0)
+        tasks = [asyncio.create_task(call(1, f"a{i}")) for i in range(3)]
+        tasks.append(asyncio.create_task(call(None, "job", Priority.BACKGROUND)))
+        tasks.append(asyncio.create_task(call(2, "b0")))
+        await asyncio.sleep(0)
+        dispatcher.release()
+        await asyncio.gather(*tasks)
+        return served, dispatcher.stats()
+    
+    served, stats = asyncio.run(scenario())
+    
+    assert served == ["a0", "b0", "a1", "a2", "job"]
+    assert stats["in_flight"] == 0 and stats["queued"] == 0 and stats["dispatched"] == 6
+
+
+def test_rejects_calls_when_the_queue_is_full():
+    """Calls beyond the queue bound fail fast instead of waiting."""
+    async def scenario():
+        dispatcher = LLMDispatcher(max_concurrency=1, max_queue_size=1)
+        await dispatcher.acquire(1)
+        waiter = asyncio.create_task(dispatcher.acquire(2))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(LLMQueueFullError):
+            await dispatcher.acquire(3)
+        
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        dispatcher.release()
+        return dispatcher.stats()
+    
+    stats = asyncio.run(scenario())
+    
+    assert stats["rejected"] == 1 and stats["queued"] == 0 and stats["in_flight"] == 0
@@ -0,0 +1,170 @@
+"""
+Unit tests for the LLM call resilience layer.
+"""
+import asyncio
+import httpx
+import pytest
+from services.core.agent.llm_dispatcher import LLMDispatcher
+from services.core.agent.llm_exceptions import LLMTimeoutError, LLMUnavailableError
+from services.core.agent.llm_resilience import CircuitBreaker, CircuitState, ResilientLLMCaller
+
+
+def make_caller(**overrides) -> ResilientLLMCaller:
+    """Caller with no backoff and a breaker that opens after 4 calls at 50% failures."""
+    options = {
+        "breaker": CircuitBreaker(failure_rate_threshold=0.5, min_calls=4, window_seconds=60, open_seconds=60),
+        "timeout_seconds": 0.2,
+        "max_retries": 2,
+        "retry_base_delay_seconds": 0,
+        "retry_max_delay_seconds": 0,
+        **overrides,
+    }
+    return ResilientLLMCaller(**options)
+
+
+def test_retries_transient_errors_but_not_others():
+    """Connection errors are retried; a rejected request fails immediately."""
+    caller = make_caller()
+    attempts = []
+    
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise httpx.ConnectError("connection reset")
+        return "ok"
+    
+    async def rejected():
+        attempts.append(1)
+        raise ValueError("bad request")
+    
+    assert asyncio.run(caller.call(flaky)) == "ok"
+    assert len(attempts) == 3
+    
+    attempts.clear()
+    with pytest.raises(ValueError):
+        asyncio.run(caller.call(rejected))
+    assert len(attempts) == 1
+    assert caller.stats()["retries"] == 2
+
+
+def test_slow_calls_time_out():
+    """Every attempt is bounded by the timeout."""
+    caller = make_caller(max_retries=1)
+    
+    async def slow():
+        await asyncio.sleep(1)
+    
+    with pytest.raises(LLMTimeoutError):
+        asyncio.run(caller.call(slow))
+    assert caller.stats()["timeouts"] == 2
+
+
+def test_breaker_opens_on_failure_spike_and_fails_fast():
+    """Once the failure rate spikes calls are rejected without reaching the upstream."""
+    caller = make_caller(max_retries=5)
+    attempts = []
+    
+    async def down():
+        attempts.append(1)
+        raise httpx.ConnectError("connection refused")
+    
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(caller.call(down))
+    assert len(attempts) == 4
+    assert caller.breaker.state == CircuitState.OPEN
+    
+    with pytest.raises(LLMUnavailableError):
+        asyncio.run(caller.call(down))
+    assert len(attempts) == 4
+    assert caller.stats()["breaker"]["short_circuited"] == 1
+
+
+def test_slow_call_is_hedged():
+    """A call slower than the recent p95 gets a duplicate and the faster one wins."""
+    caller = make_caller(timeout_seconds=1, hedging_enabled=True, hedge_min_delay_seconds=0.01)
+    delays = [0.0] * 20 + [0.5, 0.0]
+    
+    async def call():
+        await asyncio.sleep(delays.pop(0))
+        return "ok"
+    
+    async def scenario():
+        for _ in range(21):
+            await caller.call(call)
+    
+    asyncio.run(scenario())
+    
+    stats = caller.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+
+
+@pytest.mark.parametrize("max_concurrency, hedged", [(1, False), (2, True)])
+def test_hedge_needs_a_free_dispatcher_slot(max_concurrency, hedged):
+    """A hedged duplicate takes its own slot and is skipped when none is free."""
+    caller = make_caller(timeout_seconds=1, hedging_enabled=True, hedge_min_delay_seconds=0.01)
+    delays = [0.0] * 20 + [0.2, 0.0]
+    peak = []
+    
+    async def scenario():
+        dispatcher = LLMDispatcher(max_concurrency=max_concurrency, max_queue_size=10)
+        
+        async def call():
+            peak.append(dispatcher.stats()["in_flight"])
+            await asyncio.sleep(delays.pop(0))
+            return "ok"
+        
+        for _ in range(21):
+            async with dispatcher.slot(1):
+                await caller.call(call, dispatcher=dispatcher)
+        await asyncio.sleep(0)
+        return dispatcher.stats()
+    
+    dispatcher_stats = asyncio.run(scenario())
+    
+    stats = caller.stats()
+    assert stats["hedges"] == int(hedged)
+    assert stats["hedges_skipped"] == int(not hedged)
+    assert max(peak) <= max_concurrency
+    assert dispatcher_stats["in_flight"] == 0
+
+
+class FakeStream:
+    """Model stream over a connection that stays open until aclose()."""
+    
+    def __init__(self, attempt: int, events: list, first_chunk_error: Exception = None):
+        self.attempt = attempt
+        self.events = events
+        self.first_chunk_error = first_chunk_error
+        self.chunks = ["hello", " world"]
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self):
+        if self.first_chunk_error:
+            raise self.first_chunk_error
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+    
+    async def aclose(self):
+        self.events.append(f"close {self.attempt}")
+
+
+def test_stream_closes_abandoned_attempts_before_retrying():
+    """A stream that fails before its first chunk is closed before the next attempt opens."""
+    caller = make_caller()
+    events = []
+    errors = [httpx.ConnectError("connection reset"), httpx.ReadError("connection dropped"), None]
+    
+    def open_stream():
+        attempt = len([event for event in events if event.startswith("open")])
+        events.append(f"open {attempt}")
+        return FakeStream(attempt, events, errors[attempt])
+    
+    async def consume():
+        return [chunk async for chunk in caller.stream(open_stream)]
+    
+    assert asyncio.run(consume()) == ["hello", " world"]
+    assert events == ["open 0", "close 0", "open 1", "close 1", "open 2", "close 2"]
+    assert caller.stats()["retries"] == 2
@@ -0,0 +1,85 @@
+"""
+Tests for keyset pagination, on an in-memory SQLite database.
+"""
+from datetime import datetime, timedelta, timezone
+import httpx
+import pytest
+from fastapi import FastAPI
+from controllers import trip_controller
+from core.models import Trip, User
+from core.models.trips import BudgetBand, TripMode
+from services.core.pagination import decode_cursor, encode_cursor, fetch_page
+from services.trip_service import TripService
+
+CREATED_AT = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+async def create_trips(user, created_at: list) -> list:
+    """Create a trip per timestamp, in order, and return their ids."""
+    ids = []
+    for timestamp in created_at:
+        trip = await Trip.create(user=user, name="Trip", num_days=1,
+                                 trip_mode=TripMode.LOCAL_HUB, budget_band=BudgetBand.RELAXED)
+        # created_at is set on insert, so backdate it afterwards
+        await Trip.filter(id=trip.id).update(created_at=timestamp)
+        ids.append(trip.id)
+    return ids
+
+
+def test_cursor_round_trip():
+    """A cursor decodes to the timestamp and id it was made from."""
+    timestamp = datetime(2026, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+    
+    cursor = encode_cursor(timestamp, 42)
+    
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (timestamp, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30", encode_cursor(CREATED_AT, 1)[:-3], "eyJ0IjoieCIsImlkIjoxfQ"])
+def test_malformed_cursor_raises_value_error(cursor):
+    """Garbage, truncated cursors, missing keys and bad timestamps are rejected."""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_page_boundary_and_equal_timestamps(memory_db):
+    """Pages hold `limit` rows, ties on the timestamp break by id and the last page has no cursor."""
+    user = await User.create(email="pages@example.com", password_hash="x", full_name="Pages")
+    newest = await create_trips(user, [CREATED_AT + timedelta(hours=1)])
+    tied = await create_trips(user, [CREATED_AT] * 3)
+    oldest = await create_trips(user, [CREATED_AT - timedelta(hours=1)])
+    query = Trip.filter(user_id=user.id)
+    
+    first, cursor = await fetch_page(query, "created_at", limit=2)
+    assert [trip.id for trip in first] == [newest[0], tied[2]]
+    assert decode_cursor(cursor)[1] == tied[2]
+    
+    # The cursor sits between rows with equal timestamps
+    second, cursor = await fetch_page(query, "created_at", limit=2, cursor=cursor)
+    assert [trip.id for trip in second] == [tied[1], tied[0]]
+    
+    # Exactly `limit` rows left: the extra row isn't there, so there is no next page
+    last, cursor = await fetch_page(query, "created_at", limit=1, cursor=cursor)
+    assert [trip.id for trip in last] == oldest
+    assert cursor is None
+    
+    everything, cursor = await fetch_page(query, "created_at")
+    assert [trip.id for trip in everything] == newest + tied[::-1] + oldest
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_malformed_cursor_maps_to_bad_request(memory_db):
+    """The trips listing answers a malformed cursor with 400."""
+    app = FastAPI()
+    app.include_router(trip_controller.router)
+    app.dependency_overrides[trip_controller.get_trip_service] = lambda: TripService(trip_seed_service=None)
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/trips", params={"limit": 2, "trips_cursor": "not a cursor"})
+    
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
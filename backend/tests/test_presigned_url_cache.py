@@ -0,0 +1,60 @@
+"""
+Unit tests for the presigned URL cache.
+"""
+from services.core.presigned_url_cache import PresignedUrlCache, presigned_url_expiry
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_signer(clock: FakeClock, calls: list):
+    def sign(s3_key: str, expiration: int) -> str:
+        calls.append(s3_key)
+        return f"https://cos.example.com/bucket/{s3_key}?Signature=x&Expires={int(clock() + expiration)}"
+    return sign
+
+
+def test_expiry_is_read_from_sigv2_and_sigv4_urls():
+    """Both query string signing styles carry their expiry in the URL."""
+    assert presigned_url_expiry("https://h/b/k?AWSAccessKeyId=a&Signature=s&Expires=1700000000") == 1700000000
+    assert presigned_url_expiry(
+        "https://h/b/k?X-Amz-Algorithm=AWS4-HMAC-SHA256&X-Amz-Date=20231114T221320Z&X-Amz-Expires=3600"
+    ) == 1700000000 + 3600
+    assert presigned_url_expiry("https://h/b/k") is None
+    assert presigned_url_expiry(None) is None
+
+
+def test_urls_are_reused_until_close_to_expiry():
+    """A key is signed once and re-signed only inside the refresh margin."""
+    clock, calls = FakeClock(), []
+    cache = PresignedUrlCache(expiration_seconds=3600, refresh_margin_seconds=300, max_entries=10, clock=clock)
+    sign = make_signer(clock, calls)
+    
+    url = cache.get_url("1/2/3/a.jpg", sign)
+    clock.now += 3000
+    assert cache.get_url("1/2/3/a.jpg", sign) == url
+    assert calls == ["1/2/3/a.jpg"]
+    
+    clock.now += 400
+    assert cache.get_url("1/2/3/a.jpg", sign) != url
+    assert calls == ["1/2/3/a.jpg", "1/2/3/a.jpg"]
+
+
+def test_fresh_stored_urls_are_reused_without_signing():
+    """The URL persisted on the row is used while it has time left."""
+    clock, calls = FakeClock(), []
+    cache = PresignedUrlCache(expiration_seconds=3600, refresh_margin_seconds=300, max_entries=10, clock=clock)
+    sign = make_signer(clock, calls)
+    
+    fresh = f"https://cos.example.com/bucket/k?Expires={int(clock() + 1000)}"
+    stale = f"https://cos.example.com/bucket/k?Expires={int(clock() + 100)}"
+    
+    assert cache.get_url("a", sign, stored_url=fresh) == fresh
+    assert cache.get_url("b", sign, stored_url=stale) != stale
+    assert calls == ["b"]
+    assert cache.stats()["stored_reused"] == 1
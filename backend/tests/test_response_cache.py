@@ -0,0 +1,44 @@
+"""
+Unit tests for the agent response cache.
+"""
+import asyncio
+from langchain_core.messages import HumanMessage, SystemMessage
+from services.core.agent.response_cache import InMemoryResponseCacheBackend, ResponseCache
+
+
+def test_keys_normalize_history_but_not_system_prompt_or_params():
+    """Whitespace and case in messages don't matter; prompt and params do."""
+    cache = ResponseCache(InMemoryResponseCacheBackend(max_entries=10), ttl_seconds=60)
+    params = {"temperature": 0.0}
+    
+    key = cache.build_key("model", params, [SystemMessage(content="S"), HumanMessage(content="Plan me a weekend trip")])
+    
+    assert key == cache.build_key("model", params, [SystemMessage(content="S"), HumanMessage(content=" plan me a  WEEKEND trip")])
+    assert key != cache.build_key("model", params, [SystemMessage(content="s"), HumanMessage(content="Plan me a weekend trip")])
+    assert key != cache.build_key("model", {"temperature": 0.1}, [SystemMessage(content="S"), HumanMessage(content="Plan me a weekend trip")])
+
+
+def test_sampled_calls_require_opt_in():
+    """Calls with temperature > 0 are only cached when explicitly allowed."""
+    cache = ResponseCache(InMemoryResponseCacheBackend(max_entries=10), ttl_seconds=60)
+    
+    assert cache.is_cacheable({"temperature": 0.0})
+    assert not cache.is_cacheable({"temperature": 0.7})
+    assert cache.is_cacheable({"temperature": 0.7}, allow_sampling=True)
+
+
+def test_in_memory_backend_evicts_least_recently_used_and_expired_entries():
+    """Entries expire after their TTL and the oldest unused entry is evicted."""
+    async def scenario():
+        backend = InMemoryResponseCacheBackend(max_entries=2)
+        await backend.set("a", "A", ttl_seconds=60)
+        await backend.set("b", "B", ttl_seconds=60)
+        assert await backend.get("a") == "A"
+        await backend.set("c", "C", ttl_seconds=60)
+        assert await backend.get("b") is None
+        
+        await backend.set("d", "D", ttl_seconds=0)
+        assert await backend.get("d") is None
+        assert await backend.get("a") is None and await backend.get("c") == "C"
+    
+    asyncio.run(scenario())
@@ -0,0 +1,282 @@
+"""
+Unit tests for S3Storage, with the S3 client stubbed out.
+"""
+import asyncio
+import datetime
+import io
+import botocore.auth
+import botocore.session
+import httpx
+import pytest
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from fastapi import FastAPI
+from controllers import image_controller
+from core.config import settings
+from core.models.image import Image
+from services.core.presigned_url_cache import presigned_url_expiry
+from services.core.s3_storage import S3Storage
+from services.core.storage_exceptions import ImageNotFoundError, InvalidRangeError
+from services.core.storage_service import StorageService
+
+SIGNED_AT = datetime.datetime(2026, 5, 1, 12, 0, 0)
+
+
+class FrozenDatetime(datetime.datetime):
+    @classmethod
+    def utcnow(cls):
+        return SIGNED_AT
+
+
+KEY = "1/2/3/photo.jpg"
+CONTENT = bytes(range(256)) * 4
+ETAG = '"abc123"'
+
+
+def client_error(code: str, status: int, operation: str = "GetObject", headers: dict = None) -> ClientError:
+    return ClientError(
+        {
+            "Error": {"Code": code, "Message": code},
+            "ResponseMetadata": {"HTTPStatusCode": status, "HTTPHeaders": headers or {}},
+        },
+        operation,
+    )
+
+
+class StubBody:
+    """Streaming response body that records whether it was closed."""
+    
+    def __init__(self, content: bytes):
+        self.content = content
+        self.closed = False
+    
+    async def iter_chunks(self, chunk_size: int):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+    
+    def close(self):
+        self.closed = True
+
+
+class StubS3Client:
+    """In-memory stand-in for the S3 client calls S3Storage makes."""
+    
+    def __init__(self, objects: dict = None, fail_part: int = None, part_delay: float = 0.0):
+        self.objects = objects if objects is not None else {KEY: CONTENT}
+        self.fail_part = fail_part
+        self.part_delay = part_delay
+        self.calls = []
+        self.bodies = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def get_object(self, Bucket, Key, Range=None, IfNoneMatch=None):
+        self.calls.append({"Key": Key, "Range": Range, "IfNoneMatch": IfNoneMatch})
+        if Key not in self.objects:
+            raise client_error("NoSuchKey", 404)
+        if IfNoneMatch == ETAG:
+            raise client_error("304", 304, headers={"etag": ETAG})
+        
+        content = self.objects[Key]
+        response = {"ContentType": "image/jpeg", "ETag": ETAG, "ContentLength": len(content)}
+        if Range:
+            start, end = Range[len("bytes="):].split("-")
+            if not start:
+                start, end = len(content) - int(end), len(content) - 1
+            start, end = int(start), min(int(end) if end else len(content) - 1, len(content) - 1)
+            if start >= len(content):
+                raise client_error("InvalidRange", 416)
+            content = content[start:end + 1]
+            response.update(ContentLength=len(content), ContentRange=f"bytes {start}-{end}/{len(self.objects[Key])}")
+        
+        body = StubBody(content)
+        self.bodies.append(body)
+        return {**response, "Body": body}
+    
+    async def create_multipart_upload(self, Bucket, Key, ContentType):
+        self.calls.append(("create", Key))
+        return {"UploadId": "upload-1"}
+    
+    async def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Later parts finish first, so completion order differs from part order
+            await asyncio.sleep(self.part_delay / PartNumber)
+            if PartNumber == self.fail_part:
+                raise client_error("InternalError", 500, "UploadPart")
+            self.calls.append(("part", PartNumber, Body))
+            return {"ETag": f'"etag-{PartNumber}"'}
+        finally:
+            self.in_flight -= 1
+    
+    async def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append(("complete", MultipartUpload["Parts"]))
+    
+    async def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append(("abort", UploadId))
+
+
+def make_storage(client: StubS3Client, **options) -> S3Storage:
+    storage = S3Storage(**options)
+    storage._client = client
+    return storage
+
+
+async def read_stream(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream.body])
+
+
+@pytest.fixture
+def s3_settings(monkeypatch):
+    """Complete S3 settings pointing at a local endpoint."""
+    monkeypatch.setattr(settings, "s3_endpoint", "http://127.0.0.1:9000")
+    monkeypatch.setattr(settings, "s3_access_key", "access")
+    monkeypatch.setattr(settings, "s3_secret_key", "secret")
+    monkeypatch.setattr(settings, "s3_bucket_name", "photos")
+    monkeypatch.setattr(settings, "s3_use_ssl", False)
+    return settings
+
+
+@pytest.mark.parametrize("region", ["eu-central-1", "us-east-1"])
+def test_local_signing_matches_generate_presigned_url(s3_settings, monkeypatch, region):
+    """Local SigV4 signing produces the URL the S3 client would, in any region."""
+    monkeypatch.setattr(settings, "s3_region", region)
+    monkeypatch.setattr(botocore.auth.datetime, "datetime", FrozenDatetime)
+    client = botocore.session.get_session().create_client(
+        "s3",
+        endpoint_url=settings.s3_endpoint,
+        aws_access_key_id=settings.s3_access_key,
+        aws_secret_access_key=settings.s3_secret_key,
+        region_name=region,
+        config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+    )
+    key = "users/1/trips/2/days/3/a photo~1.jpg"
+    
+    url = S3Storage().sign_presigned_url(key, expiration=600)
+    
+    assert url == client.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": "photos", "Key": key},
+        ExpiresIn=600,
+    )
+    assert f"%2F{region}%2Fs3%2Faws4_request" in url
+    assert presigned_url_expiry(url) == SIGNED_AT.replace(tzinfo=datetime.timezone.utc).timestamp() + 600
+
+
+@pytest.mark.parametrize("header, forwarded", [
+    ("bytes=0-99", "bytes=0-99"),
+    (" bytes=100- ", "bytes=100-"),
+    ("bytes=-50", "bytes=-50"),
+    ("bytes=0-9,20-29", None),
+    ("bytes=abc", None),
+    ("items=0-9", None),
+    ("bytes=-", None),
+])
+def test_only_single_byte_ranges_reach_s3(s3_settings, header, forwarded):
+    """Multi-range and malformed Range headers are ignored and the whole image is read."""
+    client = StubS3Client()
+    
+    stream = asyncio.run(make_storage(client).open_image_stream(1, 2, 3, KEY, byte_range=header))
+    
+    assert client.calls[0]["Range"] == forwarded
+    assert (stream.content_range is None) == (forwarded is None)
+
+
+def test_open_image_stream_reads_body_and_maps_errors(s3_settings):
+    """Ranges, ETag matches, missing keys and unsatisfiable ranges map to the storage results."""
+    client = StubS3Client()
+    storage = make_storage(client)
+    
+    async def scenario():
+        stream = await storage.open_image_stream(1, 2, 3, KEY, byte_range="bytes=10-19")
+        assert (stream.content_range, stream.content_length, stream.etag) == ("bytes 10-19/1024", 10, ETAG)
+        assert await read_stream(stream) == CONTENT[10:20]
+        assert client.bodies[-1].closed
+        
+        stream = await storage.open_image_stream(1, 2, 3, KEY, if_none_match=ETAG)
+        assert stream.not_modified and stream.body is None and stream.etag == ETAG
+        
+        with pytest.raises(ImageNotFoundError):
+            await storage.open_image_stream(1, 2, 3, "1/2/3/missing.jpg")
+        with pytest.raises(InvalidRangeError):
+            await storage.open_image_stream(1, 2, 3, KEY, byte_range="bytes=5000-")
+    
+    asyncio.run(scenario())
+
+
+def test_not_modified_error_code_without_304_status(s3_settings):
+    """A NotModified error code is recognised even when the status isn't 304."""
+    client = StubS3Client()
+    
+    async def get_object(**params):
+        raise client_error("NotModified", 200, headers={"content-type": "image/jpeg"})
+    
+    client.get_object = get_object
+    stream = asyncio.run(make_storage(client).open_image_stream(1, 2, 3, KEY, if_none_match=ETAG))
+    
+    assert stream.not_modified
+    assert (stream.etag, stream.content_type) == (ETAG, "image/jpeg")
+
+
+@pytest.mark.asyncio
+async def test_image_content_status_codes(s3_settings, memory_db):
+    """The content endpoint answers 200, 206, 304 and 416 with the matching headers."""
+    image = await Image.create(user_id=1, trip_id=2, trip_day_id=3, filename="photo.jpg", s3_key=KEY,
+                               url="", file_size=len(CONTENT), content_type="image/jpeg")
+    client = StubS3Client()
+    app = FastAPI()
+    app.include_router(image_controller.router)
+    app.dependency_overrides[image_controller.get_storage_service] = lambda: StorageService(
+        storage_backend=make_storage(client)
+    )
+    url = f"/api/trips/2/days/3/images/{image.id}/content"
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        full = await http.get(url)
+        partial = await http.get(url, headers={"Range": "bytes=-24"})
+        not_modified = await http.get(url, headers={"If-None-Match": ETAG})
+        unsatisfiable = await http.get(url, headers={"Range": "bytes=2048-"})
+        missing = await http.get("/api/trips/2/days/3/images/999/content")
+    
+    assert full.status_code == 200 and full.content == CONTENT
+    assert full.headers["content-length"] == str(len(CONTENT)) and full.headers["etag"] == ETAG
+    assert partial.status_code == 206 and partial.content == CONTENT[-24:]
+    assert partial.headers["content-range"] == "bytes 1000-1023/1024"
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["etag"] == ETAG
+    assert unsatisfiable.status_code == 416
+    assert missing.status_code == 404
+    assert all(body.closed for body in client.bodies)
+
+
+def test_multipart_upload_completes_parts_in_order_with_bounded_concurrency(s3_settings):
+    """Parts are uploaded at most max_in_flight_parts at a time and completed in part order."""
+    client = StubS3Client(part_delay=0.02)
+    storage = make_storage(client, max_in_flight_parts=2)
+    storage.part_size = 4
+    
+    asyncio.run(storage._upload_multipart(client, KEY, "image/jpeg", b"aaaa", io.BytesIO(b"bbbbccccddddee")))
+    
+    uploaded = [call for call in client.calls if call[0] == "part"]
+    assert sorted(uploaded) == [("part", 1, b"aaaa"), ("part", 2, b"bbbb"), ("part", 3, b"cccc"),
+                                ("part", 4, b"dddd"), ("part", 5, b"ee")]
+    assert uploaded != sorted(uploaded)
+    assert client.max_in_flight == 2
+    assert client.calls[-1] == ("complete", [{"PartNumber": n, "ETag": f'"etag-{n}"'} for n in range(1, 6)])
+
+
+def test_multipart_upload_aborts_on_failed_part(s3_settings):
+    """A failed part aborts the upload, stops reading and never completes it."""
+    client = StubS3Client(fail_part=2)
+    storage = make_storage(client, max_in_flight_parts=1)
+    storage.part_size = 4
+    file_content = io.BytesIO(b"bbbbccccddddeeee")
+    
+    with pytest.raises(ClientError):
+        asyncio.run(storage._upload_multipart(client, KEY, "image/jpeg", b"aaaa", file_content))
+    
+    assert client.calls[-1] == ("abort", "upload-1")
+    assert not any(call[0] == "complete" for call in client.calls)
+    assert file_content.tell() < len(file_content.getvalue())
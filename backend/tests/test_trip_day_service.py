@@ -0,0 +1,86 @@
+"""
+Service tests for creating trip days, on an in-memory SQLite database.
+"""
+from decimal import Decimal
+import pytest
+from core.models import Conversation, TripDay, TripSeed, TripSeedVibe, TripVibe, Vibe
+from core.models.trips import BudgetBand, Companions, TripMode, TripSeedStatus
+from dtos.trip_day_dto import CreateTripDayRequest, CreateTripDaysRequest
+from dtos.trip_dto import CreateTripRequest
+from services.trip_day_service import TripDayService
+from services.trip_service import TripService
+
+
+async def create_days(seeded_trip, *days: dict):
+    return await TripDayService().create_trip_days(
+        user_id=seeded_trip.user.id,
+        trip_id=seeded_trip.trip.id,
+        request=CreateTripDaysRequest(days=[CreateTripDayRequest(**day) for day in days]),
+    )
+
+
+async def day_indexes(trip_id: int) -> list:
+    return await TripDay.filter(trip_id=trip_id).order_by("day_index").values_list("day_index", flat=True)
+
+
+@pytest.mark.asyncio
+async def test_create_trip_days_returns_only_the_new_days(seeded_trip):
+    """The new days are returned in day order, defaulting to Alpena, without the existing ones."""
+    days = await create_days(seeded_trip, {"day_index": 4, "notes": "Ferry"}, {"day_index": 3})
+    
+    assert [(day.day_index, day.notes, day.base_city_name, day.stops) for day in days] == [
+        (3, None, "Alpena", []),
+        (4, "Ferry", "Alpena", []),
+    ]
+    assert all(day.trip_id == seeded_trip.trip.id for day in days)
+    assert await day_indexes(seeded_trip.trip.id) == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("days, message", [
+    ([{"day_index": 3}, {"day_index": 2}], "Day 2 already exists"),
+    ([{"day_index": 3}, {"day_index": 3}], "only appear once in a batch"),
+    ([{"day_index": 3, "base_city_id": 999}], "City 999 not found"),
+])
+async def test_create_trip_days_rejects_duplicates_without_writing(seeded_trip, days, message):
+    """Existing, repeated and unknown-city days fail the whole batch."""
+    with pytest.raises(ValueError, match=message):
+        await create_days(seeded_trip, *days)
+    
+    assert await day_indexes(seeded_trip.trip.id) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_create_trip_from_seed_creates_days_and_vibes(seeded_trip):
+    """A trip created from a seed gets num_days empty days in Alpena and the seed's vibes."""
+    conversation = await Conversation.create(user_id=seeded_trip.user.id, agent_name="trip_seed_agent")
+    trip_seed = await TripSeed.create(
+        conversation=conversation, num_days=3, trip_mode=TripMode.ROAD_TRIP,
+        budget_band=BudgetBand.SPLURGE, companions=Companions.FAMILY, status=TripSeedStatus.COMPLETE,
+    )
+    vibes = [await Vibe.create(code=code, label=code.title()) for code in ("lakeside", "foodie")]
+    for vibe, strength in zip(vibes, ("0.80", "0.35")):
+        await TripSeedVibe.create(trip_seed=trip_seed, vibe=vibe, strength=Decimal(strength))
+    
+    response = await TripService(trip_seed_service=None).create_trip_from_seed(
+        user_id=seeded_trip.user.id,
+        request=CreateTripRequest(trip_seed_id=trip_seed.id, name="Family road trip"),
+    )
+    
+    assert (response.num_days, response.trip_mode, response.companions, response.status) == (
+        3, "road_trip", "family", "planned"
+    )
+    days = await TripDay.filter(trip_id=response.id).order_by("day_index")
+    assert [(day.day_index, day.base_city_id) for day in days] == [(i, seeded_trip.city.id) for i in (1, 2, 3)]
+    trip_vibes = await TripVibe.filter(trip_id=response.id).order_by("vibe_id")
+    assert [(vibe.vibe_id, vibe.strength) for vibe in trip_vibes] == [
+        (vibes[0].id, Decimal("0.80")), (vibes[1].id, Decimal("0.35"))
+    ]
+    trip_seed = await TripSeed.get(id=trip_seed.id)
+    assert (trip_seed.status, trip_seed.trip_id) == (TripSeedStatus.FINALIZED, response.id)
+    
+    with pytest.raises(ValueError, match="must be COMPLETE"):
+        await TripService(trip_seed_service=None).create_trip_from_seed(
+            user_id=seeded_trip.user.id,
+            request=CreateTripRequest(trip_seed_id=trip_seed.id, name="Again"),
+        )
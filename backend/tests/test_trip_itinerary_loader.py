@@ -0,0 +1,120 @@
+"""
+Tests for itinerary loading, on an in-memory SQLite database.
+"""
+import pytest
+import pytest_asyncio
+from tortoise import connections
+from core.models import TripDay, TripStop
+from core.models.trips import TripStopSlot
+from dtos.trip_day_dto import TripDayResponse
+from dtos.trip_stop_dto import TripStopResponse
+from services.trip_itinerary_loader import load_trip_days, load_trip_details
+
+
+async def load_days_per_day(trip_id: int) -> list:
+    """Reference assembly: the per-day queries the loader replaced."""
+    responses = []
+    for day in await TripDay.filter(trip_id=trip_id).prefetch_related('base_city').order_by('day_index'):
+        stops = await TripStop.filter(trip_day_id=day.id).prefetch_related('attraction').order_by('order_index')
+        responses.append(TripDayResponse(
+            id=day.id,
+            trip_id=day.trip_id,
+            day_index=day.day_index,
+            base_city_id=day.base_city_id,
+            base_city_name=day.base_city.name if day.base_city else None,
+            notes=day.notes,
+            stops=[
+                TripStopResponse(
+                    id=stop.id,
+                    trip_day_id=stop.trip_day_id,
+                    attraction_id=stop.attraction_id,
+                    attraction_name=stop.attraction.name if stop.attraction else None,
+                    attraction_type=stop.attraction.type if stop.attraction else None,
+                    label=stop.label,
+                    slot=stop.slot.value,
+                    order_index=stop.order_index,
+                    created_at=stop.created_at.isoformat(),
+                    updated_at=stop.updated_at.isoformat(),
+                )
+                for stop in stops
+            ],
+            created_at=day.created_at.isoformat(),
+            updated_at=day.updated_at.isoformat(),
+        ))
+    return responses
+
+
+@pytest_asyncio.fixture
+async def itinerary(seeded_trip):
+    """The seeded trip plus a label-only stop, stops inserted out of order and an empty day without a city."""
+    day_1, day_2 = seeded_trip.days
+    await TripStop.create(trip_day=day_2, label="Sunset walk", slot=TripStopSlot.EVENING, order_index=5)
+    await TripStop.create(trip_day=day_2, attraction=seeded_trip.attractions[3], slot=TripStopSlot.MORNING,
+                          order_index=1)
+    seeded_trip.empty_day = await TripDay.create(trip=seeded_trip.trip, day_index=3, notes="Rest day")
+    return seeded_trip
+
+
+@pytest.fixture
+def query_counter(monkeypatch):
+    """Count the queries sent to the database."""
+    client = connections.get("default")
+    queries = []
+    for name in ("execute_query", "execute_query_dict"):
+        original = getattr(client, name)
+        
+        async def counted(query, values=None, _original=original):
+            queries.append(query)
+            return await _original(query, values)
+        
+        monkeypatch.setattr(client, name, counted)
+    return queries
+
+
+@pytest.mark.asyncio
+async def test_trip_details_match_per_day_assembly(itinerary, query_counter):
+    """The nested response is what the per-day queries built, in four queries."""
+    expected = await load_days_per_day(itinerary.trip.id)
+    query_counter.clear()
+    
+    details = await load_trip_details(itinerary.trip)
+    
+    assert len(query_counter) == 4
+    assert details.days == expected
+    assert (details.id, details.name, details.trip_mode, details.budget_band) == (
+        itinerary.trip.id, "Lakes", "road_trip", "comfortable"
+    )
+    assert [day.day_index for day in details.days] == [1, 2, 3]
+    assert [stop.order_index for stop in details.days[1].stops] == [1, 5]
+    assert [stop.label for stop in details.days[1].stops] == [None, "Sunset walk"]
+    assert details.days[1].stops[0].attraction_name == "Attraction 3"
+    assert details.days[2].stops == [] and details.days[2].base_city_name is None
+    assert details.model_dump(mode="json")["days"][0]["stops"][0]["slot"] == "morning"
+
+
+@pytest.mark.asyncio
+async def test_query_count_does_not_grow_with_days(itinerary, query_counter):
+    """More days and stops don't add queries."""
+    for day_index in range(4, 10):
+        day = await TripDay.create(trip=itinerary.trip, day_index=day_index, base_city=itinerary.city)
+        await TripStop.create(trip_day=day, label=f"Stop {day_index}", slot=TripStopSlot.FLEX, order_index=0)
+    query_counter.clear()
+    
+    days = await load_trip_days(itinerary.trip.id)
+    
+    assert len(days) == 9
+    assert len(query_counter) == 4
+
+
+@pytest.mark.asyncio
+async def test_day_ids_filter(itinerary):
+    """Only the requested days of the trip are loaded, in day order."""
+    day_1, day_2 = itinerary.days
+    
+    days = await load_trip_days(itinerary.trip.id, day_ids=[itinerary.empty_day.id, day_1.id])
+    
+    assert [day.id for day in days] == [day_1.id, itinerary.empty_day.id]
+    assert len(days[0].stops) == 3
+    assert await load_trip_days(itinerary.trip.id, day_ids=[itinerary.other_day.id]) == []
+    assert await load_trip_days(itinerary.trip.id, day_ids=[]) == []
+    assert await load_trip_days(itinerary.other_trip.id + 100) == []
@@ -36,6 +36,8 @@ async def test_multi_turn_trip_seed_conversation(watsonx_credentials):
     mock_conversation = MagicMock()
     mock_conversation.id = 1
     mock_conversation.user_id = mock_user.id
+    mock_conversation.summary = None
+    mock_conversation.summary_message_count = 0
     
     # Mock TripSeed
     mock_trip_seed = MagicMock()
@@ -50,8 +52,8 @@ async def test_multi_turn_trip_seed_conversation(watsonx_credentials):
     # Mock all database operations
     with patch.object(ConversationService, 'create_conversation', new_callable=AsyncMock) as mock_create_conv, \
          patch.object(ConversationService, 'get_conversation', new_callable=AsyncMock) as mock_get_conv, \
-         patch.object(ConversationService, 'add_message', new_callable=AsyncMock), \
-         patch.object(ConversationService, 'get_conversation_messages', new_callable=AsyncMock) as mock_get_msgs, \
+         patch.object(ConversationService, 'add_messages', new_callable=AsyncMock), \
+         patch.object(ConversationService, 'get_recent_messages', new_callable=AsyncMock) as mock_get_msgs, \
          patch.object(TripSeed, 'get_or_none', new_callable=AsyncMock) as mock_get_trip_seed, \
          patch.object(TripSeed, 'create', new_callable=AsyncMock) as mock_create_trip_seed:
         
@@ -71,6 +73,9 @@ async def test_multi_turn_trip_seed_conversation(watsonx_credentials):
             mock_trip_seed.num_days = trip_seed_state.get("num_days")
             mock_trip_seed.trip_mode = trip_seed_state.get("trip_mode")
             mock_trip_seed.budget_band = trip_seed_state.get("budget_band")
+            mock_trip_seed.provided_fields = [
+                field for field, value in trip_seed_state.items() if value is not None
+            ]
             return mock_trip_seed
         
         mock_get_trip_seed.side_effect = get_trip_seed_side_effect
@@ -0,0 +1,61 @@
+"""
+Unit tests for the rule-based trip seed fast path.
+"""
+import pytest
+from core.models.trips.budget_band import BudgetBand
+from core.models.trips.companions import Companions
+from core.models.trips.trip_mode import TripMode
+from services.core.agent.trip_seed_fast_path import TripSeedFastPath
+
+
+@pytest.mark.parametrize("message,expected", [
+    ("3 days, road trip, budget-friendly", (3, TripMode.ROAD_TRIP, BudgetBand.RELAXED, None)),
+    ("Five day roadtrip with my family, mid-range", (5, TripMode.ROAD_TRIP, BudgetBand.COMFORTABLE, Companions.FAMILY)),
+    ("a week in one place, luxury please", (7, TripMode.LOCAL_HUB, BudgetBand.SPLURGE, None)),
+])
+def test_extracts_fields_from_simple_answers(message, expected):
+    """Vocabulary phrases and day counts map to enum values."""
+    extracted = TripSeedFastPath().extract(message)
+    
+    assert (extracted.num_days, extracted.trip_mode, extracted.budget_band, extracted.companions) == expected
+
+
+@pytest.mark.parametrize("message", [
+    "3 days, not a road trip, cheap",
+    "road trip or one place? 3 days, cheap",
+    "3 or 4 days, road trip, cheap",
+    "3 days then 4 days, road trip, cheap",
+    "3 days, road trip, cheap or luxury",
+])
+def test_leaves_ambiguous_messages_to_the_model(message):
+    """Questions, negations and conflicting values are not handled by rules."""
+    assert TripSeedFastPath().extract(message) is None
+
+
+@pytest.mark.parametrize("message", [
+    "3 day road trip from Detroit, cheap",
+    "2 days road trip luxury with my 3 kids",
+    "3 days in Traverse City, road trip, cheap",
+    "road trip to the Upper Peninsula, 4 days, comfortable",
+    "3 days, road trip, cheap, we love lighthouses",
+])
+def test_leaves_messages_with_unrecognised_words_to_the_model(message):
+    """Places and other details the rules can't extract are not dropped silently."""
+    fast_path = TripSeedFastPath()
+    
+    assert fast_path.extract(message) is None
+    assert fast_path.respond(message, {}) is None
+
+
+def test_responds_only_when_every_missing_field_is_filled():
+    """The templated reply is used only if the TripSeed becomes complete."""
+    fast_path = TripSeedFastPath()
+    
+    assert fast_path.respond("road trip, cheap", {}) is None
+    
+    response = fast_path.respond("road trip, cheap", {"num_days": 2})
+    assert response.is_complete and response.missing_fields == []
+    assert "2-day road trip" in response.response_text
+    
+    assert fast_path.respond("3 days, road trip, cheap", {"num_days": 2, "trip_mode": "local_hub", "budget_band": "relaxed"}) is None
+    assert fast_path.stats()["hit_rate"] == 0.5
@@ -0,0 +1,50 @@
+"""
+Service tests for trip seed conversations, on an in-memory SQLite database.
+"""
+import pytest
+from core.models import User
+from core.models.trips import TripSeedStatus
+from services.core.agent.conversation_service import ConversationService
+from services.core.agent.trip_seed_agent_service import TripSeedAgentResponse, TripSeedExtractedData
+from services.core.agent.trip_seed_fast_path import TripSeedFastPath
+from services.trip_seed_service import TripSeedService
+
+
+class OpeningQuestionAgent:
+    """Agent that answers every turn with an opening question and no fields."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def process_with_trip_seed_state(self, **kwargs) -> TripSeedAgentResponse:
+        self.calls += 1
+        return TripSeedAgentResponse(
+            response_text="Sounds lovely! How many days would you like to travel?",
+            extracted_data=TripSeedExtractedData(),
+            is_complete=False,
+            missing_fields=["num_days", "trip_mode", "budget_band"],
+        )
+
+
+@pytest.mark.asyncio
+async def test_second_turn_answer_completes_the_seed_on_the_fast_path(memory_db):
+    """Placeholder values from the first turn don't hide the fields the user still has to give."""
+    user = await User.create(email="owner@example.com", password_hash="x", full_name="Owner")
+    agent = OpeningQuestionAgent()
+    service = TripSeedService(ConversationService(), agent, fast_path=TripSeedFastPath())
+    
+    first = await service.process_message(user.id, "Hi! We'd love to get away somewhere in Michigan.")
+    state = await service.get_trip_seed_state_response(first.trip_seed)
+    
+    assert (state.num_days, state.trip_mode, state.budget_band) == (None, None, None)
+    assert state.missing_fields == ["num_days", "trip_mode", "budget_band"]
+    
+    second = await service.process_message(
+        user.id, "3 days, road trip, budget-friendly", conversation_id=first.conversation_id
+    )
+    state = await service.get_trip_seed_state_response(second.trip_seed)
+    
+    assert agent.calls == 1
+    assert second.agent_response.is_complete
+    assert (state.num_days, state.trip_mode, state.budget_band) == (3, "road_trip", "relaxed")
+    assert second.trip_seed.status == TripSeedStatus.COMPLETE
@@ -0,0 +1,164 @@
+"""
+Service tests for batch stop edits and reordering, on an in-memory SQLite database.
+"""
+import pytest
+from core.models import TripStop
+from core.models.trips import TripStopSlot
+from dtos.trip_stop_dto import BatchStopOperationsRequest, ReorderStopsRequest, StopOperation, StopOrderItem
+from services import trip_stop_service
+from services.core.bulk_update import bulk_update_rows
+from services.trip_stop_service import TripStopService
+
+
+async def apply(seeded_trip, *operations: dict):
+    return await TripStopService().apply_stop_operations(
+        user_id=seeded_trip.user.id,
+        trip_id=seeded_trip.trip.id,
+        request=BatchStopOperationsRequest(operations=[StopOperation(**operation) for operation in operations]),
+    )
+
+
+async def reorder(seeded_trip, day, *orders: tuple):
+    return await TripStopService().reorder_stops(
+        user_id=seeded_trip.user.id,
+        trip_id=seeded_trip.trip.id,
+        day_id=day.id,
+        request=ReorderStopsRequest(
+            stop_orders=[StopOrderItem(stop_id=stop_id, order_index=order_index) for stop_id, order_index in orders]
+        ),
+    )
+
+
+async def stop_rows(seeded_trip) -> list:
+    return await TripStop.filter(trip_day__trip_id=seeded_trip.trip.id).order_by("trip_day_id", "order_index")
+
+
+@pytest.mark.asyncio
+async def test_mixed_delete_update_move_and_create(seeded_trip):
+    """Operations apply in order and every touched day is returned."""
+    day_1, day_2 = seeded_trip.days
+    first, second, third = seeded_trip.stops
+    
+    days = await apply(
+        seeded_trip,
+        {"op": "delete", "stop_id": first.id},
+        {"op": "update", "stop_id": second.id, "label": "Lunch", "slot": "afternoon", "order_index": 0},
+        {"op": "move", "stop_id": third.id, "day_id": day_2.id, "order_index": 1},
+        {"op": "create", "day_id": day_2.id, "label": "Sunset", "slot": "evening", "order_index": 0},
+    )
+    
+    assert [day.id for day in days] == [day_1.id, day_2.id]
+    assert [(stop.id, stop.label, stop.slot) for stop in days[0].stops] == [(second.id, "Lunch", "afternoon")]
+    assert [stop.label for stop in days[1].stops] == ["Sunset", None]
+    assert days[1].stops[1].id == third.id
+    
+    rows = await stop_rows(seeded_trip)
+    assert first.id not in [row.id for row in rows]
+    assert [(row.trip_day_id, row.order_index) for row in rows] == [(day_1.id, 0), (day_2.id, 0), (day_2.id, 1)]
+    assert rows[0].slot == TripStopSlot.AFTERNOON
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("operation, message", [
+    ({"op": "rename", "stop_id": 1}, "Invalid operation"),
+    ({"op": "create", "day_id": 999, "label": "X", "slot": "flex", "order_index": 0}, "Day 999 not found"),
+    ({"op": "create", "day_id": None, "slot": "flex", "order_index": 0}, "not found"),
+    ({"op": "update", "stop_id": 999, "label": "X"}, "Stop 999 not found"),
+    ({"op": "update", "stop_id": 1, "slot": "midnight"}, "Invalid slot"),
+    ({"op": "create", "day_id": 1, "attraction_id": 999, "slot": "flex", "order_index": 3}, "Attraction 999 not found"),
+])
+async def test_invalid_operations_are_rejected(seeded_trip, operation, message):
+    """Validation errors raise ValueError before anything is written."""
+    before = [(row.id, row.order_index, row.label) for row in await stop_rows(seeded_trip)]
+    
+    with pytest.raises(ValueError, match=message):
+        await apply(seeded_trip, {"op": "delete", "stop_id": seeded_trip.stops[2].id}, operation)
+    
+    assert [(row.id, row.order_index, row.label) for row in await stop_rows(seeded_trip)] == before
+
+
+@pytest.mark.asyncio
+async def test_rejects_other_trips_stops_duplicates_and_missing_content(seeded_trip):
+    """Stops of other trips, repeated attractions and empty stops are rejected."""
+    day_1, _ = seeded_trip.days
+    first, second, _ = seeded_trip.stops
+    
+    with pytest.raises(ValueError, match="doesn't belong to trip"):
+        await apply(seeded_trip, {"op": "delete", "stop_id": seeded_trip.other_stop.id})
+    with pytest.raises(ValueError, match="already added to this day"):
+        await apply(seeded_trip, {"op": "update", "stop_id": second.id, "attraction_id": first.attraction_id})
+    with pytest.raises(ValueError, match="attraction_id or label"):
+        await apply(seeded_trip, {"op": "create", "day_id": day_1.id, "slot": "flex", "order_index": 3})
+    with pytest.raises(ValueError, match="not found"):
+        await apply(seeded_trip, {"op": "delete", "stop_id": first.id}, {"op": "delete", "stop_id": first.id})
+    
+    with pytest.raises(ValueError, match="doesn't belong to user"):
+        await TripStopService().apply_stop_operations(
+            user_id=seeded_trip.other_user.id,
+            trip_id=seeded_trip.trip.id,
+            request=BatchStopOperationsRequest(operations=[StopOperation(op="delete", stop_id=first.id)]),
+        )
+
+
+@pytest.mark.asyncio
+async def test_reorder_stops(seeded_trip):
+    """Moved stops get their new order_index; untouched stops keep theirs."""
+    first, second, third = seeded_trip.stops
+    
+    stops = await reorder(seeded_trip, seeded_trip.days[0], (third.id, 0), (first.id, 2), (second.id, 1))
+    
+    assert [(stop.id, stop.order_index) for stop in stops] == [(third.id, 0), (second.id, 1), (first.id, 2)]
+    assert [row.id for row in await stop_rows(seeded_trip)] == [third.id, second.id, first.id]
+    
+    stops = await reorder(seeded_trip, seeded_trip.days[0], (second.id, 5))
+    assert [(stop.id, stop.order_index) for stop in stops] == [(third.id, 0), (first.id, 2), (second.id, 5)]
+
+
+@pytest.mark.asyncio
+async def test_reorder_rejects_invalid_requests(seeded_trip):
+    """Duplicate ids, stops from another day and order_index conflicts change nothing."""
+    day_1, day_2 = seeded_trip.days
+    first, second, third = seeded_trip.stops
+    await apply(seeded_trip, {"op": "move", "stop_id": third.id, "day_id": day_2.id, "order_index": 0})
+    before = [(row.id, row.trip_day_id, row.order_index) for row in await stop_rows(seeded_trip)]
+    
+    with pytest.raises(ValueError, match="only appear once"):
+        await reorder(seeded_trip, day_1, (first.id, 1), (first.id, 0))
+    with pytest.raises(ValueError, match="do not belong to this day"):
+        await reorder(seeded_trip, day_1, (first.id, 1), (third.id, 0))
+    with pytest.raises(ValueError, match="do not belong to this day"):
+        await reorder(seeded_trip, day_1, (seeded_trip.other_stop.id, 3))
+    with pytest.raises(ValueError, match=f"Stops {first.id}, {second.id} would share order_index 1"):
+        await reorder(seeded_trip, day_1, (first.id, 1))
+    with pytest.raises(ValueError, match="would share order_index 4"):
+        await reorder(seeded_trip, day_1, (first.id, 4), (second.id, 4))
+    with pytest.raises(ValueError, match="Day .* not found"):
+        await reorder(seeded_trip, seeded_trip.other_day, (seeded_trip.other_stop.id, 1))
+    
+    assert [(row.id, row.trip_day_id, row.order_index) for row in await stop_rows(seeded_trip)] == before
+
+
+@pytest.mark.asyncio
+async def test_batch_writes_only_the_changed_columns(seeded_trip, monkeypatch):
+    """Updates carry only the fields the batch changed, so other columns aren't rewritten from a stale copy."""
+    written = []
+    
+    async def record_bulk_update(model, rows, using_db=None):
+        written.append(rows)
+        return await bulk_update_rows(model, rows, using_db=using_db)
+    
+    monkeypatch.setattr(trip_stop_service, "bulk_update_rows", record_bulk_update)
+    first, second, third = seeded_trip.stops
+    
+    await apply(
+        seeded_trip,
+        {"op": "update", "stop_id": first.id, "label": "Coffee"},
+        {"op": "move", "stop_id": second.id, "day_id": seeded_trip.days[1].id},
+        {"op": "update", "stop_id": third.id, "slot": "evening"},
+        {"op": "delete", "stop_id": third.id},
+    )
+    
+    assert written == [{
+        first.id: {"label": "Coffee"},
+        second.id: {"trip_day_id": seeded_trip.days[1].id},
+    }]
@@ -172,6 +172,8 @@ export interface TripsListResponse {
   active_trip_seeds: ActiveTripSeedResponse[]
   total_trips: number
   total_active: number
+  next_trips_cursor?: string | null
+  next_seeds_cursor?: string | null
 }
 
 export interface TripSeedStateResponse {